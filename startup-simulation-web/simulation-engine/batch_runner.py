@@ -0,0 +1,179 @@
+"""
+시뮬레이션 배치 실행기
+여러 BMC를 프로세스 풀에 분산 실행하고, 끝나는 순서대로 결과를 스트리밍합니다.
+"""
+
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import List, Dict, Any, Iterator, Optional
+
+import numpy as np
+
+from population_pool import get_population
+from simulation_engine import SimulationAPI
+
+@dataclass
+class BatchTaskResult:
+    """배치 작업 하나의 결과"""
+    index: int  # 입력 BMC 순서
+    seed: int
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+    latency: float  # 워커에서의 실행 시간 (초)
+    turnaround: float  # 제출부터 완료까지 걸린 시간 (초)
+    worker_pid: int
+    
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+@dataclass
+class BatchStats:
+    """배치 처리량 및 지연 시간 통계"""
+    total: int
+    succeeded: int
+    failed: int
+    workers: int
+    wall_time: float
+    throughput: float  # 초당 처리 작업 수
+    latency_mean: float
+    latency_p50: float
+    latency_p95: float
+    latency_max: float
+
+def spawn_task_seeds(count: int, seed: Optional[int] = None) -> List[int]:
+    """배치 시드에서 작업별 독립 시드 생성
+    
+    작업 순서(index)에만 의존하므로 스케줄링 순서와 관계없이 같은 결과를 얻습니다.
+    """
+    children = np.random.SeedSequence(seed).spawn(count)
+    return [int(child.generate_state(1)[0]) for child in children]
+
+def _run_task(index: int, bmc_data: Dict, seed: int, population_dir: Optional[str] = None) -> BatchTaskResult:
+    """워커 프로세스에서 단일 시뮬레이션 실행"""
+    
+    start = time.perf_counter()
+    try:
+        # 인구 풀은 워커마다 한 번만 열고, 페이지는 OS 페이지 캐시를 통해 워커 간에 공유됩니다
+        population = get_population(population_dir) if population_dir else None
+        result = SimulationAPI.create_simulation(bmc_data, seed=seed, population=population)
+        error = None
+    except Exception:
+        result = None
+        error = traceback.format_exc()
+    
+    return BatchTaskResult(
+        index=index,
+        seed=seed,
+        result=result,
+        error=error,
+        latency=time.perf_counter() - start,
+        turnaround=0.0,
+        worker_pid=os.getpid()
+    )
+
+class BatchRun:
+    """진행 중인 배치 실행
+    
+    순회하면 완료된 순서대로 BatchTaskResult를 반환하고, 순회가 끝나면 stats()로 통계를 볼 수 있습니다.
+    다 순회한 뒤 다시 순회하면 다시 실행하지 않고 같은 결과를 같은 순서로 반환하며,
+    중간에 멈춘 순회 뒤에 다시 순회하면 처음부터 다시 실행합니다.
+    """
+    
+    def __init__(self, bmcs: List[Dict], workers: Optional[int] = None, seed: Optional[int] = None,
+                 population_dir: Optional[str] = None):
+        self.bmcs = list(bmcs)
+        self.population_dir = population_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.seeds = spawn_task_seeds(len(self.bmcs), seed)
+        self.results: List[BatchTaskResult] = []
+        self._wall_time = 0.0
+        self._completed = False
+    
+    def __iter__(self) -> Iterator[BatchTaskResult]:
+        if self._completed:
+            yield from list(self.results)
+            return
+        
+        self.results = []
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = {
+                executor.submit(_run_task, index, bmc_data, seed, self.population_dir): (index, seed, time.perf_counter())
+                for index, (bmc_data, seed) in enumerate(zip(self.bmcs, self.seeds))
+            }
+            for future in as_completed(futures):
+                index, seed, submitted = futures[future]
+                try:
+                    task_result = future.result()
+                except Exception:
+                    # 워커 프로세스 자체가 죽은 경우에도 나머지 작업 결과는 유지합니다
+                    task_result = BatchTaskResult(
+                        index=index,
+                        seed=seed,
+                        result=None,
+                        error=traceback.format_exc(),
+                        latency=0.0,
+                        turnaround=0.0,
+                        worker_pid=-1
+                    )
+                task_result.turnaround = time.perf_counter() - submitted
+                self.results.append(task_result)
+                self._wall_time = time.perf_counter() - start
+                yield task_result
+        self._completed = True
+    
+    def stats(self) -> BatchStats:
+        """완료된 작업 기준 처리량/지연 통계"""
+        
+        latencies = np.array([r.latency for r in self.results if r.ok]) if self.results else np.zeros(0)
+        if len(latencies) == 0:
+            latencies = np.zeros(1)
+        succeeded = sum(1 for r in self.results if r.ok)
+        
+        return BatchStats(
+            total=len(self.results),
+            succeeded=succeeded,
+            failed=len(self.results) - succeeded,
+            workers=self.workers,
+            wall_time=self._wall_time,
+            throughput=len(self.results) / self._wall_time if self._wall_time > 0 else 0.0,
+            latency_mean=float(latencies.mean()),
+            latency_p50=float(np.percentile(latencies, 50)),
+            latency_p95=float(np.percentile(latencies, 95)),
+            latency_max=float(latencies.max())
+        )
+
+def run_batch(bmcs: List[Dict], workers: Optional[int] = None, seed: Optional[int] = None,
+              population_dir: Optional[str] = None) -> BatchRun:
+    """BMC 목록을 프로세스 풀에서 실행
+    
+    population_dir(build_population으로 만든 인구 풀 경로)을 주면 워커들이 같은 풀에서 패널을 추출합니다.
+    
+    사용 예:
+        run = run_batch(bmcs, workers=4, seed=42)
+        for task in run:
+            ...
+        print(run.stats())
+    """
+    return BatchRun(bmcs, workers=workers, seed=seed, population_dir=population_dir)
+
+if __name__ == "__main__":
+    # 테스트 실행
+    test_bmcs = [
+        {
+            "value_proposition": "통합 업무 관리 솔루션",
+            "hypotheses": ["월 구독료 9,900원은 적정 가격이다"]
+        }
+        for _ in range(8)
+    ]
+    test_bmcs.append({"hypotheses": None})  # 실패하는 작업
+    
+    run = run_batch(test_bmcs, workers=2, seed=42)
+    for task in run:
+        status = "ok" if task.ok else "failed"
+        print(f"#{task.index} {status} {task.latency * 1000:.1f}ms (pid {task.worker_pid})")
+    print(run.stats())
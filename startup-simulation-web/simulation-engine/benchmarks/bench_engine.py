@@ -0,0 +1,253 @@
+"""
+시뮬레이션 엔진 벤치마크
+단계별(페르소나 생성, 인터뷰, 가설 검증, 재무/코호트 시뮬레이션, 파라미터 스윕, 확산, 전체 실행)
+실행 시간과 최대 메모리 사용량을 고정 seed로 측정하고, JSON 기준선과 비교합니다.
+
+실행 시간은 측정한 기계(CPU, 부하)와 Python/numpy 버전에 따라 달라지므로 기준선은 같은 기계에서
+만든 것과만 비교해야 합니다. 저장소의 baselines/reference.json은 한 개발 기계에서 측정한 예시이며
+(meta에 환경 기록), CI나 다른 기계에서는 먼저 --save로 자기 기준선을 만든 뒤 --compare로 비교합니다.
+
+사용 예:
+    python benchmarks/bench_engine.py --sizes 20,1000,100000 --save benchmarks/baselines/local.json
+    python benchmarks/bench_engine.py --sizes 20,1000,100000 --compare benchmarks/baselines/local.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import List, Dict, Any, Callable, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation_engine import SimulationEngine, SimulationAPI, DEFAULT_INTERVIEW_QUESTIONS
+from diffusion import build_social_graph, simulate_diffusion
+from cohort_model import run_cohort_simulation
+from sensitivity import sweep_grid
+
+DEFAULT_SIZES = [20, 1000, 10000, 100000, 1000000]
+
+BENCH_HYPOTHESES = [
+    "20대 고객의 70%가 우리 앱을 유료로 사용할 것이다",
+    "월 구독료 9,900원은 적정 가격이다",
+    "소셜 미디어를 통한 마케팅이 가장 효과적일 것이다",
+    "핵심 기능의 사용성이 경쟁 제품보다 중요하다"
+]
+
+# 페르소나 단위 파이썬 루프를 도는 기존 경로는 큰 패널에서 너무 오래 걸리므로 크기를 제한합니다
+LOOP_STAGE_MAX_SIZE = 10000
+
+def _interviewed_engine(size: int, seed: int) -> SimulationEngine:
+    engine = SimulationEngine({"hypotheses": BENCH_HYPOTHESES}, columnar=True, seed=seed)
+    engine.interview_panel(engine.generate_personas(size), DEFAULT_INTERVIEW_QUESTIONS)
+    return engine
+
+def _stage_generate_personas(size: int, seed: int) -> Callable[[], Any]:
+    engine = SimulationEngine({}, seed=seed)
+    return lambda: engine.generate_personas(size)
+
+def _stage_generate_personas_batched(size: int, seed: int) -> Callable[[], Any]:
+    engine = SimulationEngine({}, columnar=True, seed=seed)
+    return lambda: engine.generate_personas(size)
+
+def _stage_conduct_interviews(size: int, seed: int) -> Callable[[], Any]:
+    engine = SimulationEngine({}, seed=seed)
+    personas = engine.generate_personas(size)
+    return lambda: [engine.conduct_interviews(p, DEFAULT_INTERVIEW_QUESTIONS) for p in personas]
+
+def _stage_interview_panel(size: int, seed: int) -> Callable[[], Any]:
+    engine = SimulationEngine({}, columnar=True, seed=seed)
+    personas = engine.generate_personas(size)
+    
+    def run():
+        engine.interview_results = type(engine.interview_results)()
+        return engine.interview_panel(personas, DEFAULT_INTERVIEW_QUESTIONS)
+    return run
+
+def _stage_validate_hypothesis(size: int, seed: int) -> Callable[[], Any]:
+    engine = _interviewed_engine(size, seed)
+    return lambda: [engine.validate_hypothesis(h) for h in BENCH_HYPOTHESES]
+
+def _stage_validate_hypotheses(size: int, seed: int) -> Callable[[], Any]:
+    engine = _interviewed_engine(size, seed)
+    return lambda: engine.validate_hypotheses(BENCH_HYPOTHESES)
+
+def _stage_run_financial_simulation(size: int, seed: int) -> Callable[[], Any]:
+    # 재무 모델은 패널 크기와 무관하므로 size를 개월 수로 사용합니다
+    engine = SimulationEngine({}, seed=seed)
+    return lambda: engine.run_financial_simulation(months=size)
+
+def _stage_monte_carlo(size: int, seed: int) -> Callable[[], Any]:
+    engine = SimulationEngine({}, seed=seed)
+    return lambda: engine.run_monte_carlo_simulation(scenarios=size, months=60)
+
+def _stage_cohort_simulation(size: int, seed: int) -> Callable[[], Any]:
+    # size를 시나리오 수로 사용하며 120개월 코호트 행렬을 계산합니다
+    engine = SimulationEngine({}, columnar=True, seed=seed)
+    engine.generate_personas(100)
+    return lambda: run_cohort_simulation(engine, months=120, scenarios=size)
+
+def _stage_financial_sweep(size: int, seed: int) -> Callable[[], Any]:
+    # size를 그리드 한 변의 길이로 사용하며 이탈률 x ARPU 그리드를 36개월로 계산합니다
+    axes = {"churn_rate": np.linspace(0.01, 0.2, size), "arpu": np.linspace(5000, 20000, size)}
+    return lambda: sweep_grid(axes, months=36)
+
+def _stage_diffusion(size: int, seed: int) -> Callable[[], Any]:
+    engine = SimulationEngine({}, columnar=True, seed=seed)
+    personas = engine.generate_personas(size)
+    graph = build_social_graph(personas, engine.rng)
+    return lambda: simulate_diffusion(personas, 12, engine.rng, graph=graph)
+
+def _stage_create_simulation(size: int, seed: int) -> Callable[[], Any]:
+    bmc = {"hypotheses": BENCH_HYPOTHESES}
+    return lambda: SimulationAPI.create_simulation(bmc, seed=seed, persona_count=size)
+
+# 단계 이름 -> (준비 함수, 최대 크기, 고정 크기 목록)
+STAGES: Dict[str, Tuple[Callable[[int, int], Callable[[], Any]], Optional[int], Optional[List[int]]]] = {
+    "generate_personas": (_stage_generate_personas, LOOP_STAGE_MAX_SIZE, None),
+    "generate_personas_batched": (_stage_generate_personas_batched, None, None),
+    "conduct_interviews": (_stage_conduct_interviews, LOOP_STAGE_MAX_SIZE, None),
+    "interview_panel": (_stage_interview_panel, None, None),
+    "validate_hypothesis": (_stage_validate_hypothesis, None, None),
+    "validate_hypotheses": (_stage_validate_hypotheses, None, None),
+    "run_financial_simulation": (_stage_run_financial_simulation, None, [12, 60, 120]),
+    "run_monte_carlo_simulation": (_stage_monte_carlo, None, None),
+    "cohort_simulation": (_stage_cohort_simulation, 100000, None),
+    "financial_sweep": (_stage_financial_sweep, None, [50, 200, 500]),
+    "diffusion": (_stage_diffusion, None, None),
+    "create_simulation": (_stage_create_simulation, None, None),
+}
+
+def measure(setup: Callable[[int, int], Callable[[], Any]], size: int, seed: int,
+            repeat: int, track_memory: bool) -> Dict[str, Any]:
+    """단계 하나를 측정 (최소 실행 시간 + 별도 실행의 tracemalloc 최대 메모리)"""
+    
+    timings = []
+    for _ in range(repeat):
+        run = setup(size, seed)
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    
+    result = {
+        "seconds": min(timings),
+        "seconds_median": float(np.median(timings)),
+        "items_per_second": size / min(timings) if min(timings) > 0 else None,
+    }
+    
+    if track_memory:
+        run = setup(size, seed)
+        tracemalloc.start()
+        try:
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result["peak_bytes"] = peak
+    
+    return result
+
+def run_benchmarks(sizes: List[int], seed: int = 42, repeat: int = 3, stages: List[str] = None,
+                   track_memory: bool = True, log: Callable[[str], None] = print) -> Dict[str, Any]:
+    """선택한 단계들을 크기별로 측정하여 기준선 형식의 dict 반환"""
+    
+    results: Dict[str, Dict[str, Any]] = {}
+    for name in stages or list(STAGES):
+        setup, max_size, fixed_sizes = STAGES[name]
+        results[name] = {}
+        for size in fixed_sizes or sizes:
+            if max_size is not None and size > max_size:
+                continue
+            entry = measure(setup, size, seed, repeat, track_memory)
+            results[name][str(size)] = entry
+            peak = f" peak={entry['peak_bytes'] / 1e6:.1f}MB" if "peak_bytes" in entry else ""
+            log(f"{name:<28} n={size:<9} {entry['seconds'] * 1000:10.2f}ms{peak}")
+    
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "seed": seed,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "note": "측정한 기계와 Python/numpy 버전에 따라 달라지는 값이므로 같은 환경의 측정과만 비교합니다",
+        },
+        "results": results,
+    }
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.25,
+            memory_tolerance: float = 0.25, min_delta: float = 0.002) -> List[str]:
+    """기준선 대비 회귀 목록 반환 (시간 또는 메모리가 허용 비율 이상 증가한 항목)
+    
+    아주 짧은 단계의 측정 잡음을 무시하도록 min_delta초 미만의 시간 증가는 회귀로 보지 않습니다.
+    """
+    
+    regressions = []
+    for name, by_size in current["results"].items():
+        for size, entry in by_size.items():
+            base = baseline.get("results", {}).get(name, {}).get(size)
+            if base is None:
+                continue
+            time_ratio = entry["seconds"] / base["seconds"] if base["seconds"] > 0 else 1.0
+            if time_ratio > 1 + tolerance and entry["seconds"] - base["seconds"] >= min_delta:
+                regressions.append(f"{name} n={size}: time x{time_ratio:.2f} "
+                                   f"({base['seconds'] * 1000:.2f}ms -> {entry['seconds'] * 1000:.2f}ms)")
+            if "peak_bytes" in entry and base.get("peak_bytes"):
+                memory_ratio = entry["peak_bytes"] / base["peak_bytes"]
+                if memory_ratio > 1 + memory_tolerance:
+                    regressions.append(f"{name} n={size}: memory x{memory_ratio:.2f} "
+                                       f"({base['peak_bytes'] / 1e6:.1f}MB -> {entry['peak_bytes'] / 1e6:.1f}MB)")
+    return regressions
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="시뮬레이션 엔진 벤치마크")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="쉼표로 구분한 패널 크기 목록")
+    parser.add_argument("--stages", default=None, help="쉼표로 구분한 단계 이름 (기본: 전체)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 메모리 측정 생략")
+    parser.add_argument("--save", default=None, help="결과를 기준선 JSON으로 저장할 경로")
+    parser.add_argument("--compare", default=None, help="비교할 기준선 JSON 경로")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="허용하는 시간 증가 비율")
+    parser.add_argument("--memory-tolerance", type=float, default=0.25, help="허용하는 메모리 증가 비율")
+    args = parser.parse_args(argv)
+    
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    stages = args.stages.split(",") if args.stages else None
+    unknown = [s for s in stages or [] if s not in STAGES]
+    if unknown:
+        parser.error(f"알 수 없는 단계: {', '.join(unknown)} (가능: {', '.join(STAGES)})")
+    
+    current = run_benchmarks(sizes, seed=args.seed, repeat=args.repeat, stages=stages,
+                             track_memory=not args.no_memory)
+    
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2, ensure_ascii=False)
+        print(f"기준선 저장: {args.save}")
+    
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.tolerance, args.memory_tolerance)
+        if regressions:
+            print("성능 회귀 발견:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("기준선 대비 회귀 없음")
+    
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
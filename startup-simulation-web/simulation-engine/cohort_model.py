@@ -0,0 +1,268 @@
+"""
+코호트 재무 모델
+가입 월별 코호트 x 월 행렬로 사용자를 추적합니다. 코호트마다 가입 후 경과 월에 따른
+리텐션 곡선을 적용하고, 유료 전환율은 페르소나 패널의 가격 민감도 분포로 정합니다.
+모든 계산은 (시나리오..., 월) 배열 연산이므로 120개월 x 수천 시나리오도 한 번에 계산합니다.
+
+run_financial_simulation과 달리 사용자 수를 정수로 절사하지 않는 기댓값 모델이므로
+초기 사용자가 적어도 신규 가입이 0으로 사라지지 않습니다.
+"""
+
+from typing import List, Dict, Any, Tuple, Optional
+
+import numpy as np
+
+from instrumentation import stage_context
+from simulation_engine import (
+    SimulationEngine, PersonaTable, FINANCIAL_DEFAULTS, MONTE_CARLO_DISTRIBUTIONS,
+    sample_parameter, summarize_scenarios
+)
+
+# 코호트 모델에만 있는 파라미터
+COHORT_DEFAULTS: Dict[str, float] = {
+    "reference_price": FINANCIAL_DEFAULTS["arpu"],  # 가격 민감도 중간 페르소나의 전환율이 conversion_rate가 되는 가격
+}
+
+# 리텐션 곡선 지정 (곡선 이름, 인자...)
+#   ("geometric",)            매월 churn_rate만큼 이탈 (인자로 이탈률을 직접 줄 수도 있음)
+#   ("sbg", alpha, beta)      shifted-beta-geometric: 이탈 확률이 베타 분포를 따르는 코호트
+#   ("power", decay)          (1 + 경과 월) ** -decay
+#   ("curve", [r0, r1, ...])  경과 월별 잔존율 직접 지정 (짧으면 마지막 값 유지)
+DEFAULT_RETENTION: Tuple = ("geometric",)
+
+# 가격 민감도 점수 (1-10)
+SENSITIVITY_LEVELS = np.arange(1, 11, dtype=np.float64)
+SENSITIVITY_MIDPOINT = 5.5
+
+def retention_curve(spec: Tuple, months: int, churn_rate: Any = FINANCIAL_DEFAULTS["churn_rate"]) -> np.ndarray:
+    """경과 월(0..months-1)별 잔존율 (..., months), 0개월은 1
+    
+    곡선 인자와 churn_rate는 스칼라 또는 시나리오 배열이며 결과의 앞쪽 축으로 브로드캐스트됩니다.
+    """
+    
+    kind, *args = spec
+    age = np.arange(months, dtype=np.float64)
+    if kind == "geometric":
+        churn = np.asarray(args[0] if args else churn_rate, dtype=np.float64)
+        return (1.0 - np.clip(churn, 0.0, 1.0))[..., None] ** age
+    if kind == "sbg":
+        alpha, beta = (np.asarray(a, dtype=np.float64)[..., None] for a in args)
+        # S(t) = S(t-1) * (beta + t - 1) / (alpha + beta + t - 1)
+        ratio = (beta + age[1:] - 1) / (alpha + beta + age[1:] - 1)
+        curve = np.ones(ratio.shape[:-1] + (months,))
+        np.cumprod(ratio, axis=-1, out=curve[..., 1:])
+        return curve
+    if kind == "power":
+        decay = np.asarray(args[0], dtype=np.float64)[..., None]
+        return (1.0 + age) ** -decay
+    if kind == "curve":
+        values = np.asarray(args[0], dtype=np.float64)
+        if values.shape[-1] == 0:
+            raise ValueError("리텐션 곡선 값이 비어 있습니다")
+        index = np.minimum(np.arange(months), values.shape[-1] - 1)
+        return np.clip(values[..., index], 0.0, 1.0)
+    raise ValueError(f"지원하지 않는 리텐션 곡선입니다: {kind}")
+
+def price_sensitivity_mix(personas: Any) -> np.ndarray:
+    """패널의 가격 민감도(1-10) 비율 (길이 10)"""
+    
+    if isinstance(personas, PersonaTable):
+        values = personas.columns["price_sensitivity"]
+    else:
+        values = np.array([p.price_sensitivity for p in personas], dtype=np.int64)
+    counts = np.bincount(np.clip(values, 1, 10) - 1, minlength=10).astype(np.float64)
+    return counts / counts.sum() if counts.sum() else counts
+
+def panel_conversion(price_mix: np.ndarray, arpu: Any, conversion_rate: Any = FINANCIAL_DEFAULTS["conversion_rate"],
+                     reference_price: Any = COHORT_DEFAULTS["reference_price"]) -> np.ndarray:
+    """패널 가격 민감도 분포에 따른 유료 전환율
+    
+    민감도 s인 페르소나의 전환율은 conversion_rate * (11 - s) / 5.5 * (reference_price / arpu) ** (s / 5)이며,
+    민감도가 높을수록 전환이 낮고 가격 변화에 더 크게 반응합니다. 결과는 분포로 가중 평균한 값입니다.
+    """
+    
+    arpu = np.asarray(arpu, dtype=np.float64)[..., None]
+    willingness = (11 - SENSITIVITY_LEVELS) / SENSITIVITY_MIDPOINT
+    price_factor = (np.asarray(reference_price, dtype=np.float64)[..., None] / arpu) ** (SENSITIVITY_LEVELS / 5)
+    by_level = np.asarray(conversion_rate, dtype=np.float64)[..., None] * willingness * price_factor
+    return np.clip(by_level, 0.0, 1.0) @ price_mix
+
+def project_cohorts(params: Dict[str, Any], months: int, retention: Tuple = DEFAULT_RETENTION,
+                    price_mix: Optional[np.ndarray] = None, new_users: Any = None,
+                    cohort_matrix: bool = False) -> Dict[str, np.ndarray]:
+    """코호트 모델로 월별 추이를 벡터 계산
+    
+    파라미터는 project_financials와 같이 스칼라 또는 브로드캐스트되는 배열이며 결과는 (파라미터 모양..., months)입니다.
+    월별 가입자는 initial_users에서 시작해 매월 monthly_growth_rate로 늘어나고, new_users(월별 가입자 수)를 주면
+    그 값을 씁니다. price_mix가 없으면 conversion_rate를 그대로 전환율로 씁니다.
+    코호트 c의 회수 기간(cohort_payback_month)은 코호트 고객 획득 비용(marketing_cost / 가입자 수)을
+    고객당 누적 공헌이익이 넘는 경과 월이며, 기간 안에 회수하지 못하면 0입니다.
+    cohort_matrix=True이면 가입 코호트 x 월 활성 사용자 행렬 (..., 코호트, 월)을 "cohort_matrix"에 담습니다
+    (열 합이 users이며, 월 수의 제곱에 비례하는 메모리를 쓰므로 필요할 때만 만듭니다).
+    """
+    
+    defaults = dict(FINANCIAL_DEFAULTS, **COHORT_DEFAULTS)
+    p = {name: np.asarray(params.get(name, default), dtype=np.float64) for name, default in defaults.items()}
+    age = np.arange(months)
+    
+    curve = retention_curve(retention, months, p["churn_rate"])
+    if new_users is not None:
+        signups = np.asarray(new_users, dtype=np.float64)[..., :months]
+        if signups.shape[-1] < months:
+            raise ValueError(f"new_users는 {months}개월 이상이어야 합니다")
+    else:
+        signups = p["initial_users"][..., None] * (1.0 + p["monthly_growth_rate"][..., None]) ** age
+    if price_mix is None:
+        conversion = np.clip(p["conversion_rate"], 0.0, 1.0)
+    else:
+        conversion = panel_conversion(price_mix, p["arpu"], p["conversion_rate"], p["reference_price"])
+    
+    shape = np.broadcast(*p.values(), conversion, curve[..., 0], signups[..., 0]).shape
+    curve = np.broadcast_to(curve, shape + (months,))
+    signups = np.broadcast_to(signups, shape + (months,))
+    conversion = np.broadcast_to(conversion, shape)
+    
+    def expand(value):
+        return np.asarray(value)[..., None]
+    
+    # 활성 사용자 = 코호트 x 월 행렬의 열 합 = 가입자와 잔존율의 합성곱 (경과 월마다 한 번씩 더함)
+    # 월 축을 앞으로 옮겨 경과 월별 덧셈이 연속 메모리에서 일어나도록 합니다
+    signups_by_month = _month_major(signups)
+    curve_by_month = _month_major(curve)
+    users_by_month = np.zeros((months,) + shape)
+    for a in range(months):
+        users_by_month[a:] += signups_by_month[:months - a] * curve_by_month[a]
+    users = np.moveaxis(users_by_month, 0, -1)
+    
+    paying_users = users * expand(conversion)
+    revenue = paying_users * expand(p["arpu"])
+    costs = expand(p["fixed_costs"]) + users * expand(p["variable_cost_per_user"]) + expand(p["marketing_cost"])
+    profit = revenue - costs
+    cumulative_profit = np.cumsum(profit, axis=-1)
+    
+    positive = cumulative_profit > 0
+    break_even_month = np.where(positive.any(axis=-1), positive.argmax(axis=-1) + 1, 0)
+    
+    # 코호트 회수 기간: 고객당 누적 공헌이익은 코호트와 무관하므로 누적 최댓값과 코호트별 획득 비용만 비교
+    unit_margin = expand(conversion * p["arpu"] - p["variable_cost_per_user"])
+    margin = _month_major(np.maximum.accumulate(np.cumsum(curve * unit_margin, axis=-1), axis=-1))
+    with np.errstate(divide="ignore"):
+        acquisition_cost = _month_major(np.where(signups > 0, expand(p["marketing_cost"]) / signups, np.inf))
+    # 누적 공헌이익이 획득 비용에 못 미치는 경과 월 수 (코호트 축은 두 번째 축에 둡니다)
+    not_paid = np.zeros((months,) + shape, dtype=np.int64)
+    for a in range(months):
+        not_paid += margin[a] < acquisition_cost
+    payback = np.moveaxis(not_paid, 0, -1) + 1
+    # 마지막 월까지 남은 경과 월 안에서 회수한 코호트만 인정
+    cohort_payback_month = np.where(payback <= months - age, payback, 0)
+    
+    total_revenue = revenue.sum(axis=-1)
+    total_costs = costs.sum(axis=-1)
+    
+    extra = {}
+    if cohort_matrix:
+        # [코호트 c, 월 m] = 코호트 c 가입자 x 경과 월 (m - c)의 잔존율 (가입 전 월은 0)
+        elapsed = age[None, :] - age[:, None]
+        extra["cohort_matrix"] = np.where(elapsed >= 0, signups[..., :, None] * curve[..., np.maximum(elapsed, 0)], 0.0)
+    
+    return {
+        "signups": np.array(signups),
+        "retention": np.array(curve),
+        "conversion": np.array(conversion),
+        "users": users,
+        "paying_users": paying_users,
+        "revenue": revenue,
+        "costs": costs,
+        "profit": profit,
+        "cumulative_profit": cumulative_profit,
+        "break_even_month": break_even_month,
+        "cohort_payback_month": cohort_payback_month,
+        "ltv": conversion * p["arpu"] * curve.sum(axis=-1),
+        "total_revenue": total_revenue,
+        "total_costs": total_costs,
+        "roi": (total_revenue - total_costs) / total_costs * 100,
+        **extra,
+    }
+
+def _month_major(values: np.ndarray) -> np.ndarray:
+    """(..., 월) 배열을 월 축이 앞에 오는 연속 배열로 복사"""
+    return np.ascontiguousarray(np.moveaxis(values, -1, 0))
+
+def run_cohort_simulation(engine: SimulationEngine, months: int = 12, retention: Tuple = DEFAULT_RETENTION,
+                          assumptions: Dict[str, float] = None, new_users: List[int] = None,
+                          scenarios: Optional[int] = None, distributions: Dict[str, Tuple] = None,
+                          cohort_matrix: bool = False) -> Dict[str, Any]:
+    """엔진의 페르소나 패널로 코호트 재무 시뮬레이션 실행
+    
+    scenarios가 없으면 run_financial_simulation과 같은 구조의 월별 결과에 코호트 정보를 더해 반환합니다.
+    scenarios를 주면 run_monte_carlo_simulation과 같이 파라미터를 분포에서 뽑아 밴드로 요약하며,
+    assumptions로 준 파라미터는 고정값으로 씁니다.
+    cohort_matrix=True이면 가입 코호트 x 월 활성 사용자 행렬을 담습니다 (시나리오가 있으면 시나리오 평균).
+    """
+    
+    unknown = set(assumptions or {}) - set(FINANCIAL_DEFAULTS) - set(COHORT_DEFAULTS)
+    if unknown:
+        raise ValueError(f"알 수 없는 재무 파라미터입니다: {', '.join(sorted(unknown))}")
+    price_mix = price_sensitivity_mix(engine.personas) if len(engine.personas) else None
+    
+    with stage_context(engine.instrumentation, "cohort", scenarios or 1):
+        if scenarios is None:
+            params = dict(FINANCIAL_DEFAULTS, **COHORT_DEFAULTS)
+            params.update(assumptions or {})
+            projection = project_cohorts(params, months, retention, price_mix, new_users, cohort_matrix)
+            return _cohort_result(projection, params, months)
+        
+        spec = dict(MONTE_CARLO_DISTRIBUTIONS)
+        spec.update(distributions or {})
+        spec.update({name: ("fixed", value) for name, value in (assumptions or {}).items()})
+        params = {name: sample_parameter(name, spec.get(name, ("fixed", default)), scenarios, engine.rng)
+                  for name, default in dict(FINANCIAL_DEFAULTS, **COHORT_DEFAULTS).items()}
+        projection = project_cohorts(params, months, retention, price_mix, new_users, cohort_matrix)
+        
+        summary = summarize_scenarios(projection, scenarios, months)
+        # 코호트별 회수 기간 분포 (회수한 시나리오만으로 중앙값 계산)
+        payback = projection["cohort_payback_month"]
+        reached = payback > 0
+        any_reached = reached.any(axis=0)
+        median_payback = np.full(months, np.nan)
+        median_payback[any_reached] = np.nanmedian(np.where(reached, payback, np.nan)[:, any_reached], axis=0)
+        summary["cohort_payback"] = {
+            "reached_probability": reached.mean(axis=0).tolist(),
+            "median_month": [None if np.isnan(m) else float(m) for m in median_payback],
+        }
+        if cohort_matrix:
+            summary["cohort_matrix"] = projection["cohort_matrix"].mean(axis=0).tolist()
+        return summary
+
+def _cohort_result(projection: Dict[str, np.ndarray], params: Dict[str, float], months: int) -> Dict[str, Any]:
+    """단일 시나리오 코호트 결과를 run_financial_simulation 형식으로 변환"""
+    
+    break_even = int(projection["break_even_month"])
+    payback = projection["cohort_payback_month"]
+    last_signups = float(projection["signups"][-1])
+    cohorts = {
+        "signups": projection["signups"].tolist(),
+        "retention": projection["retention"].tolist(),
+        "conversion_rate": float(projection["conversion"]),
+        "payback_month": [int(m) if m else None for m in payback],
+    }
+    if "cohort_matrix" in projection:
+        cohorts["matrix"] = projection["cohort_matrix"].tolist()
+    return {
+        "months": [f"Month {month}" for month in range(1, months + 1)],
+        "users": projection["users"].tolist(),
+        "revenue": projection["revenue"].tolist(),
+        "costs": projection["costs"].tolist(),
+        "profit": projection["profit"].tolist(),
+        "cumulative_profit": projection["cumulative_profit"].tolist(),
+        "metrics": {
+            "break_even_month": break_even if break_even else None,
+            "total_users": float(projection["users"][-1]),
+            "total_revenue": float(projection["total_revenue"]),
+            "total_costs": float(projection["total_costs"]),
+            "roi": float(projection["roi"]),
+            "cac": params["marketing_cost"] / (last_signups if last_signups > 0 else 1),
+            "ltv": float(projection["ltv"]),
+        },
+        "cohorts": cohorts,
+    }
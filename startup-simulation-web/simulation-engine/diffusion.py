@@ -0,0 +1,209 @@
+"""
+채택 확산 시뮬레이션
+페르소나 패널 위에 소셜 그래프(CSR 희소 인접 행렬)를 만들고,
+Bass 모형 또는 임계값 모형으로 월별 채택 확산을 계산합니다.
+"""
+
+from dataclasses import dataclass
+from typing import List, Dict, Any
+
+import numpy as np
+
+from instrumentation import stage_context
+from simulation_engine import SimulationEngine, PersonaTable, SEGMENTS, TRAIT_NAMES
+
+DIFFUSION_DEFAULTS: Dict[str, float] = {
+    "mean_degree": 20,  # 한 페르소나가 참고하는 평균 지인 수
+    "homophily": 0.7,  # 같은 세그먼트 안에서 지인을 고를 확률
+    "innovation": 0.01,  # Bass 혁신 계수 p (월)
+    "imitation": 0.3,  # Bass 모방 계수 q (월)
+    "threshold_base": 0.1,  # 임계값 모형의 기본 임계값
+    "threshold_per_loyalty": 0.05,  # 브랜드 충성도 1점당 늘어나는 임계값
+}
+
+# 그래프 생성과 전파 계산을 나누어 처리하는 크기 (중간 배열의 최대 메모리를 제한)
+GRAPH_BLOCK_SIZE = 100000
+PROPAGATE_BLOCK_EDGES = 1 << 22
+
+@dataclass
+class SocialGraph:
+    """CSR 형식의 방향 그래프 (j행 = j번 페르소나가 영향을 주는 지인 목록)
+    
+    중복 간선은 허용하며, 노드 번호는 페르소나 테이블의 위치입니다.
+    """
+    indptr: np.ndarray  # int64, 길이 노드 수 + 1
+    indices: np.ndarray  # int32, 길이 간선 수
+    
+    @property
+    def num_nodes(self) -> int:
+        return len(self.indptr) - 1
+    
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices)
+    
+    @property
+    def nbytes(self) -> int:
+        return self.indptr.nbytes + self.indices.nbytes
+    
+    def out_degrees(self) -> np.ndarray:
+        return np.diff(self.indptr)
+    
+    def in_degrees(self) -> np.ndarray:
+        return np.bincount(self.indices, minlength=self.num_nodes).astype(np.float64)
+    
+    def propagate(self, x: np.ndarray) -> np.ndarray:
+        """y[i] = sum(x[j] for j -> i)  (전치 인접 행렬과 벡터의 곱)
+        
+        x가 0이 아닌 행의 간선만 모아 bincount로 더하므로, 한 달 동안 새로 채택한
+        페르소나만 넘기면 그 수에 비례하는 비용으로 계산됩니다.
+        """
+        
+        n = self.num_nodes
+        y = np.zeros(n, dtype=np.float64)
+        rows = np.flatnonzero(x)
+        counts = self.indptr[rows + 1] - self.indptr[rows]
+        ends = np.cumsum(counts)
+        block_start = 0
+        while block_start < len(rows):
+            # 간선 수가 PROPAGATE_BLOCK_EDGES를 넘지 않는 행 묶음 (최소 한 행)
+            base = ends[block_start - 1] if block_start else 0
+            block_stop = int(np.searchsorted(ends, base + PROPAGATE_BLOCK_EDGES, side="right"))
+            block_stop = max(block_stop, block_start + 1)
+            block_rows = rows[block_start:block_stop]
+            block_counts = counts[block_start:block_stop]
+            
+            # 각 행의 간선 위치 = 행 시작 위치 + 행 안에서의 순번
+            offsets = np.repeat(self.indptr[block_rows] - (ends[block_start:block_stop] - block_counts - base), block_counts)
+            positions = offsets + np.arange(len(offsets))
+            y += np.bincount(self.indices[positions], weights=np.repeat(x[block_rows], block_counts), minlength=n)
+            block_start = block_stop
+        return y
+
+def build_social_graph(personas: PersonaTable, rng: np.random.Generator,
+                       mean_degree: float = DIFFUSION_DEFAULTS["mean_degree"],
+                       homophily: float = DIFFUSION_DEFAULTS["homophily"]) -> SocialGraph:
+    """페르소나 패널의 소셜 그래프 생성
+    
+    영향을 주는 지인 수는 social_influence에 비례하는 포아송 분포에서 뽑고, 지인은 homophily 확률로
+    같은 세그먼트에서, 나머지는 전체에서 균등하게 고릅니다. 자기 자신은 다음 번호로 바꿉니다.
+    """
+    
+    n = len(personas)
+    segment = personas.columns["segment"].astype(np.int64)
+    influence = personas.columns["social_influence"].astype(np.float64)
+    if n < 2:
+        return SocialGraph(np.zeros(n + 1, dtype=np.int64), np.zeros(0, dtype=np.int32))
+    
+    degree = rng.poisson(mean_degree * influence / influence.mean())
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(degree, out=indptr[1:])
+    
+    # 세그먼트별 페르소나 위치 (같은 세그먼트 지인 추출용)
+    segment_members = np.argsort(segment, kind="stable").astype(np.int32)
+    segment_size = np.bincount(segment, minlength=len(SEGMENTS))
+    segment_start = np.concatenate([[0], np.cumsum(segment_size)[:-1]])
+    
+    indices = np.empty(indptr[-1], dtype=np.int32)
+    for start in range(0, n, GRAPH_BLOCK_SIZE):
+        stop = min(start + GRAPH_BLOCK_SIZE, n)
+        source = np.repeat(np.arange(start, stop, dtype=np.int64), degree[start:stop])
+        source_segment = segment[source]
+        
+        same = rng.random(len(source)) < homophily
+        within = segment_start[source_segment] + (rng.random(len(source)) * segment_size[source_segment]).astype(np.int64)
+        neighbor = np.where(same, segment_members[within], rng.integers(0, n, size=len(source)))
+        neighbor[neighbor == source] = (neighbor[neighbor == source] + 1) % n
+        
+        indices[indptr[start]:indptr[stop]] = neighbor
+    return SocialGraph(indptr, indices)
+
+def _trait_table(personas: List[Any]) -> PersonaTable:
+    """CustomerPersona 리스트에서 확산 계산에 쓰는 세그먼트/특성 컬럼만 담은 테이블
+    
+    이름, 직업, ID 등은 쓰지 않으므로 카탈로그 밖의 값이 있는 페르소나도 그대로 받습니다.
+    """
+    return PersonaTable({
+        "index": np.arange(len(personas), dtype=np.int64),
+        "segment": np.array([SEGMENTS.index(p.segment) for p in personas], dtype=np.int8),
+        **{trait: np.array([getattr(p, trait) for p in personas], dtype=np.int64) for trait in TRAIT_NAMES},
+    })
+
+def simulate_diffusion(personas: PersonaTable, months: int, rng: np.random.Generator, model: str = "bass",
+                       graph: SocialGraph = None, **params) -> Dict[str, Any]:
+    """월별 채택 확산 시뮬레이션
+    
+    model="bass": 미채택자는 매월 p_i + q_i * (영향을 주는 지인 중 채택자 비율) 확률로 채택합니다.
+    model="threshold": 채택자 비율이 개인 임계값 이상이거나 p_i 확률로 채택합니다.
+    p_i는 기술 친숙도, q_i와 임계값은 브랜드 충성도에 따라 달라지며,
+    영향력이 큰 페르소나일수록 더 많은 지인에게 영향을 줍니다.
+    채택자 수는 매월 새 채택자의 간선만 전파하여 누적합니다.
+    """
+    
+    if model not in ("bass", "threshold"):
+        raise ValueError(f"지원하지 않는 확산 모형입니다: {model}")
+    settings = dict(DIFFUSION_DEFAULTS)
+    settings.update(params)
+    
+    if not isinstance(personas, PersonaTable):
+        personas = _trait_table(personas)
+    if graph is None:
+        graph = build_social_graph(personas, rng, settings["mean_degree"], settings["homophily"])
+    n = len(personas)
+    
+    columns = personas.columns
+    innovation = settings["innovation"] * columns["tech_savviness"] / 10
+    imitation = settings["imitation"] * (11 - columns["brand_loyalty"]) / 10
+    threshold = settings["threshold_base"] + settings["threshold_per_loyalty"] * columns["brand_loyalty"]
+    
+    in_degree = graph.in_degrees()
+    in_degree[in_degree == 0] = np.inf  # 영향을 주는 지인이 없으면 주변 영향은 0
+    
+    adopted = np.zeros(n, dtype=bool)
+    adopted_neighbors = np.zeros(n, dtype=np.float64)
+    new_adopters = []
+    by_segment = np.zeros((months, len(SEGMENTS)), dtype=np.int64)
+    segment = columns["segment"]
+    for month in range(months):
+        pressure = adopted_neighbors / in_degree
+        roll = rng.random(n)
+        if model == "bass":
+            adopt = roll < innovation + imitation * pressure
+        else:
+            adopt = (pressure >= threshold) | (roll < innovation)
+        adopt &= ~adopted
+        adopted |= adopt
+        adopted_neighbors += graph.propagate(adopt)
+        
+        new_adopters.append(int(adopt.sum()))
+        by_segment[month] = np.bincount(segment[adopted], minlength=len(SEGMENTS))
+    
+    cumulative = np.cumsum(new_adopters)
+    return {
+        "model": model,
+        "months": [f"Month {month}" for month in range(1, months + 1)],
+        "new_adopters": new_adopters,
+        "cumulative_adopters": cumulative.tolist(),
+        "adoption_rate": (cumulative / n if n else cumulative * 0.0).tolist(),
+        "by_segment": {s.value: by_segment[:, idx].tolist() for idx, s in enumerate(SEGMENTS)},
+        "graph": {
+            "nodes": graph.num_nodes,
+            "edges": graph.num_edges,
+            "mean_degree": graph.num_edges / graph.num_nodes if graph.num_nodes else 0.0,
+        },
+    }
+
+def run_diffusion(engine: SimulationEngine, months: int = 12, model: str = "bass",
+                  graph: SocialGraph = None, **params) -> Dict[str, Any]:
+    """엔진의 페르소나 패널과 난수 생성기로 확산 시뮬레이션 실행"""
+    
+    with stage_context(engine.instrumentation, "diffusion", len(engine.personas)):
+        return simulate_diffusion(engine.personas, months, engine.rng, model, graph, **params)
+
+def adopters_to_new_users(diffusion: Dict[str, Any], market_users: int) -> List[int]:
+    """패널의 월별 신규 채택자 수를 시장 규모로 환산 (run_financial_simulation의 new_users 입력용)"""
+    
+    panel_size = diffusion["graph"]["nodes"]
+    if panel_size == 0:
+        return [0] * len(diffusion["new_adopters"])
+    return [int(count * market_users / panel_size) for count in diffusion["new_adopters"]]
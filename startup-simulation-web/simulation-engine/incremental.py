@@ -0,0 +1,193 @@
+"""
+증분 재시뮬레이션
+BMC를 조금 고쳐 다시 실행할 때 각 단계의 결과를 그 단계가 실제로 쓰는 입력으로 키를 만들어 보관하고,
+바뀐 단계만 다시 계산합니다.
+
+- 페르소나: (seed, 페르소나 수)
+- 인터뷰: 질문 문자열별 블록 (질문마다 독립 난수 스트림)
+- 가설 검증: (가설, 관련 질문 목록, threshold)
+- 재무 예측: BMC에서 뽑은 재무 가정 (price -> arpu 등)
+
+가설을 하나 추가하면 그 가설만 검증하고, 가격을 바꾸면 가격 질문 인터뷰와 재무 예측만 다시 계산합니다.
+단계마다 난수 스트림이 따로 있으므로 결과는 같은 seed의 create_simulation과 다르지만,
+같은 입력이면 편집 순서와 관계없이 항상 같은 결과를 냅니다.
+결과의 페르소나/응답 레코드는 세션 캐시와 공유되므로 읽기 전용으로 다뤄야 합니다.
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from simulation_engine import (
+    SimulationEngine, PersonaTable, InterviewTable, HypothesisResult, RESPONSE_RULES,
+    build_summary, bmc_financial_assumptions, bmc_interview_questions, classify_question, hypothesis_to_dict,
+    new_simulation_id
+)
+from keyword_matcher import KeywordMatcher
+
+# 단계별 난수 스트림 번호
+PERSONA_STREAM = 0
+INTERVIEW_STREAM = 1
+
+# 현재 질문 외에 보관하는 인터뷰 블록/재무 예측 수 (값을 되돌렸을 때 바로 재사용)
+SPARE_ENTRIES = 16
+
+def _stable_hash(text: str) -> int:
+    """프로세스와 무관하게 같은 64비트 해시"""
+    return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+
+class _LRU(OrderedDict):
+    """최대 크기를 넘으면 가장 오래 쓰지 않은 항목부터 버리는 dict"""
+    
+    def __init__(self, max_entries: int):
+        super().__init__()
+        self.max_entries = max_entries
+    
+    def lookup(self, key) -> Any:
+        value = self.get(key)
+        if value is not None:
+            self.move_to_end(key)
+        return value
+    
+    def store(self, key, value) -> None:
+        self[key] = value
+        self.move_to_end(key)
+        while len(self) > self.max_entries:
+            self.popitem(last=False)
+
+class IncrementalSimulation:
+    """BMC 편집 세션 (단계별 결과를 보관하며 바뀐 부분만 재계산)
+    
+    사용 예:
+        session = IncrementalSimulation(seed=42, persona_count=20)
+        result = session.run(bmc)
+        bmc["hypotheses"].append("...")
+        result = session.run(bmc)  # 새 가설만 검증
+        print(session.last_recomputed)
+    """
+    
+    def __init__(self, seed: Optional[int] = None, persona_count: int = 20,
+                 questions: List[str] = None, threshold: float = 0.6, months: int = 12):
+        # seed가 없으면 세션 동안 고정할 seed를 하나 정합니다
+        self.seed = seed if seed is not None else int(np.random.SeedSequence().entropy)
+        self.persona_count = persona_count
+        self.questions = list(questions) if questions else None
+        self.threshold = threshold
+        self.months = months
+        
+        self._engine = SimulationEngine({}, columnar=True, seed=self.seed)
+        self._pools = InterviewTable()
+        self._personas: Optional[PersonaTable] = None
+        self._persona_records: Optional[List[Dict[str, Any]]] = None
+        self._persona_ids: Optional[List[str]] = None
+        self._interview_blocks = _LRU(SPARE_ENTRIES)
+        self._hypothesis_results: Dict[Tuple, Tuple[HypothesisResult, Dict[str, Any]]] = {}
+        self._financials = _LRU(SPARE_ENTRIES)
+        self.last_recomputed: Dict[str, Any] = {}
+    
+    def _persona_stage(self) -> bool:
+        if self._personas is not None:
+            return False
+        self._engine.rng = np.random.default_rng([self.seed, PERSONA_STREAM])
+        self._personas = self._engine.generate_personas(self.persona_count)
+        self._persona_records = self._personas.to_records()
+        self._persona_ids = self._personas.ids
+        return True
+    
+    def _interview_block(self, question: str) -> Tuple[Tuple[InterviewTable, List[Dict[str, Any]]], bool]:
+        """질문 하나의 인터뷰 블록과 페르소나 순서의 응답 레코드"""
+        
+        cached = self._interview_blocks.lookup(question)
+        if cached is not None:
+            return cached, False
+        # 질문마다 독립 난수 스트림을 쓰므로 다른 질문의 추가/변경이 이 질문의 답변에 영향을 주지 않습니다
+        self._engine.rng = np.random.default_rng([self.seed, INTERVIEW_STREAM, _stable_hash(question)])
+        block = InterviewTable(pools=self._pools)
+        self._engine.interview_panel(self._personas, [question], into=block)
+        records = block.to_records()
+        entry = (block, [records[pid][0] for pid in self._persona_ids])
+        self._interview_blocks.store(question, entry)
+        return entry, True
+    
+    def run(self, bmc_data: Dict) -> Dict[str, Any]:
+        """BMC로 시뮬레이션 실행 (create_simulation과 같은 구조의 결과 반환)"""
+        
+        questions = self.questions or bmc_interview_questions(bmc_data)
+        hypotheses = bmc_data.get("hypotheses", [])
+        recomputed = {"personas": self._persona_stage(), "interviews": [], "hypotheses": [], "financial": False}
+        
+        # 1. 질문별 인터뷰 블록 (캐시에 없는 질문만 인터뷰)
+        blocks = []
+        for question in questions:
+            entry, computed = self._interview_block(question)
+            blocks.append(entry)
+            if computed:
+                recomputed["interviews"].append(question)
+        # 현재 질문 블록이 밀려나지 않도록 캐시 크기를 맞춥니다
+        self._interview_blocks.max_entries = len(questions) + SPARE_ENTRIES
+        
+        # 2. 가설 검증 (가설과 관련된 질문 블록이 바뀐 가설만)
+        question_keywords = [set(RESPONSE_RULES[classify_question(q)]["keywords"]) for q in questions]
+        matcher = KeywordMatcher.compile(set().union(*question_keywords))
+        keys = []
+        for hypothesis in hypotheses:
+            matched = set(matcher.matches(hypothesis))
+            relevant = tuple(q for q, keywords in zip(questions, question_keywords) if keywords & matched)
+            keys.append((hypothesis, relevant, self.threshold))
+        
+        pending = [key for key in dict.fromkeys(keys) if key not in self._hypothesis_results]
+        if pending:
+            self._validate(pending, blocks, questions)
+            recomputed["hypotheses"] = [key[0] for key in pending]
+        # 현재 가설만 남깁니다
+        self._hypothesis_results = {key: self._hypothesis_results[key] for key in keys}
+        validation_results = [self._hypothesis_results[key][0] for key in keys]
+        
+        # 3. 재무 예측 (재무 가정이 바뀐 경우만)
+        assumptions = bmc_financial_assumptions(bmc_data)
+        financial_key = json.dumps([self.months, assumptions], sort_keys=True, default=str)
+        financial_results = self._financials.lookup(financial_key)
+        if financial_results is None:
+            financial_results = self._engine.run_financial_simulation(months=self.months, assumptions=assumptions)
+            self._financials.store(financial_key, financial_results)
+            recomputed["financial"] = True
+        
+        self.last_recomputed = recomputed
+        
+        # 4. 결과 종합 (응답 레코드는 블록별로 만들어 둔 것을 페르소나별로 모읍니다)
+        block_records = [records for _, records in blocks]
+        return {
+            "simulation_id": new_simulation_id(),
+            "timestamp": datetime.now().isoformat(),
+            "personas": list(self._persona_records),
+            "interview_results": {
+                pid: [records[i] for records in block_records] for i, pid in enumerate(self._persona_ids)
+            },
+            "validation_results": [self._hypothesis_results[key][1] for key in keys],
+            "financial_projection": financial_results,
+            "market_analysis": self._engine.market_data,
+            "summary": build_summary(len(self._personas), len(questions), validation_results, financial_results)
+        }
+    
+    def _validate(self, pending: List[Tuple], blocks: List[Tuple[InterviewTable, List]], questions: List[str]) -> None:
+        """관련 질문 블록만 모은 테이블로 가설들을 검증"""
+        
+        # 관련 질문 조합이 같은 가설은 같은 응답 테이블로 한 번에 검증합니다
+        by_relevant: Dict[Tuple, List[Tuple]] = {}
+        for key in pending:
+            by_relevant.setdefault((key[1], key[2]), []).append(key)
+        
+        block_of = {question: block for question, (block, _) in zip(questions, blocks)}
+        for (relevant, threshold), group in by_relevant.items():
+            table = InterviewTable(pools=self._pools)
+            for question in relevant:
+                table.extend(block_of[question])
+            self._engine.personas = self._personas
+            self._engine.interview_results = table
+            results = self._engine.validate_hypotheses([key[0] for key in group], threshold)
+            for key, result in zip(group, results):
+                self._hypothesis_results[key] = (result, hypothesis_to_dict(result))
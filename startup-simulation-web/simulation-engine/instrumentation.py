@@ -0,0 +1,222 @@
+"""
+시뮬레이션 단계별 계측
+단계(페르소나 생성, 인터뷰, 가설 검증, 재무 모델, 직렬화)마다 실행 시간, CPU 시간,
+파이썬 메모리 블록 수 순변화, 처리량을 기록하고 진단 dict, Prometheus/OpenMetrics 텍스트,
+트레이싱 span 콜백으로 내보냅니다.
+"""
+
+import functools
+import inspect
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Callable, Optional, Union
+
+# 계측이 꺼져 있을 때 재사용하는 빈 컨텍스트 (호출마다 새 객체를 만들지 않습니다)
+NULL_STAGE = nullcontext()
+
+@dataclass
+class StageSpan:
+    """단계 한 번의 실행 기록 (트레이싱 콜백에 전달됩니다)"""
+    name: str
+    items: int = 0
+    start_time: float = 0.0  # 시작 시각 (epoch 초)
+    wall_time: float = 0.0
+    cpu_time: float = 0.0  # 실행 스레드의 CPU 시간
+    net_block_delta: int = 0  # 실행 전후 파이썬 메모리 블록 수의 차이 (해제가 더 많으면 음수)
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+@dataclass
+class StageMetrics:
+    """단계별 누적 지표"""
+    calls: int = 0
+    items: int = 0
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    net_block_delta: int = 0  # 실행별 순변화의 합 (누적 할당량이 아님)
+    
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.wall_time if self.wall_time > 0 else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "items": self.items,
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+            "net_block_delta": self.net_block_delta,
+            "items_per_second": self.items_per_second,
+        }
+
+class _StageTimer:
+    """단계 측정 컨텍스트 (같은 이름의 단계 안에서 다시 열리면 중복 집계하지 않습니다)"""
+    
+    __slots__ = ("instrumentation", "span", "_active", "_wall", "_cpu", "_blocks")
+    
+    def __init__(self, instrumentation: "Instrumentation", span: StageSpan):
+        self.instrumentation = instrumentation
+        self.span = span
+        self._active = False
+    
+    def __enter__(self) -> StageSpan:
+        stack = self.instrumentation._active_stages()
+        self._active = not stack or stack[-1] != self.span.name
+        if self._active:
+            stack.append(self.span.name)
+            self.span.start_time = time.time()
+            self._blocks = sys.getallocatedblocks()
+            self._cpu = time.thread_time()
+            self._wall = time.perf_counter()
+        return self.span
+    
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if not self._active:
+            return False
+        span = self.span
+        span.wall_time = time.perf_counter() - self._wall
+        span.cpu_time = time.thread_time() - self._cpu
+        span.net_block_delta = sys.getallocatedblocks() - self._blocks
+        self.instrumentation._active_stages().pop()
+        if exc_type is not None:
+            span.attributes["error"] = exc_type.__name__
+        self.instrumentation.record(span)
+        return False
+
+class Instrumentation:
+    """단계별 지표 수집기
+    
+    on_span을 주면 단계가 끝날 때마다 StageSpan을 전달합니다 (트레이싱 연동용).
+    여러 실행의 지표를 한곳에 모으려면 실행별 수집기의 on_span에 공유 수집기의 record를 연결합니다.
+    """
+    
+    def __init__(self, on_span: Optional[Callable[[StageSpan], None]] = None):
+        self.on_span = on_span
+        self._metrics: Dict[str, StageMetrics] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+    
+    def _active_stages(self) -> List[str]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+    
+    def stage(self, name: str, items: int = 0, **attributes) -> _StageTimer:
+        """단계 측정 컨텍스트 생성"""
+        return _StageTimer(self, StageSpan(name=name, items=items, attributes=attributes))
+    
+    def record(self, span: StageSpan) -> None:
+        """끝난 단계 기록을 누적하고 콜백에 전달"""
+        
+        with self._lock:
+            metrics = self._metrics.get(span.name)
+            if metrics is None:
+                metrics = self._metrics[span.name] = StageMetrics()
+            metrics.calls += 1
+            metrics.items += span.items
+            metrics.wall_time += span.wall_time
+            metrics.cpu_time += span.cpu_time
+            metrics.net_block_delta += span.net_block_delta
+        
+        if self.on_span is not None:
+            self.on_span(span)
+    
+    def metrics(self) -> Dict[str, StageMetrics]:
+        """단계별 누적 지표 스냅샷"""
+        with self._lock:
+            return {name: StageMetrics(**vars(m)) for name, m in self._metrics.items()}
+    
+    def reset(self) -> None:
+        """누적 지표 초기화"""
+        with self._lock:
+            self._metrics.clear()
+    
+    def diagnostics(self) -> Dict[str, Any]:
+        """결과에 붙일 진단 블록 생성"""
+        return {"stages": {name: m.to_dict() for name, m in self.metrics().items()}}
+    
+    def to_prometheus(self, prefix: str = "simulation", openmetrics: bool = False) -> str:
+        """누적 지표를 Prometheus 텍스트 형식(또는 OpenMetrics)으로 출력"""
+        
+        families = [
+            ("stage_calls", "counter", "단계 실행 횟수", lambda m: m.calls),
+            ("stage_wall_seconds", "counter", "단계 실행 시간 (초)", lambda m: m.wall_time),
+            ("stage_cpu_seconds", "counter", "단계 CPU 시간 (초)", lambda m: m.cpu_time),
+            ("stage_items", "counter", "단계에서 처리한 항목 수", lambda m: m.items),
+            ("stage_net_block_delta", "gauge", "단계 실행 전후 파이썬 메모리 블록 수 차이의 합 (음수 가능)", lambda m: m.net_block_delta),
+        ]
+        metrics = self.metrics()
+        
+        lines = []
+        for suffix, metric_type, help_text, value in families:
+            name = f"{prefix}_{suffix}"
+            # Prometheus 텍스트 형식은 _total을 포함한 이름, OpenMetrics는 접미사 없는 패밀리 이름을 씁니다
+            sample_name = f"{name}_total" if metric_type == "counter" else name
+            family_name = name if openmetrics else sample_name
+            lines.append(f"# HELP {family_name} {help_text}")
+            lines.append(f"# TYPE {family_name} {metric_type}")
+            for stage_name, m in metrics.items():
+                lines.append(f'{sample_name}{{stage="{_escape_label(stage_name)}"}} {value(m)}')
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def stage_context(instrumentation: Optional[Instrumentation], name: str, items: int = 0, **attributes):
+    """계측기가 없으면 공유 빈 컨텍스트를, 있으면 단계 측정 컨텍스트를 반환
+    
+    빈 컨텍스트의 as 대상은 None이므로 항목 수는 미리 넘겨야 합니다.
+    """
+    if instrumentation is None:
+        return NULL_STAGE
+    return instrumentation.stage(name, items, **attributes)
+
+def instrumented(name: str, items: Union[str, Callable[..., int], None] = None):
+    """메서드를 단계로 측정하는 데코레이터 (self.instrumentation이 None이면 그대로 호출)
+    
+    items는 항목 수로 쓸 인자 이름이나 (self, 인자...)를 받아 항목 수를 돌려주는 함수입니다.
+    """
+    
+    def decorator(method):
+        signature = inspect.signature(method)
+        
+        def count_items(self, args, kwargs) -> int:
+            if items is None:
+                return 0
+            if callable(items):
+                return items(self, *args, **kwargs)
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            return bound.arguments[items]
+        
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            instrumentation = self.instrumentation
+            if instrumentation is None:
+                return method(self, *args, **kwargs)
+            with instrumentation.stage(name, count_items(self, args, kwargs)):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+def otel_span_callback(tracer: Any) -> Callable[[StageSpan], None]:
+    """OpenTelemetry Tracer로 끝난 단계를 span으로 보내는 on_span 콜백 생성
+    
+    tracer는 opentelemetry.trace.get_tracer(...)로 얻은 객체이며, 이 모듈은 opentelemetry를 import하지 않습니다.
+    """
+    
+    def on_span(span: StageSpan) -> None:
+        start_ns = int(span.start_time * 1e9)
+        otel_span = tracer.start_span(f"simulation.{span.name}", start_time=start_ns)
+        otel_span.set_attribute("simulation.items", span.items)
+        otel_span.set_attribute("simulation.cpu_time", span.cpu_time)
+        otel_span.set_attribute("simulation.net_block_delta", span.net_block_delta)
+        for key, value in span.attributes.items():
+            otel_span.set_attribute(f"simulation.{key}", value)
+        otel_span.end(end_time=start_ns + int(span.wall_time * 1e9))
+    return on_span
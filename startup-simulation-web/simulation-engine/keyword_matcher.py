@@ -0,0 +1,133 @@
+"""
+키워드 다중 패턴 매칭
+Aho-Corasick 오토마톤으로 여러 단어를 텍스트 한 번 순회로 찾고,
+규칙 테이블 기반 질문 분류기와 가설 키워드 매처를 제공합니다.
+"""
+
+from collections import deque
+from functools import lru_cache
+from typing import List, Dict, Tuple, Iterable, FrozenSet, Sequence
+
+# 질문/가설 문자열별 매칭 결과 캐시 크기
+MATCH_CACHE_SIZE = 4096
+
+class KeywordAutomaton:
+    """Aho-Corasick 오토마톤
+    
+    "pattern in text"와 같은 부분 문자열 의미로, 텍스트에 들어 있는 패턴을 모두 찾습니다.
+    대소문자는 구분하므로 필요하면 호출하는 쪽에서 텍스트를 소문자로 바꿉니다.
+    """
+    
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = list(dict.fromkeys(patterns))
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[int, ...]] = [()]
+        
+        # 빈 패턴은 어떤 텍스트에도 들어 있습니다
+        self._always = tuple(pid for pid, p in enumerate(self.patterns) if not p)
+        
+        # 1. 트라이 구성
+        for pid, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                node = nxt
+            self._output[node] += (pid,)
+        
+        # 2. 실패 링크 (BFS), 출력은 실패 링크를 따라 합쳐 둡니다
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0)
+                self._output[child] += self._output[self._fail[child]]
+                queue.append(child)
+    
+    def __len__(self) -> int:
+        return len(self.patterns)
+    
+    def find(self, text: str) -> FrozenSet[int]:
+        """텍스트에 들어 있는 패턴 번호 집합"""
+        
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set(self._always)
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if output[node]:
+                found.update(output[node])
+        return frozenset(found)
+    
+    def find_terms(self, text: str) -> List[str]:
+        """텍스트에 들어 있는 패턴 목록 (패턴 등록 순서)"""
+        return [self.patterns[pid] for pid in sorted(self.find(text))]
+
+class QuestionRouter:
+    """규칙 테이블 기반 질문 분류기
+    
+    routes는 우선순위 순의 (카테고리, 조건 목록)이며, 조건 하나에 든 단어가 모두 질문(소문자)에
+    들어 있으면 그 카테고리로 분류합니다. 어느 조건도 맞지 않으면 default를 반환합니다.
+    모든 단어를 하나의 오토마톤으로 컴파일하고, 분류 결과는 질문 문자열별로 캐시합니다.
+    """
+    
+    def __init__(self, routes: Sequence[Tuple[str, Sequence[Sequence[str]]]], default: str = "general"):
+        self.routes = [(category, [tuple(clause) for clause in clauses]) for category, clauses in routes]
+        self.default = default
+        
+        terms = [term for _, clauses in self.routes for clause in clauses for term in clause]
+        self._automaton = KeywordAutomaton(terms)
+        term_ids = {term: pid for pid, term in enumerate(self._automaton.patterns)}
+        # 조건별 필요한 단어 번호 (우선순위 순)
+        self._clauses = [
+            (route_idx, frozenset(term_ids[term] for term in clause))
+            for route_idx, (_, clauses) in enumerate(self.routes)
+            for clause in clauses
+        ]
+        self.classify = lru_cache(maxsize=MATCH_CACHE_SIZE)(self._classify)
+    
+    def _classify(self, question: str) -> str:
+        found = self._automaton.find(question.lower())
+        if not found:
+            return self.default
+        for route_idx, required in self._clauses:
+            if required <= found:
+                return self.routes[route_idx][0]
+        return self.default
+
+@lru_cache(maxsize=64)
+def _compile_matcher(keywords: Tuple[str, ...]) -> "KeywordMatcher":
+    return KeywordMatcher(keywords)
+
+class KeywordMatcher:
+    """가설 키워드 매처 (가설 문자열별 결과 캐시)"""
+    
+    def __init__(self, keywords: Iterable[str]):
+        self._automaton = KeywordAutomaton(keywords)
+        self.matches = lru_cache(maxsize=MATCH_CACHE_SIZE)(self._matches)
+    
+    @classmethod
+    def compile(cls, keywords: Iterable[str]) -> "KeywordMatcher":
+        """같은 키워드 집합이면 컴파일한 매처를 재사용"""
+        return _compile_matcher(tuple(sorted(set(keywords))))
+    
+    @property
+    def keywords(self) -> List[str]:
+        return self._automaton.patterns
+    
+    def _matches(self, text: str) -> Tuple[str, ...]:
+        """텍스트(소문자로 변환)에 들어 있는 키워드"""
+        return tuple(self._automaton.find_terms(text.lower()))
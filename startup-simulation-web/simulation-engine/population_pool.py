@@ -0,0 +1,198 @@
+"""
+메모리 매핑 인구 풀
+대규모 합성 인구를 컬럼별 .npy 파일로 한 번 생성해 두고, 요청마다 인덱스 샘플링으로
+패널을 뽑습니다. 파일은 읽기 전용 memmap으로 열리므로 여러 워커 프로세스가
+OS 페이지 캐시를 공유하며, 프로세스마다 인구 전체를 메모리에 올리지 않습니다.
+
+디렉터리 구조: 생성할 때마다 버전 하위 디렉터리(v-<build_id>/)에 컬럼 파일과 meta.json을 쓰고,
+현재 버전 이름을 담은 CURRENT 파일을 원자적으로 교체하여 새 풀로 전환합니다.
+버전 공개(이름 변경, CURRENT 교체, 오래된 버전 정리)는 잠금 파일(.lock)로 직렬화하므로
+동시에 여러 프로세스가 생성해도 서로의 버전을 지우지 않습니다 (fcntl이 없는 플랫폼 제외).
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows 등에서는 잠금 없이 생성합니다 (동시 생성 미지원)
+    fcntl = None
+
+from simulation_engine import SimulationEngine, PersonaTable
+
+POPULATION_FORMAT_VERSION = 1
+
+# 생성 시 한 번에 만드는 페르소나 수 (중간 배열의 최대 메모리를 제한)
+BUILD_BLOCK_SIZE = 1000000
+
+# 현재 버전 하위 디렉터리 이름을 담은 파일
+CURRENT_POINTER = "CURRENT"
+
+# 버전 공개 구간을 직렬화하는 잠금 파일
+LOCK_FILE = ".lock"
+
+@contextmanager
+def _publish_lock(directory: str) -> Iterator[None]:
+    """인구 풀 디렉터리의 버전 공개 잠금 (프로세스 간 배타)"""
+    
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(directory, LOCK_FILE), "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+def _current_version(directory: str) -> str:
+    """현재 버전 디렉터리 경로 (CURRENT가 없으면 버전 없이 파일을 바로 담은 이전 형식)"""
+    
+    pointer = os.path.join(directory, CURRENT_POINTER)
+    if not os.path.exists(pointer):
+        return directory
+    with open(pointer, encoding="utf-8") as f:
+        return os.path.join(directory, f.read().strip())
+
+def build_population(directory: str, size: int, seed: Optional[int] = None,
+                     block_size: int = BUILD_BLOCK_SIZE) -> "PopulationPool":
+    """인구 풀 생성
+    
+    새 버전 디렉터리(<directory>/v-<build_id>/)에 컬럼마다 <컬럼>.npy와 meta.json을 다 쓴 뒤
+    CURRENT를 원자적으로 교체하므로, 다른 프로세스는 항상 이전 풀이나 새 풀 중 하나를 온전히 엽니다.
+    교체 직전 버전은 아직 열고 있는 프로세스를 위해 남기고 그보다 오래된 버전만 지웁니다.
+    """
+    
+    os.makedirs(directory, exist_ok=True)
+    build_id = uuid.uuid4().hex
+    version = f"v-{build_id}"
+    tmp_dir = tempfile.mkdtemp(dir=directory, suffix=".tmp")
+    try:
+        engine = SimulationEngine({}, columnar=True, seed=seed)
+        dtypes = {name: values.dtype for name, values in PersonaTable().columns.items()}
+        columns = {
+            name: np.lib.format.open_memmap(os.path.join(tmp_dir, f"{name}.npy"), mode="w+", dtype=dtype, shape=(size,))
+            for name, dtype in dtypes.items()
+        }
+        for start in range(0, size, block_size):
+            block = engine.generate_persona_arrays(min(block_size, size - start), start=start)
+            for name, values in block.items():
+                columns[name][start:start + len(values)] = values
+        for values in columns.values():
+            values.flush()
+        del columns
+        
+        with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "format_version": POPULATION_FORMAT_VERSION,
+                "build_id": build_id,
+                "size": size,
+                "seed": seed,
+                "columns": {name: dtype.str for name, dtype in dtypes.items()},
+            }, f, ensure_ascii=False, indent=2)
+        
+        # 생성 중인 임시 디렉터리는 v- 이름이 아니므로 다른 생성의 정리 대상이 되지 않습니다
+        with _publish_lock(directory):
+            os.rename(tmp_dir, os.path.join(directory, version))
+            previous = os.path.basename(_current_version(directory))
+            _write_pointer(directory, version)
+            for name in os.listdir(directory):
+                if name.startswith("v-") and name not in (version, previous):
+                    shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+            # 잠금을 놓으면 다른 생성이 이 버전을 정리할 수 있으므로 잠금 안에서 엽니다
+            return PopulationPool(directory)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+def _write_pointer(directory: str, version: str) -> None:
+    """CURRENT를 원자적으로 교체 (임시 파일 이름은 생성마다 고유)"""
+    
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f"{CURRENT_POINTER}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(version)
+        os.replace(tmp_path, os.path.join(directory, CURRENT_POINTER))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class PopulationPool:
+    """읽기 전용 memmap 인구 풀
+    
+    패널의 index 컬럼은 인구 안의 위치이므로 페르소나 ID는 인구 전체에서 고유합니다.
+    """
+    
+    def __init__(self, directory: str):
+        self.directory = directory
+        # 연 시점의 버전에 고정되므로 이후 다시 생성해도 이 객체는 같은 풀을 읽습니다
+        self.path = _current_version(directory)
+        with open(os.path.join(self.path, "meta.json"), encoding="utf-8") as f:
+            self.meta: Dict[str, Any] = json.load(f)
+        if self.meta.get("format_version") != POPULATION_FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 인구 풀 형식입니다: {self.meta.get('format_version')}")
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode="r")
+            for name in self.meta["columns"]
+        }
+    
+    def __len__(self) -> int:
+        return self.meta["size"]
+    
+    @property
+    def fingerprint(self) -> str:
+        """캐시 키 등에 쓰는 풀 식별 문자열 (다시 생성하면 바뀝니다)"""
+        return f"population:{self.meta['build_id']}"
+    
+    def table(self) -> PersonaTable:
+        """인구 전체를 복사 없이 감싼 테이블"""
+        return PersonaTable(dict(self.columns))
+    
+    def slice(self, start: int, stop: int) -> PersonaTable:
+        """연속 구간 패널 (복사 없는 memmap 뷰)"""
+        return PersonaTable({name: values[start:stop] for name, values in self.columns.items()})
+    
+    def sample_indices(self, count: int, rng: np.random.Generator) -> np.ndarray:
+        """패널로 뽑을 인구 위치 (비복원 추출, 정렬되어 있어 페이지를 순서대로 읽습니다)
+        
+        페르소나 ID는 인구 안의 위치이므로 한 패널에 같은 위치가 두 번 들어가면 ID가 겹칩니다.
+        """
+        
+        if count > len(self):
+            raise ValueError(f"인구 풀({len(self)}명)보다 많은 페르소나를 비복원 추출할 수 없습니다: {count}")
+        return np.sort(rng.choice(len(self), size=count, replace=False))
+    
+    def take(self, indices: np.ndarray) -> PersonaTable:
+        """지정한 위치의 페르소나만 읽어 패널 테이블 생성 (패널 크기만큼만 복사)"""
+        return PersonaTable({name: values[indices] for name, values in self.columns.items()})
+    
+    def sample(self, count: int, rng: np.random.Generator) -> PersonaTable:
+        """무작위 패널 추출"""
+        return self.take(self.sample_indices(count, rng))
+
+# 프로세스별로 연 풀 (워커가 요청마다 파일을 다시 열지 않도록 재사용)
+_open_pools: Dict[str, PopulationPool] = {}
+_open_pools_lock = threading.Lock()
+
+def get_population(directory: str) -> PopulationPool:
+    """이 프로세스에서 연 인구 풀 반환
+    
+    호출마다 CURRENT를 확인하여, 다시 생성되어 버전이 바뀌었으면 새 버전을 엽니다.
+    """
+    
+    key = os.path.abspath(directory)
+    path = _current_version(key)
+    with _open_pools_lock:
+        pool = _open_pools.get(key)
+        if pool is None or pool.path != path:
+            pool = _open_pools[key] = PopulationPool(key)
+        return pool
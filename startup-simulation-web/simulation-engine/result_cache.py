@@ -0,0 +1,137 @@
+"""
+시뮬레이션 결과 캐시
+정규화한 BMC, seed, 페르소나 수, 질문 목록을 키로 결과를 재사용합니다.
+메모리 LRU 계층과 선택적인 디스크 계층으로 구성됩니다.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Callable
+
+# 엔진의 결과 형식이나 난수 사용 순서가 바뀌면 올려서 기존 캐시를 무효화합니다
+CACHE_VERSION = 3
+
+class SimulationCache:
+    """메모리 LRU + 디스크 2계층 결과 캐시"""
+    
+    def __init__(self, max_entries: int = 128, directory: Optional[str] = None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        # 메모리 계층은 pickle 바이트로 보관하여 반환 시 깊은 복사 대신 역직렬화만 합니다
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    
+    @staticmethod
+    def make_key(bmc_data: Dict, seed: int, persona_count: int, questions: List[str],
+                 population: Optional[str] = None, bootstrap: Optional[int] = None) -> str:
+        """캐시 키 생성 (정규화된 JSON의 SHA-256)
+        
+        population은 인구 풀 식별 문자열, bootstrap은 부트스트랩 재표본 수이며,
+        없으면 키에 넣지 않아 기존 키가 그대로 유지됩니다.
+        """
+        
+        payload = {
+            "version": CACHE_VERSION,
+            "bmc": bmc_data,
+            "seed": seed,
+            "persona_count": persona_count,
+            "questions": list(questions),
+        }
+        if population is not None:
+            payload["population"] = population
+        if bootstrap is not None:
+            payload["bootstrap"] = bootstrap
+        canonical = json.dumps(
+            payload,
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(",", ":"),
+            default=str
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """캐시 조회 (메모리 -> 디스크 순, 없으면 None)"""
+        
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return pickle.loads(payload)
+        
+        payload = self._read_disk(key)
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, payload)
+        return pickle.loads(payload)
+    
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """결과 저장"""
+        
+        payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._remember(key, payload)
+        self._write_disk(key, payload)
+    
+    def get_or_compute(self, key: str, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """캐시에 없으면 계산 후 저장"""
+        
+        result = self.get(key)
+        if result is None:
+            result = compute()
+            self.put(key, result)
+        return result
+    
+    def clear(self) -> None:
+        """메모리 계층 비우기 (디스크 파일은 유지)"""
+        with self._lock:
+            self._memory.clear()
+    
+    def __len__(self) -> int:
+        return len(self._memory)
+    
+    def _remember(self, key: str, payload: bytes) -> None:
+        self._memory[key] = payload
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.pkl")
+    
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+    
+    def _write_disk(self, key: str, payload: bytes) -> None:
+        if not self.directory:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 임시 파일에 쓴 뒤 교체하여 다른 프로세스가 반쯤 쓰인 파일을 읽지 않도록 합니다
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
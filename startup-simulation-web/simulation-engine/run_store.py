@@ -0,0 +1,404 @@
+"""
+시뮬레이션 실행 저장소
+여러 실행의 결과를 로컬에 쌓아 두고 실행 간 비교 질의를 빠르게 처리합니다.
+
+- SQLite: 실행별 요약 지표, 가설별 검증 결과, 월별 재무 시계열 (BMC 해시/가설 문장/지표에 인덱스)
+- 컬럼형 바이너리(.npz): 실행별 페르소나/인터뷰 테이블 (serialization의 컬럼형 형식)
+
+사용 예:
+    with RunStore("runs/") as store:
+        simulation_id = store.run(bmc, seed=42, persona_count=1000)
+        store.find(hypothesis="월 구독료 9,900원은 적정 가격이다", status="validated")
+        store.metric_trend(bmc, "break_even_month")
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+
+import numpy as np
+
+from simulation_engine import (
+    SimulationAPI, PersonaTable, InterviewTable, CustomerPersona, CustomerSegment, InterviewResponse,
+    ResponseSentiment, SIMULATION_ID_PATTERN, build_summary, bmc_interview_questions, hypothesis_to_dict,
+    new_simulation_id
+)
+from serialization import write_tables_columnar, read_simulation_columnar
+
+# 저장 형식이 바뀌면 올립니다 (스키마가 다른 저장소는 열지 않음)
+STORE_VERSION = 1
+
+# find()에서 범위 조건과 정렬에 쓸 수 있는 실행 지표 (모두 인덱스가 있음)
+METRIC_COLUMNS = (
+    "persona_count", "total_hypotheses", "validated_hypotheses", "invalidated_hypotheses",
+    "validation_rate", "break_even_month", "projected_roi", "total_revenue", "total_users",
+)
+
+FINANCIAL_SERIES = ("users", "revenue", "costs", "profit", "cumulative_profit")
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    simulation_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    bmc_hash TEXT NOT NULL,
+    seed INTEGER,
+    question_count INTEGER NOT NULL,
+    {", ".join(f"{name} {'REAL' if name in ('validation_rate', 'projected_roi', 'total_revenue') else 'INTEGER'}" for name in METRIC_COLUMNS)},
+    bmc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_bmc ON runs (bmc_hash, created_at);
+CREATE INDEX IF NOT EXISTS runs_created ON runs (created_at);
+{"".join(f"CREATE INDEX IF NOT EXISTS runs_{name} ON runs ({name});" for name in METRIC_COLUMNS)}
+CREATE TABLE IF NOT EXISTS hypotheses (
+    simulation_id TEXT NOT NULL REFERENCES runs (simulation_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    hypothesis TEXT NOT NULL,
+    status TEXT NOT NULL,
+    confidence_score REAL NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (simulation_id, position)
+);
+CREATE INDEX IF NOT EXISTS hypotheses_text ON hypotheses (hypothesis, status);
+CREATE TABLE IF NOT EXISTS financial (
+    simulation_id TEXT NOT NULL REFERENCES runs (simulation_id) ON DELETE CASCADE,
+    month INTEGER NOT NULL,
+    {", ".join(f"{name} REAL" for name in FINANCIAL_SERIES)},
+    PRIMARY KEY (simulation_id, month)
+) WITHOUT ROWID;
+"""
+
+def bmc_hash(bmc_data: Dict) -> str:
+    """BMC 식별 해시 (정규화된 JSON의 SHA-256, 키 순서와 무관)"""
+    canonical = json.dumps(bmc_data, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def tables_from_records(personas: List[Dict[str, Any]],
+                        interview_results: Dict[str, List[Dict[str, Any]]]) -> Tuple[PersonaTable, InterviewTable]:
+    """create_simulation 결과의 페르소나/응답 레코드를 컬럼형 테이블로 변환"""
+    
+    persona_table = PersonaTable.from_personas([
+        CustomerPersona(**{**record, "segment": CustomerSegment(record["segment"])}) for record in personas
+    ])
+    interview_table = InterviewTable.from_responses({
+        pid: [InterviewResponse(**{**r, "sentiment": ResponseSentiment(r["sentiment"])}) for r in responses]
+        for pid, responses in interview_results.items()
+    })
+    return persona_table, interview_table
+
+class RunStore:
+    """SQLite + 컬럼형 파일 기반 실행 저장소
+    
+    실행 하나를 저장할 때 요약/가설/재무 행을 한 트랜잭션에서 일괄 삽입하고,
+    페르소나/인터뷰 테이블은 arrays/<simulation_id>.npz로 씁니다.
+    """
+    
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(os.path.join(directory, "arrays"), exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(directory, "runs.sqlite"))
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, STORE_VERSION):
+            raise ValueError(f"지원하지 않는 저장소 버전입니다: {version}")
+        with self._db:
+            self._db.executescript(SCHEMA)
+            self._db.execute(f"PRAGMA user_version={STORE_VERSION}")
+    
+    def close(self) -> None:
+        self._db.close()
+    
+    def __enter__(self) -> "RunStore":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+    
+    def array_path(self, simulation_id: str) -> str:
+        return os.path.join(self.directory, "arrays", f"{simulation_id}.npz")
+    
+    # ---- 저장 ----
+    
+    def run(self, bmc_data: Dict, seed: int = None, persona_count: int = 20, questions: List[str] = None,
+            chunk_size: int = 10000, population: Any = None, bootstrap: int = 0) -> str:
+        """시뮬레이션을 실행하고 결과를 바로 저장 (레코드 dict를 만들지 않고 엔진 테이블을 그대로 씀)"""
+        
+        interview_questions = list(questions or bmc_interview_questions(bmc_data))
+        validation_results = []
+        stages = SimulationAPI.run_stages(bmc_data, seed, persona_count, interview_questions, chunk_size,
+                                          population=population, bootstrap=bootstrap)
+        for stage, data in stages:
+            if stage == "hypothesis":
+                validation_results.append(data[1])
+            elif stage == "financial":
+                financial_results = data
+            elif stage == "completed":
+                engine = data
+        
+        simulation_id = new_simulation_id()
+        try:
+            with self._db:
+                self._insert(
+                    simulation_id=simulation_id,
+                    timestamp=datetime.now().isoformat(),
+                    bmc_data=bmc_data,
+                    seed=seed,
+                    personas=engine.personas,
+                    interviews=engine.interview_results,
+                    validation_results=[hypothesis_to_dict(r) for r in validation_results],
+                    financial_projection=financial_results,
+                    market_analysis=engine.market_data,
+                    summary=build_summary(len(engine.personas), len(interview_questions), validation_results, financial_results)
+                )
+        except Exception:
+            # 롤백된 실행의 파일도 지웁니다
+            self._remove_arrays([simulation_id])
+            raise
+        return simulation_id
+    
+    def add(self, result: Dict[str, Any], bmc_data: Dict, seed: int = None) -> str:
+        """create_simulation 결과 저장 (저장한 simulation_id 반환)"""
+        return self.add_many([(result, bmc_data, seed)])[0]
+    
+    def add_many(self, runs: Iterable[Tuple[Dict[str, Any], Dict, Optional[int]]]) -> List[str]:
+        """(결과, BMC, seed) 여러 개를 한 트랜잭션으로 저장
+        
+        이미 저장된 simulation_id가 있거나 new_simulation_id 형식이 아니면 ValueError를 발생시키고
+        아무것도 저장하지 않습니다 (ID가 배열 파일 경로에 쓰이므로 형식을 먼저 확인합니다).
+        """
+        
+        simulation_ids = []
+        written = []
+        try:
+            with self._db:
+                for result, bmc_data, seed in runs:
+                    simulation_id = result.get("simulation_id") or new_simulation_id()
+                    if not isinstance(simulation_id, str) or not SIMULATION_ID_PATTERN.fullmatch(simulation_id):
+                        raise ValueError(f"simulation_id 형식이 올바르지 않습니다: {simulation_id!r}")
+                    if self.get(simulation_id) is not None or simulation_id in simulation_ids:
+                        raise ValueError(f"이미 저장된 실행입니다: {simulation_id}")
+                    personas, interviews = tables_from_records(result["personas"], result["interview_results"])
+                    written.append(simulation_id)
+                    self._insert(
+                        simulation_id=simulation_id,
+                        timestamp=result.get("timestamp") or datetime.now().isoformat(),
+                        bmc_data=bmc_data,
+                        seed=seed,
+                        personas=personas,
+                        interviews=interviews,
+                        validation_results=result["validation_results"],
+                        financial_projection=result["financial_projection"],
+                        market_analysis=result.get("market_analysis"),
+                        summary=result["summary"]
+                    )
+                    simulation_ids.append(simulation_id)
+        except Exception:
+            # 롤백된 실행의 파일도 지웁니다
+            self._remove_arrays(written)
+            raise
+        return simulation_ids
+    
+    def _remove_arrays(self, simulation_ids: Iterable[str]) -> None:
+        for simulation_id in simulation_ids:
+            if os.path.exists(self.array_path(simulation_id)):
+                os.remove(self.array_path(simulation_id))
+    
+    def _insert(self, simulation_id: str, timestamp: str, bmc_data: Dict, seed: Optional[int],
+                personas: PersonaTable, interviews: InterviewTable,
+                validation_results: List[Dict[str, Any]], financial_projection: Dict[str, Any],
+                market_analysis: Optional[Dict], summary: Dict[str, Any]) -> None:
+        """실행 하나의 행 삽입과 컬럼형 파일 기록 (트랜잭션과 실패 시 파일 정리는 호출하는 쪽에서 관리)
+        
+        question_count는 저장 경로와 관계없이 인터뷰 응답에 실제로 나온 서로 다른 질문 수입니다.
+        """
+        
+        write_tables_columnar(self.array_path(simulation_id), personas, interviews, {
+            "simulation_id": simulation_id,
+            "timestamp": timestamp,
+            "validation_results": validation_results,
+            "financial_projection": financial_projection,
+            "market_analysis": market_analysis,
+            "summary": summary,
+        })
+        
+        question_count = len(np.unique(interviews.columns["question"]))
+        total = len(validation_results)
+        metrics = financial_projection["metrics"]
+        metric_values = {
+            "persona_count": len(personas),
+            "total_hypotheses": total,
+            "validated_hypotheses": summary["validated_hypotheses"],
+            "invalidated_hypotheses": summary["invalidated_hypotheses"],
+            "validation_rate": summary["validated_hypotheses"] / total if total else None,
+            "break_even_month": summary["break_even_month"],
+            "projected_roi": summary["projected_roi"],
+            "total_revenue": metrics.get("total_revenue"),
+            "total_users": metrics.get("total_users"),
+        }
+        self._db.execute(
+            f"INSERT INTO runs (simulation_id, created_at, bmc_hash, seed, question_count, {', '.join(METRIC_COLUMNS)},"
+            f" bmc) VALUES ({', '.join('?' * (6 + len(METRIC_COLUMNS)))})",
+            (simulation_id, timestamp, bmc_hash(bmc_data), seed, question_count,
+             *(metric_values[name] for name in METRIC_COLUMNS),
+             json.dumps(bmc_data, ensure_ascii=False, default=str))
+        )
+        self._db.executemany(
+            "INSERT INTO hypotheses VALUES (?, ?, ?, ?, ?, ?)",
+            [(simulation_id, position, r["hypothesis"], r["validation_status"], r["confidence_score"],
+              json.dumps(r, ensure_ascii=False))
+             for position, r in enumerate(validation_results)]
+        )
+        series = [financial_projection[name] for name in FINANCIAL_SERIES]
+        self._db.executemany(
+            f"INSERT INTO financial VALUES (?, ?, {', '.join('?' * len(FINANCIAL_SERIES))})",
+            [(simulation_id, month, *values) for month, values in enumerate(zip(*series), start=1)]
+        )
+    
+    def delete(self, simulation_id: str) -> bool:
+        """실행 삭제 (있었으면 True)"""
+        
+        with self._db:
+            deleted = self._db.execute("DELETE FROM runs WHERE simulation_id = ?", (simulation_id,)).rowcount
+        if os.path.exists(self.array_path(simulation_id)):
+            os.remove(self.array_path(simulation_id))
+        return bool(deleted)
+    
+    # ---- 조회 ----
+    
+    def get(self, simulation_id: str) -> Optional[Dict[str, Any]]:
+        """실행 요약 행 (없으면 None)"""
+        row = self._db.execute("SELECT * FROM runs WHERE simulation_id = ?", (simulation_id,)).fetchone()
+        return self._run_records([row])[0] if row is not None else None
+    
+    def load(self, simulation_id: str) -> Dict[str, Any]:
+        """저장된 실행 전체 (PersonaTable/InterviewTable과 메타데이터, read_simulation_columnar 형식)"""
+        if self.get(simulation_id) is None:
+            raise KeyError(simulation_id)
+        return read_simulation_columnar(self.array_path(simulation_id))
+    
+    def find(self, bmc_data: Dict = None, bmc_hash_value: str = None, hypothesis: str = None, status: str = None,
+             order_by: str = "created_at", descending: bool = False, limit: int = None,
+             **ranges: Tuple[Optional[float], Optional[float]]) -> List[Dict[str, Any]]:
+        """조건에 맞는 실행 요약 행 목록
+        
+        hypothesis/status: 해당 가설이 해당 상태로 검증된 실행만 (status만 주면 그런 가설이 하나라도 있는 실행)
+        ranges: 지표 이름 -> (하한, 상한), None은 열린 구간 (예: break_even_month=(None, 6))
+        반환 행의 "bmc" dict는 같은 BMC의 행끼리 공유됩니다.
+        """
+        
+        unknown = set(ranges) - set(METRIC_COLUMNS)
+        if unknown:
+            raise ValueError(f"알 수 없는 지표입니다: {', '.join(sorted(unknown))}")
+        if order_by not in METRIC_COLUMNS + ("created_at",):
+            raise ValueError(f"정렬할 수 없는 열입니다: {order_by}")
+        
+        clauses, params = [], []
+        if bmc_data is not None:
+            bmc_hash_value = bmc_hash(bmc_data)
+        if bmc_hash_value is not None:
+            clauses.append("bmc_hash = ?")
+            params.append(bmc_hash_value)
+        for name, (low, high) in ranges.items():
+            if low is not None:
+                clauses.append(f"{name} >= ?")
+                params.append(low)
+            if high is not None:
+                clauses.append(f"{name} <= ?")
+                params.append(high)
+        if hypothesis is not None or status is not None:
+            conditions = [c for c, v in (("h.hypothesis = ?", hypothesis), ("h.status = ?", status)) if v is not None]
+            clauses.append(f"simulation_id IN (SELECT h.simulation_id FROM hypotheses h WHERE {' AND '.join(conditions)})")
+            params.extend(v for v in (hypothesis, status) if v is not None)
+        
+        query = "SELECT * FROM runs"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}, rowid"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return self._run_records(self._db.execute(query, params))
+    
+    def metric_trend(self, bmc_data: Dict, metric: str = "break_even_month") -> List[Tuple[str, Any]]:
+        """같은 BMC 실행들의 (생성 시각, 지표 값)을 시간 순으로"""
+        
+        if metric not in METRIC_COLUMNS:
+            raise ValueError(f"알 수 없는 지표입니다: {metric}")
+        rows = self._db.execute(
+            f"SELECT created_at, {metric} FROM runs WHERE bmc_hash = ? ORDER BY created_at, rowid",
+            (bmc_hash(bmc_data),)
+        )
+        return [tuple(row) for row in rows]
+    
+    def hypothesis_history(self, hypothesis: str) -> List[Dict[str, Any]]:
+        """가설 문장이 같은 모든 실행의 검증 결과 (시간 순)"""
+        
+        rows = self._db.execute(
+            "SELECT r.simulation_id, r.created_at, r.bmc_hash, h.status, h.confidence_score"
+            " FROM hypotheses h JOIN runs r ON r.simulation_id = h.simulation_id"
+            " WHERE h.hypothesis = ? ORDER BY r.created_at, r.rowid",
+            (hypothesis,)
+        )
+        return [dict(row) for row in rows]
+    
+    def financial_series(self, simulation_ids: List[str], field: str = "profit") -> np.ndarray:
+        """실행별 월별 재무 시계열 (실행 수 x 최대 개월 수, 기간이 짧은 실행은 NaN으로 채움)"""
+        
+        if field not in FINANCIAL_SERIES:
+            raise ValueError(f"알 수 없는 재무 항목입니다: {field}")
+        position = {simulation_id: i for i, simulation_id in enumerate(simulation_ids)}
+        rows = []
+        # SQLite 바인딩 변수 수 제한을 넘지 않도록 나누어 조회합니다
+        for start in range(0, len(simulation_ids), 500):
+            batch = simulation_ids[start:start + 500]
+            rows.extend(self._db.execute(
+                f"SELECT simulation_id, month, {field} FROM financial"
+                f" WHERE simulation_id IN ({', '.join('?' * len(batch))})",
+                batch
+            ).fetchall())
+        months = max((row[1] for row in rows), default=0)
+        series = np.full((len(simulation_ids), months), np.nan)
+        for simulation_id, month, value in rows:
+            series[position[simulation_id], month - 1] = value
+        return series
+    
+    def _run_records(self, rows: Iterable[sqlite3.Row]) -> List[Dict[str, Any]]:
+        # 같은 BMC의 실행이 많으므로 BMC JSON은 해시별로 한 번만 해석합니다
+        bmcs: Dict[str, Dict] = {}
+        records = []
+        for row in rows:
+            record = dict(row)
+            if record["bmc_hash"] not in bmcs:
+                bmcs[record["bmc_hash"]] = json.loads(record["bmc"])
+            record["bmc"] = bmcs[record["bmc_hash"]]
+            records.append(record)
+        return records
+
+if __name__ == "__main__":
+    # 테스트 실행: 가격을 바꿔 가며 저장하고 실행 간 질의
+    import tempfile
+    import time
+    
+    hypothesis = "월 구독료 9,900원은 적정 가격이다"
+    with tempfile.TemporaryDirectory() as directory, RunStore(directory) as store:
+        started = time.perf_counter()
+        for price in (4900, 9900, 14900, 19900):
+            for seed in range(50):
+                store.run({"price": price, "hypotheses": [hypothesis]}, seed=seed, persona_count=200)
+        print(f"{len(store)}개 실행 저장: {time.perf_counter() - started:.2f}초")
+        
+        started = time.perf_counter()
+        validated = store.find(hypothesis=hypothesis, status="validated")
+        trend = store.metric_trend({"price": 9900, "hypotheses": [hypothesis]})
+        best = store.find(validation_rate=(0.5, None), order_by="projected_roi", descending=True, limit=5)
+        print(f"질의 3건: {(time.perf_counter() - started) * 1000:.1f}ms")
+        print(f"'{hypothesis}' 검증된 실행: {len(validated)}개")
+        print(f"9,900원 손익분기 추이: {[month for _, month in trend][:10]}")
+        print(f"검증률 50% 이상 중 ROI 상위: {[(r['bmc']['price'], round(r['projected_roi'], 1)) for r in best]}")
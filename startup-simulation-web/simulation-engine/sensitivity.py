@@ -0,0 +1,172 @@
+"""
+재무 모델 파라미터 스윕 / 민감도 분석
+run_financial_simulation의 파라미터(FINANCIAL_DEFAULTS)를 여러 값으로 바꿔 가며
+손익분기 월, ROI 등이 어떻게 변하는지 계산합니다.
+
+- sweep_grid: 2개 이상의 파라미터 데카르트 곱 그리드 (히트맵)
+- sensitivity: 파라미터를 하나씩만 바꾼 1차원 곡선 (기준 가정 고정)
+- tornado: 파라미터별 하한/상한에서의 지표 차이를 크기 순으로 (토네이도 차트)
+
+모든 조합을 project_financials 한 번의 브로드캐스트 계산으로 평가하므로, 사용자 파라미터
+(초기 사용자/성장률/이탈률)를 바꾸지 않는 축에서는 사용자 추이를 다시 계산하지 않습니다.
+결과는 월별 추이 없이 조합별 지표 배열만 돌려줍니다.
+"""
+
+from dataclasses import dataclass
+from typing import List, Dict, Any, Iterable, Optional
+
+import numpy as np
+
+from simulation_engine import FINANCIAL_DEFAULTS, RATE_PARAMETERS, project_financials
+
+# 계산할 수 있는 지표 (break_even_month의 0은 기간 내 미도달)
+SWEEP_METRICS = ("break_even_month", "roi", "total_revenue", "total_costs", "final_users")
+
+@dataclass
+class SweepResult:
+    """파라미터 스윕 결과"""
+    parameters: List[str]  # 축 순서
+    values: Dict[str, np.ndarray]  # 파라미터 -> 축 값
+    metrics: Dict[str, np.ndarray]  # 지표 -> (축 길이...) 배열
+    months: int
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON 호환 dict로 변환"""
+        return {
+            "parameters": list(self.parameters),
+            "values": {name: values.tolist() for name, values in self.values.items()},
+            "metrics": {name: values.tolist() for name, values in self.metrics.items()},
+            "months": self.months,
+        }
+
+@dataclass
+class SensitivityResult:
+    """파라미터를 하나씩 바꾼 민감도 분석 결과"""
+    baseline: Dict[str, float]  # 기준 가정에서의 지표
+    curves: Dict[str, SweepResult]  # 파라미터 -> 1차원 스윕
+    
+    def tornado(self, metric: str = "roi") -> List[Dict[str, Any]]:
+        """파라미터별 (첫 값, 마지막 값)에서의 지표를 변동 폭이 큰 순서로"""
+        
+        rows = []
+        for name, curve in self.curves.items():
+            values = curve.metrics[metric]
+            rows.append({
+                "parameter": name,
+                "low": float(curve.values[name][0]),
+                "high": float(curve.values[name][-1]),
+                "metric_low": values[0].item(),
+                "metric_high": values[-1].item(),
+                "swing": float(values.max() - values.min()),
+            })
+        rows.sort(key=lambda row: row["swing"], reverse=True)
+        return rows
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "baseline": dict(self.baseline),
+            "curves": {name: curve.to_dict() for name, curve in self.curves.items()},
+        }
+
+def _base_parameters(assumptions: Optional[Dict[str, float]], swept: Iterable[str]) -> Dict[str, Any]:
+    """기준 가정 (FINANCIAL_DEFAULTS + assumptions), 알 수 없는 파라미터는 ValueError"""
+    
+    unknown = (set(assumptions or {}) | set(swept)) - set(FINANCIAL_DEFAULTS)
+    if unknown:
+        raise ValueError(f"알 수 없는 재무 파라미터입니다: {', '.join(sorted(unknown))}")
+    params = dict(FINANCIAL_DEFAULTS)
+    params.update(assumptions or {})
+    return params
+
+def _sweep_metrics(projection: Dict[str, np.ndarray], metrics: Iterable[str]) -> Dict[str, np.ndarray]:
+    unknown = set(metrics) - set(SWEEP_METRICS)
+    if unknown:
+        raise ValueError(f"알 수 없는 지표입니다: {', '.join(sorted(unknown))}")
+    
+    values = {}
+    for name in metrics:
+        if name == "break_even_month":
+            values[name] = projection["break_even_month"].astype(np.int16)
+        elif name == "final_users":
+            values[name] = np.ascontiguousarray(projection["users"][..., -1])
+        else:
+            values[name] = np.ascontiguousarray(projection[name])
+    return values
+
+def sweep_grid(axes: Dict[str, Any], months: int = 12, assumptions: Dict[str, float] = None,
+               metrics: Iterable[str] = SWEEP_METRICS) -> SweepResult:
+    """파라미터 데카르트 곱 그리드의 지표 계산
+    
+    axes는 {파라미터: 값 목록}이며, 결과 지표 배열의 축은 axes 순서를 따릅니다.
+    나머지 파라미터는 assumptions, 그 외에는 FINANCIAL_DEFAULTS 값을 씁니다.
+    
+    예: sweep_grid({"churn_rate": np.linspace(0.01, 0.2, 200), "arpu": np.linspace(5000, 20000, 200)}, months=36)
+    """
+    
+    params = _base_parameters(assumptions, axes)
+    values = {}
+    for i, (name, axis_values) in enumerate(axes.items()):
+        values[name] = np.asarray(axis_values, dtype=np.float64).ravel()
+        # 파라미터마다 자기 축에만 길이를 두어 project_financials에서 그리드로 브로드캐스트되게 합니다
+        shape = [1] * len(axes)
+        shape[i] = len(values[name])
+        params[name] = values[name].reshape(shape)
+    
+    projection = project_financials(params, months)
+    return SweepResult(
+        parameters=list(axes),
+        values=values,
+        metrics=_sweep_metrics(projection, metrics),
+        months=months
+    )
+
+def sensitivity(ranges: Dict[str, Any], months: int = 12, assumptions: Dict[str, float] = None,
+                metrics: Iterable[str] = SWEEP_METRICS) -> SensitivityResult:
+    """파라미터를 하나씩만 바꾼 민감도 곡선 (한 번의 배치 계산)
+    
+    ranges는 {파라미터: 값 목록}이며, 각 곡선에서 다른 파라미터는 기준 가정에 고정됩니다.
+    기준 가정과 모든 곡선의 점을 하나의 배치로 이어 붙여 project_financials를 한 번만 호출합니다.
+    """
+    
+    metrics = tuple(metrics)
+    params = _base_parameters(assumptions, ranges)
+    values = {name: np.asarray(v, dtype=np.float64).ravel() for name, v in ranges.items()}
+    
+    # 배치 0번은 기준 가정, 이후 파라미터별 구간
+    offsets = np.cumsum([1] + [len(v) for v in values.values()])
+    batch = {name: np.full(offsets[-1], float(value)) for name, value in params.items()}
+    for (name, v), start in zip(values.items(), offsets[:-1]):
+        batch[name][start:start + len(v)] = v
+    
+    computed = _sweep_metrics(project_financials(batch, months), metrics)
+    curves = {}
+    for (name, v), start in zip(values.items(), offsets[:-1]):
+        curves[name] = SweepResult(
+            parameters=[name],
+            values={name: v},
+            metrics={metric: computed[metric][start:start + len(v)] for metric in metrics},
+            months=months
+        )
+    return SensitivityResult(
+        baseline={metric: computed[metric][0].item() for metric in metrics},
+        curves=curves
+    )
+
+def tornado(parameters: Iterable[str] = None, relative: float = 0.2, metric: str = "roi", months: int = 12,
+            assumptions: Dict[str, float] = None, steps: int = 2) -> List[Dict[str, Any]]:
+    """기준 가정의 ±relative 범위에서 파라미터별 지표 변동 폭 (토네이도 차트용, 큰 순서)
+    
+    비율 파라미터는 0-1로 제한하며, steps를 늘리면 구간 안의 비단조 변화도 변동 폭에 반영됩니다.
+    """
+    
+    parameters = list(parameters or FINANCIAL_DEFAULTS)
+    params = _base_parameters(assumptions, parameters)
+    ranges = {}
+    for name in parameters:
+        low, high = params[name] * (1 - relative), params[name] * (1 + relative)
+        if name in RATE_PARAMETERS:
+            low, high = max(low, 0.0), min(high, 1.0)
+        ranges[name] = np.linspace(low, high, max(steps, 2))
+        if name == "initial_users":
+            ranges[name] = np.round(ranges[name])
+    return sensitivity(ranges, months, assumptions, metrics=(metric,)).tornado(metric)
@@ -0,0 +1,267 @@
+"""
+시뮬레이션 결과 직렬화
+엔진의 컬럼형 테이블에서 중간 dict 트리를 만들지 않고 바로 JSON을 쓰거나,
+대규모 패널용 컬럼형 바이너리(.npz) 파일로 저장합니다.
+"""
+
+import json
+from datetime import datetime
+from typing import List, Dict, Any, IO, Iterator, Tuple
+
+import numpy as np
+
+from instrumentation import Instrumentation, stage_context
+from simulation_engine import (
+    SimulationAPI, SimulationEngine, PersonaTable, InterviewTable, HypothesisResult, StringPool,
+    SEGMENTS, SENTIMENTS, GENDERS, LAST_NAMES,
+    FIRST_NAMES_MALE, FIRST_NAMES_FEMALE, OCCUPATIONS, INCOME_RANGES,
+    PAIN_POINT_CATALOG, NEED_CATALOG, build_summary, bmc_interview_questions, decode_catalog_mask, hypothesis_to_dict,
+    new_simulation_id, persona_to_dict
+)
+
+# 한 번에 문자열로 만들어 쓰는 행 수
+WRITE_BLOCK_SIZE = 4096
+
+COLUMNAR_FORMAT_VERSION = 1
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+def _persona_rows_json(personas: PersonaTable, start: int, stop: int,
+                       mask_cache: Dict[Tuple[str, int], str]) -> List[str]:
+    """페르소나 행들을 JSON 객체 문자열로 변환 (범주형 값은 미리 인코딩한 조각을 재사용)"""
+    
+    first_names = (FIRST_NAMES_MALE, FIRST_NAMES_FEMALE)
+    names = [[[_dumps(last + first) for last in LAST_NAMES] for first in pool] for pool in first_names]
+    genders = [_dumps(g) for g in GENDERS]
+    occupations = [_dumps(o) for o in OCCUPATIONS]
+    incomes = [_dumps(i) for i in INCOME_RANGES]
+    segments = [_dumps(segment.value) for segment in SEGMENTS]
+    
+    def mask_json(kind: str, mask: int, catalog: List[str]) -> str:
+        key = (kind, mask)
+        if key not in mask_cache:
+            mask_cache[key] = _dumps(decode_catalog_mask(mask, catalog))
+        return mask_cache[key]
+    
+    c = {key: values[start:stop].tolist() for key, values in personas.columns.items()}
+    return [
+        f'{{"id":"persona_{c["index"][i] + 1}",'
+        f'"name":{names[c["gender"][i]][c["first_name"][i]][c["last_name"][i]]},'
+        f'"age":{c["age"][i]},'
+        f'"gender":{genders[c["gender"][i]]},'
+        f'"occupation":{occupations[c["occupation"][i]]},'
+        f'"income_range":{incomes[c["income_range"][i]]},'
+        f'"segment":{segments[c["segment"][i]]},'
+        f'"pain_points":{mask_json("pain_points", c["pain_points"][i], PAIN_POINT_CATALOG)},'
+        f'"needs":{mask_json("needs", c["needs"][i], NEED_CATALOG)},'
+        f'"tech_savviness":{c["tech_savviness"][i]},'
+        f'"price_sensitivity":{c["price_sensitivity"][i]},'
+        f'"brand_loyalty":{c["brand_loyalty"][i]},'
+        f'"social_influence":{c["social_influence"][i]}}}'
+        for i in range(len(c["index"]))
+    ]
+
+def write_personas_json(fp: IO[str], personas: PersonaTable) -> None:
+    """페르소나 테이블을 JSON 배열로 기록"""
+    
+    mask_cache: Dict[Tuple[str, int], str] = {}
+    fp.write("[")
+    for start in range(0, len(personas), WRITE_BLOCK_SIZE):
+        if start:
+            fp.write(",")
+        fp.write(",".join(_persona_rows_json(personas, start, start + WRITE_BLOCK_SIZE, mask_cache)))
+    fp.write("]")
+
+def _interview_groups_json(interviews: InterviewTable) -> Iterator[List[Tuple[int, str]]]:
+    """페르소나별 응답 JSON 배열 문자열을 WRITE_BLOCK_SIZE명씩 [(페르소나 키, "[...]"), ...]로 생성"""
+    
+    keys, order, offsets = interviews.grouping()
+    columns = interviews.columns
+    questions = [_dumps(q) for q in interviews.questions.values]
+    answers = [_dumps(a) for a in interviews.answers.values]
+    keyword_sets = [_dumps(list(k)) for k in interviews.keyword_sets.values]
+    sentiments = [_dumps(s.value) for s in SENTIMENTS]
+    
+    # (질문, 답변, 감정, 신뢰도, 키워드) 조합은 몇 가지뿐이므로 응답 JSON을 조합 단위로 캐시합니다
+    row_cache: Dict[Tuple, str] = {}
+    
+    def row_json(row: Tuple) -> str:
+        text = row_cache.get(row)
+        if text is None:
+            q, a, s, c, k = row
+            text = (f'{{"question":{questions[q]},"answer":{answers[a]},"sentiment":{sentiments[s]},'
+                    f'"confidence":{_dumps(c)},"keywords":{keyword_sets[k]}}}')
+            row_cache[row] = text
+        return text
+    
+    bounds = offsets.tolist()
+    key_list = keys.tolist()
+    for block_start in range(0, len(key_list), WRITE_BLOCK_SIZE):
+        block_stop = min(block_start + WRITE_BLOCK_SIZE, len(key_list))
+        rows = order[bounds[block_start]:bounds[block_stop]]
+        packed = list(zip(
+            columns["question"][rows].tolist(),
+            columns["answer"][rows].tolist(),
+            columns["sentiment"][rows].tolist(),
+            columns["confidence"][rows].tolist(),
+            columns["keywords"][rows].tolist()
+        ))
+        base = bounds[block_start]
+        yield [
+            (key_list[g], "[" + ",".join(row_json(row) for row in packed[bounds[g] - base:bounds[g + 1] - base]) + "]")
+            for g in range(block_start, block_stop)
+        ]
+
+def write_interviews_json(fp: IO[str], interviews: InterviewTable) -> None:
+    """인터뷰 테이블을 {persona_id: [응답...]} JSON 객체로 기록"""
+    
+    def key_json(key: int) -> str:
+        if key >= 0:
+            return f'"persona_{key + 1}"'
+        # persona_<N> 형식이 아닌 ID (json.dumps처럼 문자열 키로 씁니다)
+        pid = interviews.persona_id_of(key)
+        return _dumps(pid if isinstance(pid, str) else str(pid))
+    
+    fp.write("{")
+    for block_idx, block in enumerate(_interview_groups_json(interviews)):
+        if block_idx:
+            fp.write(",")
+        fp.write(",".join(f'{key_json(key)}:{responses}' for key, responses in block))
+    fp.write("}")
+
+def write_simulation_json(fp: IO[str], engine: SimulationEngine, validation_results: List[HypothesisResult],
+                          financial_projection: Dict[str, Any], meta: Dict[str, Any]) -> None:
+    """시뮬레이션 결과를 create_simulation과 같은 구조의 압축 JSON으로 기록
+    
+    meta에는 simulation_id, timestamp, summary 등이 들어가며 personas/interview_results는
+    엔진 테이블에서 직접 씁니다. Enum은 값 문자열로 기록됩니다.
+    리스트 엔진의 페르소나는 ID나 값이 카탈로그 밖일 수 있으므로 객체에서 그대로 씁니다.
+    """
+    
+    personas = engine.personas
+    interviews = engine.interview_results
+    if not isinstance(interviews, InterviewTable):
+        interviews = InterviewTable.from_responses(interviews)
+    
+    fp.write('{"simulation_id":' + _dumps(meta.get("simulation_id")))
+    fp.write(',"timestamp":' + _dumps(meta.get("timestamp")))
+    fp.write(',"personas":')
+    if isinstance(personas, PersonaTable):
+        write_personas_json(fp, personas)
+    else:
+        fp.write(_dumps([persona_to_dict(p) for p in personas]))
+    fp.write(',"interview_results":')
+    write_interviews_json(fp, interviews)
+    fp.write(',"validation_results":' + _dumps([hypothesis_to_dict(r) for r in validation_results]))
+    fp.write(',"financial_projection":' + _dumps(financial_projection))
+    fp.write(',"market_analysis":' + _dumps(engine.market_data))
+    fp.write(',"summary":' + _dumps(meta.get("summary")))
+    fp.write("}")
+
+def _pool_array(pool: StringPool) -> np.ndarray:
+    return np.array(_dumps([list(v) if isinstance(v, tuple) else v for v in pool.values]))
+
+def write_simulation_columnar(path: str, engine: SimulationEngine, validation_results: List[HypothesisResult],
+                              financial_projection: Dict[str, Any], meta: Dict[str, Any]) -> None:
+    """시뮬레이션 결과를 컬럼형 바이너리(.npz)로 저장
+    
+    페르소나/인터뷰 컬럼은 원래 dtype 그대로, 인터닝 풀과 나머지 결과는 JSON 문자열로 담습니다.
+    pickle을 사용하지 않으므로 numpy만으로 안전하게 읽을 수 있습니다.
+    PersonaTable로 표현할 수 없는 페르소나(카탈로그 밖의 값)는 ValueError를 냅니다 (JSON 형식은 가능).
+    """
+    
+    personas = engine.personas if isinstance(engine.personas, PersonaTable) else PersonaTable.from_personas(engine.personas)
+    interviews = engine.interview_results
+    if not isinstance(interviews, InterviewTable):
+        interviews = InterviewTable.from_responses(interviews)
+    
+    write_tables_columnar(path, personas, interviews, {
+        "simulation_id": meta.get("simulation_id"),
+        "timestamp": meta.get("timestamp"),
+        "validation_results": [hypothesis_to_dict(r) for r in validation_results],
+        "financial_projection": financial_projection,
+        "market_analysis": engine.market_data,
+        "summary": meta.get("summary"),
+    })
+
+def write_tables_columnar(path: str, personas: PersonaTable, interviews: InterviewTable, meta: Dict[str, Any]) -> None:
+    """페르소나/인터뷰 테이블과 JSON 호환 메타데이터를 컬럼형 바이너리(.npz)로 저장 (read_simulation_columnar로 읽음)"""
+    
+    arrays = {f"personas/{name}": values for name, values in personas.columns.items()}
+    arrays.update({f"interviews/{name}": values for name, values in interviews.columns.items()})
+    arrays["pools/questions"] = _pool_array(interviews.questions)
+    arrays["pools/answers"] = _pool_array(interviews.answers)
+    arrays["pools/keyword_sets"] = _pool_array(interviews.keyword_sets)
+    arrays["pools/persona_ids"] = _pool_array(interviews.persona_ids)
+    arrays["meta"] = np.array(_dumps({"format_version": COLUMNAR_FORMAT_VERSION, **meta}))
+    
+    with open(path, "wb") as f:
+        np.savez_compressed(f, **arrays)
+
+def read_simulation_columnar(path: str) -> Dict[str, Any]:
+    """컬럼형 바이너리 파일을 읽어 PersonaTable/InterviewTable과 메타데이터 반환"""
+    
+    with np.load(path, allow_pickle=False) as data:
+        meta = json.loads(str(data["meta"]))
+        personas = PersonaTable({
+            name.split("/", 1)[1]: data[name] for name in data.files if name.startswith("personas/")
+        })
+        interviews = InterviewTable()
+        for pool_name in ("questions", "answers", "keyword_sets", "persona_ids"):
+            if f"pools/{pool_name}" not in data.files:
+                continue
+            pool = getattr(interviews, pool_name)
+            for value in json.loads(str(data[f"pools/{pool_name}"])):
+                pool.intern(tuple(value) if isinstance(value, list) else value)
+        columns = {name.split("/", 1)[1]: data[name] for name in data.files if name.startswith("interviews/")}
+        interviews.append_rows(
+            columns["persona"], columns["question"], columns["answer"],
+            columns["sentiment"], columns["confidence"], columns["keywords"]
+        )
+    
+    meta["personas"] = personas
+    meta["interview_results"] = interviews
+    return meta
+
+def run_simulation_to_file(path: str, bmc_data: Dict, seed: int = None, persona_count: int = 20,
+                           questions: List[str] = None, fmt: str = "json", chunk_size: int = 10000,
+                           instrumentation: Instrumentation = None, population: Any = None,
+                           bootstrap: int = 0) -> Dict[str, Any]:
+    """시뮬레이션을 실행하고 결과를 파일로 바로 기록 (요약 반환)
+    
+    fmt: "json" (create_simulation과 같은 구조) 또는 "columnar" (.npz)
+    같은 seed/chunk_size면 create_simulation과 같은 내용을 씁니다.
+    instrumentation을 주면 파일 기록도 "serialization" 단계로 측정합니다.
+    """
+    
+    # 시뮬레이션을 다 돌린 뒤에 실패하지 않도록 형식은 먼저 확인합니다
+    if fmt not in ("json", "columnar"):
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+    
+    interview_questions = list(questions or bmc_interview_questions(bmc_data))
+    validation_results = []
+    stages = SimulationAPI.run_stages(bmc_data, seed, persona_count, interview_questions, chunk_size,
+                                      instrumentation, population, bootstrap)
+    for stage, data in stages:
+        if stage == "hypothesis":
+            validation_results.append(data[1])
+        elif stage == "financial":
+            financial_results = data
+        elif stage == "completed":
+            engine = data
+    
+    meta = {
+        "simulation_id": new_simulation_id(),
+        "timestamp": datetime.now().isoformat(),
+        "summary": build_summary(len(engine.personas), len(interview_questions), validation_results, financial_results)
+    }
+    
+    with stage_context(instrumentation, "serialization", len(engine.personas)):
+        if fmt == "json":
+            with open(path, "w", encoding="utf-8") as f:
+                write_simulation_json(f, engine, validation_results, financial_results, meta)
+        else:
+            write_simulation_columnar(path, engine, validation_results, financial_results, meta)
+    
+    return meta["summary"]
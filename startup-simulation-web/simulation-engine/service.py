@@ -0,0 +1,322 @@
+"""
+비동기 시뮬레이션 서비스
+SimulationAPI를 asyncio에서 이벤트 루프를 막지 않고 호출하기 위한 서비스 계층입니다.
+
+- CPU 작업은 크기가 정해진 스레드/프로세스 풀에서 실행합니다.
+- 실행 중이거나 대기 중인 계산 수가 max_queue_depth에 도달하면 새 요청을 ServiceOverloaded로 거절합니다.
+- 같은 BMC/seed/설정의 동시 요청은 하나의 계산과 결과 객체를 공유합니다 (seed가 없으면 결과가 매번 다르므로 공유하지 않음).
+  공유된 결과는 읽기 전용으로 다뤄야 합니다.
+- create_app()은 FastAPI 앱을 만들며 (fastapi 설치 필요), load_test()로 지연 시간 분포를 측정합니다.
+
+사용 예:
+    service = SimulationService(max_workers=4, max_queue_depth=32)
+    result = await service.create_simulation(bmc, seed=42)
+"""
+
+import asyncio
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Dict, Any, AsyncIterator, Awaitable, Callable, Optional, Set
+
+import numpy as np
+
+from result_cache import SimulationCache
+from simulation_engine import SimulationAPI, bmc_interview_questions
+
+try:
+    from fastapi import FastAPI, HTTPException
+except ImportError:  # fastapi가 없어도 서비스와 부하 테스트는 사용할 수 있습니다
+    FastAPI = None
+
+class ServiceOverloaded(Exception):
+    """대기 중인 계산이 max_queue_depth에 도달하여 요청을 받을 수 없음"""
+    
+    def __init__(self, depth: int, limit: int):
+        super().__init__(f"시뮬레이션 대기열이 가득 찼습니다 ({depth}/{limit})")
+        self.depth = depth
+        self.limit = limit
+
+@dataclass
+class ServiceStats:
+    """서비스 누적 통계"""
+    submitted: int = 0  # 받아들인 요청 수 (공유된 요청 포함)
+    computed: int = 0  # 실제로 시작한 계산 수
+    coalesced: int = 0  # 진행 중인 계산을 공유한 요청 수
+    rejected: int = 0  # 대기열이 가득 차 거절한 요청 수
+    failed: int = 0  # 실패한 계산 수
+    in_flight: int = 0  # 현재 실행 중이거나 대기 중인 계산 수
+
+def _run_simulation(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """워커에서 시뮬레이션 실행
+    
+    프로세스 풀이면 결과는 실행 풀의 결과 수신 스레드에서 한 번만 역직렬화되므로 이벤트 루프를 막지 않습니다.
+    """
+    return SimulationAPI.create_simulation(**kwargs)
+
+class SimulationService:
+    """asyncio 기반 시뮬레이션 서비스
+    
+    processes=True이면 프로세스 풀을 써서 GIL과 무관하게 CPU를 나누어 쓰고, 기본값은 스레드 풀입니다.
+    cache(SimulationCache)는 스레드 풀에서만 공유되므로 프로세스 풀과 함께 줄 수 없습니다.
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None, max_queue_depth: int = 64, processes: bool = False,
+                 executor: Optional[Executor] = None, cache: Optional[SimulationCache] = None):
+        if processes and cache is not None:
+            raise ValueError("결과 캐시는 스레드 풀에서만 공유할 수 있습니다")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue_depth = max_queue_depth
+        self.cache = cache
+        self._owns_executor = executor is None
+        if executor is None:
+            executor_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+            executor = executor_class(max_workers=self.max_workers)
+        self._executor = executor
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        # 공유 여부와 관계없이 아직 끝나지 않은 모든 계산 (종료 전 대기용)
+        self._pending: Set[asyncio.Future] = set()
+        self._stats = ServiceStats()
+    
+    def stats(self) -> ServiceStats:
+        """현재까지의 통계 (복사본)"""
+        return ServiceStats(**vars(self._stats))
+    
+    async def create_simulation(self, bmc_data: Dict, seed: int = None, persona_count: int = 20,
+                                questions: List[str] = None, bootstrap: int = 0) -> Dict[str, Any]:
+        """시뮬레이션 실행 (SimulationAPI.create_simulation과 같은 결과)
+        
+        대기열이 가득 차 있으면 ServiceOverloaded를 발생시킵니다. 진행 중인 같은 요청에 합류하는 경우는
+        새 계산을 만들지 않으므로 대기열 한도와 관계없이 받아들이며, 같은 결과 객체를 돌려받습니다.
+        """
+        
+        interview_questions = list(questions or bmc_interview_questions(bmc_data))
+        key = None
+        if seed is not None:
+            key = SimulationCache.make_key(bmc_data, seed, persona_count, interview_questions, bootstrap=bootstrap or None)
+            shared = self._in_flight.get(key)
+            if shared is not None:
+                self._stats.submitted += 1
+                self._stats.coalesced += 1
+                # 합류한 요청이 취소되어도 공유 계산은 계속됩니다
+                return await asyncio.shield(shared)
+        
+        if self._stats.in_flight >= self.max_queue_depth:
+            self._stats.rejected += 1
+            raise ServiceOverloaded(self._stats.in_flight, self.max_queue_depth)
+        
+        kwargs = {
+            "bmc_data": bmc_data,
+            "seed": seed,
+            "persona_count": persona_count,
+            "questions": interview_questions,
+            "bootstrap": bootstrap,
+        }
+        if self.cache is not None:
+            kwargs["cache"] = self.cache
+        
+        self._stats.submitted += 1
+        self._stats.computed += 1
+        self._stats.in_flight += 1
+        future = asyncio.get_running_loop().run_in_executor(self._executor, _run_simulation, kwargs)
+        if key is not None:
+            self._in_flight[key] = future
+        self._pending.add(future)
+        # 호출자가 취소되어도 계산이 끝나는 시점에 정리되도록 완료 콜백에서 처리합니다
+        future.add_done_callback(lambda f: self._finish(key, f))
+        return await asyncio.shield(future)
+    
+    def _finish(self, key: Optional[str], future: asyncio.Future) -> None:
+        self._stats.in_flight -= 1
+        self._pending.discard(future)
+        if not future.cancelled() and future.exception() is not None:
+            self._stats.failed += 1
+        if key is not None and self._in_flight.get(key) is future:
+            del self._in_flight[key]
+    
+    async def drain(self) -> None:
+        """진행 중이거나 대기 중인 계산이 모두 끝날 때까지 대기 (실패한 계산도 끝난 것으로 봄)"""
+        if self._pending:
+            await asyncio.wait(list(self._pending))
+    
+    def close(self) -> None:
+        """서비스가 만든 실행 풀 종료"""
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+    
+    async def __aenter__(self) -> "SimulationService":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.drain()
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+def create_app(service: Optional[SimulationService] = None) -> "FastAPI":
+    """FastAPI 앱 생성
+    
+    POST /simulations   BMC 시뮬레이션 실행 (대기열이 가득 차면 503 + Retry-After)
+    GET  /health        상태 확인
+    GET  /stats         서비스 통계
+    
+    실행: uvicorn service:create_app --factory
+    """
+    
+    if FastAPI is None:
+        raise ImportError("create_app에는 fastapi가 필요합니다: pip install fastapi")
+    service = service or SimulationService()
+    
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        # 종료 시 진행 중인 계산이 끝나기를 기다린 뒤 실행 풀을 닫습니다
+        async with service:
+            yield
+    
+    app = FastAPI(title="Startup Simulation Engine", lifespan=lifespan)
+    app.state.service = service
+    
+    @app.post("/simulations")
+    async def create_simulation(request: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return await service.create_simulation(
+                request.get("bmc", {}),
+                seed=request.get("seed"),
+                persona_count=request.get("persona_count", 20),
+                questions=request.get("questions"),
+                bootstrap=request.get("bootstrap", 0)
+            )
+        except ServiceOverloaded as exc:
+            raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "1"})
+    
+    @app.get("/health")
+    async def health() -> Dict[str, Any]:
+        return {"status": "ok"}
+    
+    @app.get("/stats")
+    async def stats() -> Dict[str, Any]:
+        return vars(service.stats())
+    
+    return app
+
+async def asgi_request(app: Callable, method: str, path: str, body: Any = None) -> Dict[str, Any]:
+    """ASGI 앱에 HTTP 요청 하나를 프로세스 안에서 보내고 {status, headers, body} 반환 (서버 없이 부하 테스트용)"""
+    
+    payload = json.dumps(body, ensure_ascii=False).encode("utf-8") if body is not None else b""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("ascii"),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())],
+        "client": ("127.0.0.1", 0),
+        "server": ("testserver", 80),
+    }
+    sent = False
+    
+    async def receive() -> Dict[str, Any]:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        # 응답이 끝날 때까지 연결을 유지합니다
+        await asyncio.Event().wait()
+    
+    response = {"status": None, "headers": {}, "body": b""}
+    
+    async def send(message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {k.decode("latin-1"): v.decode("latin-1") for k, v in message.get("headers", [])}
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+    
+    await app(scope, receive, send)
+    return response
+
+@dataclass
+class LoadTestReport:
+    """부하 테스트 결과 (지연 시간은 초)"""
+    requests: int
+    concurrency: int
+    succeeded: int
+    errors: Dict[str, int]  # 오류 종류 -> 횟수 (예: ServiceOverloaded, HTTP 503)
+    wall_time: float
+    throughput: float  # 초당 성공 요청 수
+    latency_p50: float
+    latency_p95: float
+    latency_p99: float
+    latency_max: float
+
+async def load_test(call: Callable[[int], Awaitable[Any]], requests: int = 200, concurrency: int = 32) -> LoadTestReport:
+    """call(요청 번호)을 동시에 concurrency개씩 requests번 실행하며 성공한 요청의 지연 시간 분포 측정
+    
+    call이 예외를 던지거나 HTTP 응답 dict의 status가 400 이상이면 오류로 셉니다.
+    """
+    
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    next_request = iter(range(requests))
+    
+    async def worker() -> None:
+        for i in next_request:
+            start = time.perf_counter()
+            try:
+                response = await call(i)
+            except Exception as exc:
+                errors[type(exc).__name__] = errors.get(type(exc).__name__, 0) + 1
+                continue
+            if isinstance(response, dict) and (response.get("status") or 0) >= 400:
+                errors[f"HTTP {response['status']}"] = errors.get(f"HTTP {response['status']}", 0) + 1
+                continue
+            latencies.append(time.perf_counter() - start)
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall_time = time.perf_counter() - started
+    
+    values = np.array(latencies) if latencies else np.zeros(1)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99]).tolist()
+    return LoadTestReport(
+        requests=requests,
+        concurrency=concurrency,
+        succeeded=len(latencies),
+        errors=errors,
+        wall_time=wall_time,
+        throughput=len(latencies) / wall_time if wall_time > 0 else 0.0,
+        latency_p50=p50,
+        latency_p95=p95,
+        latency_p99=p99,
+        latency_max=float(values.max())
+    )
+
+if __name__ == "__main__":
+    # 테스트 실행: 서비스를 직접 호출하는 부하 테스트 (fastapi가 있으면 ASGI 앱으로도 측정)
+    test_bmc = {"hypotheses": ["월 구독료 9,900원은 적정 가격이다", "핵심 기능의 사용성이 경쟁 제품보다 중요하다"]}
+    
+    async def main() -> None:
+        async with SimulationService(max_workers=4, max_queue_depth=16) as service:
+            # seed 8종을 반복하므로 동시에 들어온 같은 요청은 계산을 공유합니다
+            report = await load_test(
+                lambda i: service.create_simulation(test_bmc, seed=i % 8, persona_count=200),
+                requests=200, concurrency=32
+            )
+            print(report)
+            print(service.stats())
+            
+            if FastAPI is not None:
+                app = create_app(service)
+                body = {"bmc": test_bmc, "persona_count": 200}
+                report = await load_test(
+                    lambda i: asgi_request(app, "POST", "/simulations", {**body, "seed": i % 8}),
+                    requests=200, concurrency=32
+                )
+                print(report)
+    
+    asyncio.run(main())
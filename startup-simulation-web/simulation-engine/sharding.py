@@ -0,0 +1,433 @@
+"""
+샤드 분산 가설 검증
+큰 패널을 여러 워커(노드)에 나누어 인터뷰하고, 샤드마다 합칠 수 있는 부분 집계를 만든 뒤
+코디네이터가 합쳐 한 노드에서 exact=True로 검증한 것과 같은 HypothesisResult를 만듭니다.
+
+부분 집계는 가설별, 세그먼트별로 다음 값을 가집니다.
+- 응답 수, 긍정/부정 응답 수
+- 신뢰도 기여분의 정확한 합계 (분수, ExactSum)
+- 근거: 전역 순서 키(페르소나 인덱스, 페르소나 안의 응답 순번)가 가장 앞선 최대 5개
+
+부분 집계의 크기는 응답 수와 무관하며, 합치는 순서나 묶는 방법에 관계없이 같은 결과가 됩니다.
+샤드는 서로 겹치지 않는 페르소나 범위를 맡아야 하며, 페르소나 인덱스 순서가 한 노드 패널의 순서입니다.
+"""
+
+import json
+import os
+import tempfile
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from fractions import Fraction
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+from urllib.parse import quote
+
+import numpy as np
+
+from batch_runner import spawn_task_seeds
+from population_pool import get_population
+from simulation_engine import (
+    SimulationEngine, PersonaTable, InterviewTable, HypothesisResult, ResponseSentiment,
+    DEFAULT_INTERVIEW_QUESTIONS, SEGMENTS, SENTIMENTS, exact_sum, ordered_total
+)
+
+PARTIAL_FORMAT_VERSION = 3
+
+# 가설별로 보관하는 근거 수 (HypothesisResult와 같음)
+EVIDENCE_LIMIT = 5
+
+# 근거 항목: (페르소나 인덱스, 페르소나 안의 응답 순번, 근거 문자열)
+Evidence = Tuple[int, int, str]
+
+@dataclass
+class SegmentTally:
+    """세그먼트 하나의 응답 수 집계"""
+    responses: int = 0
+    positive: int = 0
+    negative: int = 0
+    
+    def merge(self, other: "SegmentTally") -> "SegmentTally":
+        return SegmentTally(
+            responses=self.responses + other.responses,
+            positive=self.positive + other.positive,
+            negative=self.negative + other.negative
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {"responses": self.responses, "positive": self.positive, "negative": self.negative}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SegmentTally":
+        return cls(responses=data["responses"], positive=data["positive"], negative=data["negative"])
+
+@dataclass
+class ExactSum:
+    """세그먼트별 신뢰도 기여분의 정확한 합계
+    
+    한 노드의 기본 검증은 기여분을 응답 순서대로 더하므로, 샤드가 이를 비트 단위로 재현하려면 앞 샤드의
+    합계에서 이어 더할 수 있도록 기여분을 모두 들고 있어야 합니다. 대신 샤드는 세그먼트마다 정확한 합계(분수)만
+    보관하고 마지막에 한 번만 반올림하므로, 크기가 응답 수와 무관하고 합치는 순서와도 무관하며
+    결과는 validate_hypotheses(exact=True)와 비트 단위로 같습니다.
+    """
+    segment_totals: Dict[str, Fraction] = field(default_factory=dict)  # 세그먼트 값 -> 합계
+    
+    @classmethod
+    def from_values(cls, values: np.ndarray, segments: np.ndarray) -> "ExactSum":
+        """응답별 기여분과 세그먼트 번호로 합계 생성"""
+        return cls({
+            SEGMENTS[seg_idx].value: exact_sum(values[segments == seg_idx])
+            for seg_idx in np.unique(segments).tolist()
+        })
+    
+    def merge(self, other: "ExactSum") -> "ExactSum":
+        segment_totals = dict(self.segment_totals)
+        for name, value in other.segment_totals.items():
+            segment_totals[name] = segment_totals.get(name, Fraction(0)) + value
+        return ExactSum(segment_totals)
+    
+    def totals(self) -> Tuple[float, Dict[str, float]]:
+        """(전체 합계, 세그먼트별 합계) - 정확한 합계를 한 번만 반올림"""
+        total = sum(self.segment_totals.values(), Fraction(0))
+        return float(total), {name: float(value) for name, value in self.segment_totals.items()}
+    
+    def to_dict(self) -> Dict[str, str]:
+        # 분수는 "분자/분모" 문자열로 정확히 보존합니다
+        return {name: str(value) for name, value in self.segment_totals.items()}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, str]) -> "ExactSum":
+        return cls({name: Fraction(value) for name, value in data.items()})
+
+def _first_evidence(a: List[Evidence], b: List[Evidence]) -> List[Evidence]:
+    return sorted(a + b, key=lambda item: (item[0], item[1]))[:EVIDENCE_LIMIT]
+
+@dataclass
+class HypothesisPartial:
+    """가설 하나의 샤드 부분 집계"""
+    hypothesis: str
+    segments: Dict[str, SegmentTally] = field(default_factory=dict)  # 세그먼트 값 -> 집계
+    sums: ExactSum = field(default_factory=ExactSum)
+    supporting: List[Evidence] = field(default_factory=list)
+    contrary: List[Evidence] = field(default_factory=list)
+    
+    def merge(self, other: "HypothesisPartial") -> "HypothesisPartial":
+        if other.hypothesis != self.hypothesis:
+            raise ValueError(f"다른 가설의 집계는 합칠 수 없습니다: {self.hypothesis} / {other.hypothesis}")
+        segments = dict(self.segments)
+        for name, tally in other.segments.items():
+            segments[name] = segments[name].merge(tally) if name in segments else tally
+        return HypothesisPartial(
+            hypothesis=self.hypothesis,
+            segments=segments,
+            sums=self.sums.merge(other.sums),
+            supporting=_first_evidence(self.supporting, other.supporting),
+            contrary=_first_evidence(self.contrary, other.contrary)
+        )
+    
+    def total(self) -> SegmentTally:
+        """모든 세그먼트를 합친 집계"""
+        tally = SegmentTally()
+        for segment_tally in self.segments.values():
+            tally = tally.merge(segment_tally)
+        return tally
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "hypothesis": self.hypothesis,
+            "segments": {name: tally.to_dict() for name, tally in self.segments.items()},
+            "sums": self.sums.to_dict(),
+            "supporting": [list(item) for item in self.supporting],
+            "contrary": [list(item) for item in self.contrary],
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HypothesisPartial":
+        return cls(
+            hypothesis=data["hypothesis"],
+            segments={name: SegmentTally.from_dict(tally) for name, tally in data["segments"].items()},
+            sums=ExactSum.from_dict(data["sums"]),
+            supporting=[(int(idx), int(rank), text) for idx, rank, text in data["supporting"]],
+            contrary=[(int(idx), int(rank), text) for idx, rank, text in data["contrary"]]
+        )
+
+@dataclass
+class ShardPartial:
+    """샤드 하나(또는 여러 샤드를 합친)의 가설별 부분 집계"""
+    shard_ids: List[str]
+    personas: int
+    hypotheses: Dict[str, HypothesisPartial]
+    ranges: List[Tuple[int, int]] = field(default_factory=list)  # 맡은 페르소나 인덱스 범위 [start, stop)
+    
+    def merge(self, other: "ShardPartial") -> "ShardPartial":
+        overlap = set(self.shard_ids) & set(other.shard_ids)
+        if overlap:
+            raise ValueError(f"같은 샤드가 두 번 합쳐졌습니다: {', '.join(sorted(overlap))}")
+        ranges = sorted(self.ranges + other.ranges)
+        for (_, previous_stop), (start, stop) in zip(ranges, ranges[1:]):
+            if start < previous_stop:
+                raise ValueError(f"샤드의 페르소나 범위가 겹칩니다: [{start}, {stop})")
+        hypotheses = dict(self.hypotheses)
+        for hypothesis, partial in other.hypotheses.items():
+            hypotheses[hypothesis] = hypotheses[hypothesis].merge(partial) if hypothesis in hypotheses else partial
+        return ShardPartial(
+            shard_ids=self.shard_ids + other.shard_ids,
+            personas=self.personas + other.personas,
+            hypotheses=hypotheses,
+            ranges=ranges
+        )
+    
+    def to_json(self) -> str:
+        return json.dumps({
+            "format_version": PARTIAL_FORMAT_VERSION,
+            "shard_ids": self.shard_ids,
+            "personas": self.personas,
+            "ranges": [list(item) for item in self.ranges],
+            "hypotheses": [partial.to_dict() for partial in self.hypotheses.values()],
+        }, ensure_ascii=False)
+    
+    @classmethod
+    def from_json(cls, text: str) -> "ShardPartial":
+        data = json.loads(text)
+        if data.get("format_version") != PARTIAL_FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 부분 집계 형식입니다: {data.get('format_version')}")
+        partials = [HypothesisPartial.from_dict(item) for item in data["hypotheses"]]
+        return cls(
+            shard_ids=list(data["shard_ids"]),
+            personas=data["personas"],
+            hypotheses={partial.hypothesis: partial for partial in partials},
+            ranges=[(int(start), int(stop)) for start, stop in data["ranges"]]
+        )
+
+def shard_partial(engine: SimulationEngine, hypotheses: List[str], shard_id: str,
+                  running: Optional[Dict[str, float]] = None) -> ShardPartial:
+    """엔진의 패널과 인터뷰 결과로 가설별 부분 집계 생성 (validate_hypotheses와 같은 응답 선택 규칙)
+    
+    샤드를 패널 순서대로 한 곳에서 처리하는 경우(예: 청크 스트리밍) running(가설 -> 합계)을 주면
+    이 샤드의 기여분을 응답 순서대로 이어서 더해 둡니다 (ShardCoordinator.results의 totals로 사용).
+    """
+    
+    index = engine._build_response_index()
+    
+    # 응답별 세그먼트와 페르소나 안의 응답 순번 (응답은 페르소나별로 모여 있습니다)
+    persona = index["persona_keys"]()
+    segment = index["persona_segments"](persona)
+    starts = np.flatnonzero(np.concatenate([[True], persona[1:] != persona[:-1]])) if len(persona) else np.zeros(0, np.int64)
+    rank = np.arange(len(persona)) - np.repeat(starts, np.diff(np.append(starts, len(persona))))
+    
+    # 샤드가 맡은 페르소나 인덱스 범위 (연속 구간)
+    indices = engine.personas.columns["index"] if isinstance(engine.personas, PersonaTable) else persona
+    start, stop = (int(indices.min()), int(indices.max()) + 1) if len(indices) else (0, 0)
+    
+    positive = SENTIMENTS.index(ResponseSentiment.POSITIVE)
+    negative = SENTIMENTS.index(ResponseSentiment.NEGATIVE)
+    
+    partials = {}
+    for hypothesis in dict.fromkeys(hypotheses):
+        rows = engine._matching_rows(index, hypothesis)
+        row_segment = segment[rows]
+        sentiment = index["sentiment"][rows]
+        responses = np.bincount(row_segment, minlength=len(SEGMENTS))
+        positive_counts = np.bincount(row_segment[sentiment == positive], minlength=len(SEGMENTS))
+        negative_counts = np.bincount(row_segment[sentiment == negative], minlength=len(SEGMENTS))
+        
+        segments = {}
+        for seg_idx, seg in enumerate(SEGMENTS):
+            if responses[seg_idx]:
+                segments[seg.value] = SegmentTally(
+                    responses=int(responses[seg_idx]),
+                    positive=int(positive_counts[seg_idx]),
+                    negative=int(negative_counts[seg_idx])
+                )
+        
+        def evidence(wanted: int) -> List[Evidence]:
+            picked = rows[sentiment == wanted][:EVIDENCE_LIMIT]
+            return [(int(persona[r]), int(rank[r]), index["evidence"](r)) for r in picked]
+        
+        if running is not None:
+            running[hypothesis] = ordered_total(index["contribution"][rows], running.get(hypothesis, 0.0))
+        partials[hypothesis] = HypothesisPartial(
+            hypothesis=hypothesis,
+            segments=segments,
+            sums=ExactSum.from_values(index["contribution"][rows], row_segment),
+            supporting=evidence(positive),
+            contrary=evidence(negative)
+        )
+    
+    return ShardPartial(shard_ids=[shard_id], personas=len(engine.personas), hypotheses=partials,
+                        ranges=[(start, stop)] if stop > start else [])
+
+def merge_partials(partials: Iterable[ShardPartial]) -> ShardPartial:
+    """부분 집계들을 하나로 합치기 (합치는 순서와 묶는 방법에 관계없이 같은 결과)"""
+    
+    merged = ShardPartial(shard_ids=[], personas=0, hypotheses={})
+    for partial in partials:
+        merged = merged.merge(partial)
+    return merged
+
+class ShardCoordinator:
+    """샤드 부분 집계를 모아 가설 검증 결과를 만드는 코디네이터
+    
+    사용 예:
+        coordinator = ShardCoordinator(hypotheses)
+        for text in partial_jsons:
+            coordinator.add(ShardPartial.from_json(text))
+        results = coordinator.results()
+    """
+    
+    def __init__(self, hypotheses: List[str], threshold: float = 0.6):
+        self.hypotheses = list(hypotheses)
+        self.threshold = threshold
+        self.merged = ShardPartial(shard_ids=[], personas=0, hypotheses={})
+        self._engine = SimulationEngine({})
+    
+    @property
+    def shard_ids(self) -> List[str]:
+        return list(self.merged.shard_ids)
+    
+    def add(self, partial: ShardPartial) -> None:
+        """샤드 부분 집계 추가 (같은 샤드를 두 번 추가하면 ValueError)"""
+        self.merged = self.merged.merge(partial)
+    
+    def _partial(self, hypothesis: str) -> HypothesisPartial:
+        return self.merged.hypotheses.get(hypothesis) or HypothesisPartial(hypothesis=hypothesis)
+    
+    def results(self, totals: Optional[Dict[str, float]] = None) -> List[HypothesisResult]:
+        """합친 집계로 가설별 HypothesisResult 생성 (한 노드에서 exact=True로 검증한 결과와 같음)
+        
+        totals(shard_partial의 running)를 주면 그 합계를 써서 한 노드의 기본 검증과 같은 점수를 냅니다.
+        """
+        
+        results = []
+        for hypothesis in self.hypotheses:
+            partial = self._partial(hypothesis)
+            total_confidence = totals[hypothesis] if totals is not None else partial.sums.totals()[0]
+            results.append(self._engine._build_hypothesis_result(
+                hypothesis, self.threshold, total_confidence, partial.total().responses,
+                [text for _, _, text in partial.supporting], [text for _, _, text in partial.contrary]
+            ))
+        return results
+    
+    def segment_breakdown(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """가설 -> 세그먼트 -> {응답 수, 신뢰 점수, 긍정/부정 응답 수}"""
+        
+        breakdown = {}
+        for hypothesis in self.hypotheses:
+            partial = self._partial(hypothesis)
+            _, segment_totals = partial.sums.totals()
+            breakdown[hypothesis] = {
+                name: {
+                    "responses": tally.responses,
+                    "confidence_score": segment_totals[name] / tally.responses,
+                    "positive": tally.positive,
+                    "negative": tally.negative,
+                }
+                for name, tally in partial.segments.items()
+            }
+        return breakdown
+
+def shard_range(shard_index: int, shard_count: int, persona_count: int) -> Tuple[int, int]:
+    """샤드가 맡는 페르소나 인덱스 범위 [start, stop)"""
+    return persona_count * shard_index // shard_count, persona_count * (shard_index + 1) // shard_count
+
+def shard_panel(shard_index: int, shard_count: int, persona_count: int, seed: Optional[int] = None,
+                questions: List[str] = None, population_dir: Optional[str] = None,
+                pools: InterviewTable = None) -> SimulationEngine:
+    """샤드의 패널을 만들고 인터뷰한 엔진 반환
+    
+    인구 풀이 있으면 풀의 연속 구간을, 없으면 샤드 seed로 인덱스 범위의 페르소나를 생성합니다.
+    샤드 seed는 (seed, 샤드 번호)로만 정해지므로 어느 노드에서 실행해도 같은 패널이 됩니다.
+    """
+    
+    start, stop = shard_range(shard_index, shard_count, persona_count)
+    engine = SimulationEngine({}, columnar=True, seed=spawn_task_seeds(shard_count, seed)[shard_index])
+    if population_dir:
+        engine.personas = get_population(population_dir).slice(start, stop)
+    else:
+        engine.personas = PersonaTable(engine.generate_persona_arrays(stop - start, start=start))
+    engine.interview_results = InterviewTable(pools=pools)
+    engine.interview_panel(engine.personas, list(questions or DEFAULT_INTERVIEW_QUESTIONS))
+    return engine
+
+def run_shard(hypotheses: List[str], shard_index: int, shard_count: int, persona_count: int,
+              seed: Optional[int] = None, questions: List[str] = None,
+              population_dir: Optional[str] = None) -> str:
+    """워커에서 샤드 하나를 실행하고 부분 집계를 JSON으로 반환"""
+    
+    engine = shard_panel(shard_index, shard_count, persona_count, seed, questions, population_dir)
+    return shard_partial(engine, hypotheses, shard_id=f"{shard_index}/{shard_count}").to_json()
+
+def run_sharded(hypotheses: List[str], shard_count: int, persona_count: int, seed: Optional[int] = None,
+                questions: List[str] = None, threshold: float = 0.6, workers: Optional[int] = None,
+                population_dir: Optional[str] = None) -> ShardCoordinator:
+    """샤드들을 프로세스 풀에서 실행하고 부분 집계를 합친 코디네이터 반환 (여러 노드 실행의 로컬 대용)"""
+    
+    coordinator = ShardCoordinator(hypotheses, threshold)
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        futures = [
+            executor.submit(run_shard, hypotheses, shard_index, shard_count, persona_count, seed, questions, population_dir)
+            for shard_index in range(shard_count)
+        ]
+        for future in futures:
+            coordinator.add(ShardPartial.from_json(future.result()))
+    return coordinator
+
+class PartialQueue:
+    """디렉터리 기반 부분 집계 큐 (공유 파일 시스템이나 객체 저장소를 쓰는 노드 간 전달의 로컬 대용)
+    
+    샤드마다 <shard_id>.json 파일 하나를 임시 파일에 쓴 뒤 교체하므로 반쯤 쓰인 파일을 읽지 않습니다.
+    """
+    
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+    
+    def put(self, partial: ShardPartial) -> str:
+        path = os.path.join(self.directory, quote("+".join(partial.shard_ids), safe="") + ".json")
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(partial.to_json())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return path
+    
+    def collect(self, coordinator: ShardCoordinator) -> List[str]:
+        """아직 추가하지 않은 샤드 파일을 코디네이터에 추가하고, 읽지 못한 파일의 오류 목록 반환"""
+        
+        errors = []
+        known = set(coordinator.shard_ids)
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.directory, name), encoding="utf-8") as f:
+                    partial = ShardPartial.from_json(f.read())
+                if not known.intersection(partial.shard_ids):
+                    coordinator.add(partial)
+                    known.update(partial.shard_ids)
+            except Exception:
+                errors.append(f"{name}: {traceback.format_exc()}")
+        return errors
+
+if __name__ == "__main__":
+    # 테스트 실행: 4개 샤드를 프로세스 풀에서 실행하고 한 노드(정확한 합계) 결과와 비교
+    test_hypotheses = [
+        "월 구독료 9,900원은 적정 가격이다",
+        "핵심 기능의 사용성이 경쟁 제품보다 중요하다"
+    ]
+    coordinator = run_sharded(test_hypotheses, shard_count=4, persona_count=2000, seed=42, workers=2)
+    
+    pools = InterviewTable()
+    engines = [shard_panel(i, 4, 2000, seed=42, pools=pools) for i in range(4)]
+    single = SimulationEngine({}, columnar=True)
+    single.personas = PersonaTable.concat([e.personas for e in engines])
+    single.interview_results = InterviewTable(pools=pools)
+    for e in engines:
+        single.interview_results.extend(e.interview_results)
+    
+    print(coordinator.results() == single.validate_hypotheses(test_hypotheses, exact=True))
+    for hypothesis, segments in coordinator.segment_breakdown().items():
+        print(hypothesis, {name: round(s["confidence_score"], 3) for name, s in segments.items()})
@@ -3,13 +3,20 @@
 고객 페르소나 생성, 가설 검증, 시장 분석을 수행합니다.
 """
 
-import random
+import asyncio
 import json
-from typing import List, Dict, Any, Tuple
-from dataclasses import dataclass, asdict
+import re
+import time
+import uuid
+from typing import List, Dict, Any, Tuple, Iterator, AsyncIterator, Optional
+from collections.abc import Mapping
+from dataclasses import dataclass
 from enum import Enum
+from fractions import Fraction
 import numpy as np
 from datetime import datetime
+from instrumentation import Instrumentation, instrumented, stage_context
+from keyword_matcher import KeywordMatcher, QuestionRouter
 
 class CustomerSegment(Enum):
     """고객 세그먼트 분류"""
@@ -51,6 +58,16 @@ class InterviewResponse:
     confidence: float
     keywords: List[str]
 
+@dataclass
+class BootstrapSummary:
+    """신뢰 점수의 부트스트랩 신뢰 구간과 세그먼트별 점수"""
+    lower_bound: float
+    upper_bound: float
+    confidence_level: float
+    resamples: int
+    status_probability: Dict[str, float]  # 재표본 중 각 검증 상태가 나온 비율
+    segment_scores: Dict[str, Dict[str, Any]]  # 세그먼트 -> {score, lower_bound, upper_bound, responses}
+
 @dataclass
 class HypothesisResult:
     """가설 검증 결과"""
@@ -61,16 +78,921 @@ class HypothesisResult:
     contrary_evidence: List[str]
     recommendations: List[str]
     pivot_suggestions: List[str]
+    bootstrap: Optional[BootstrapSummary] = None  # bootstrap 옵션을 켠 경우에만
+
+@dataclass
+class SequentialValidationResult:
+    """순차(조기 종료) 가설 검증 결과"""
+    result: HypothesisResult
+    personas_interviewed: int  # 이 가설 판정에 사용한 페르소나 수
+    responses_used: int
+    looks: int  # 중간 판정 횟수
+    lower_bound: float  # 신뢰 점수의 신뢰 구간
+    upper_bound: float
+    stopped_early: bool  # 최대 페르소나 수 전에 판정이 확정되었는지
+
+@dataclass
+class SimulationEvent:
+    """스트리밍 시뮬레이션 이벤트"""
+    type: str  # started, personas, interviews, hypothesis, financial, completed
+    simulation_id: str
+    progress: float  # 0.0 - 1.0
+    payload: Dict[str, Any]
+
+# 한국 이름 풀
+LAST_NAMES = ["김", "이", "박", "최", "정", "강", "조", "윤", "장", "임"]
+FIRST_NAMES_MALE = ["민준", "서준", "도윤", "예준", "시우", "하준", "주원", "지호", "지후", "준서"]
+FIRST_NAMES_FEMALE = ["서연", "서윤", "지우", "서현", "민서", "하은", "하윤", "지유", "윤서", "채원"]
+GENDERS = ["남성", "여성"]
+
+# 직업 풀
+OCCUPATIONS = [
+    "스타트업 개발자", "마케팅 매니저", "프리랜서 디자이너", 
+    "중소기업 팀장", "대기업 사원", "학생", "자영업자",
+    "컨설턴트", "연구원", "교사"
+]
+
+# 소득 구간
+INCOME_RANGES = [
+    "2000만원 이하", "2000-3000만원", "3000-4000만원",
+    "4000-5000만원", "5000-7000만원", "7000만원-1억원", "1억원 이상"
+]
+
+# Pain point / needs 카탈로그 (비트마스크 인덱스 순서)
+PAIN_POINT_CATALOG = [
+    "업무 효율성 저하",
+    "협업 도구의 분산",
+    "데이터 관리 어려움",
+    "커뮤니케이션 단절",
+    "반복적인 수작업",
+    "비용 증가",
+    "시간 낭비",
+    "정보 접근성 부족",
+    "품질 관리 어려움",
+    "확장성 부족"
+]
+
+NEED_CATALOG = [
+    "통합 관리 솔루션",
+    "자동화 기능",
+    "실시간 협업",
+    "데이터 분석",
+    "모바일 접근성",
+    "사용자 친화적 인터페이스",
+    "보안 강화",
+    "커스터마이징 옵션",
+    "합리적 가격",
+    "빠른 고객 지원"
+]
+
+# 세그먼트별 파라미터 테이블 (CustomerSegment 선언 순서)
+SEGMENT_DISTRIBUTION = [0.025, 0.135, 0.34, 0.34, 0.16]  # Rogers' Innovation Adoption Curve
+
+# 나이 정규분포 (평균, 표준편차)
+SEGMENT_AGE_PARAMS = np.array([
+    [28, 5],  # INNOVATOR
+    [32, 6],  # EARLY_ADOPTER
+    [38, 8],  # EARLY_MAJORITY
+    [38, 8],  # LATE_MAJORITY
+    [38, 8],  # LAGGARD
+], dtype=np.float64)
+
+# 특성 점수 범위 [low, high] (TRAIT_NAMES 순서)
+TRAIT_NAMES = ("tech_savviness", "price_sensitivity", "brand_loyalty", "social_influence")
+SEGMENT_TRAIT_RANGES = np.array([
+    [[7, 10], [3, 7], [2, 6], [6, 10]],  # INNOVATOR
+    [[7, 10], [3, 7], [2, 6], [6, 10]],  # EARLY_ADOPTER
+    [[4, 7], [5, 9], [5, 8], [4, 7]],  # EARLY_MAJORITY
+    [[4, 7], [5, 9], [5, 8], [4, 7]],  # LATE_MAJORITY
+    [[1, 4], [7, 10], [6, 10], [2, 5]],  # LAGGARD
+], dtype=np.int64)
+
+def _channel_answers(channels: List[str]) -> List[str]:
+    return [f"{channel}을(를) 통해 알게 되었습니다." for channel in channels]
+
+# 질문 유형별 응답 규칙
+# trait 값이 cutoffs를 기준으로 몇 번째 티어에 속하는지에 따라 (감정, 신뢰도, 답변 후보)가 정해집니다.
+# direction="above": 값 > cutoffs[0] 이면 0번 티어, 값 > cutoffs[1] 이면 1번 티어, ... 그 외 마지막 티어
+# direction="below": 값 < cutoffs[0] 이면 0번 티어, ...
+RESPONSE_RULES: Dict[str, Dict[str, Any]] = {
+    "price": {
+        "trait": "price_sensitivity",
+        "direction": "above",
+        "cutoffs": [7, 4],
+        "tiers": [
+            (ResponseSentiment.NEGATIVE, 0.3, [
+                "가격이 부담스러워요. 더 저렴한 대안을 찾고 있습니다.",
+                "무료 버전이나 체험판을 먼저 써보고 싶네요.",
+                "현재 예산으로는 어려울 것 같습니다."
+            ]),
+            (ResponseSentiment.NEUTRAL, 0.6, [
+                "가치가 명확하다면 고려해볼 수 있습니다.",
+                "경쟁사와 비교해보고 결정하겠습니다.",
+                "팀과 상의가 필요할 것 같아요."
+            ]),
+            (ResponseSentiment.POSITIVE, 0.8, [
+                "합리적인 가격이라고 생각합니다.",
+                "제공되는 가치를 고려하면 적절한 것 같아요.",
+                "투자할 가치가 있다고 봅니다."
+            ]),
+        ],
+        "keywords": ["가격", "비용", "예산", "가치"],
+    },
+    "feature": {
+        "trait": "tech_savviness",
+        "direction": "above",
+        "cutoffs": [7],
+        "tiers": [
+            (ResponseSentiment.POSITIVE, 0.7, [
+                "고급 기능과 커스터마이징 옵션이 중요합니다.",
+                "API 연동과 자동화 기능이 필수적이에요.",
+                "데이터 분석과 인사이트 기능을 중시합니다."
+            ]),
+            (ResponseSentiment.NEUTRAL, 0.7, [
+                "사용하기 쉬운 인터페이스가 가장 중요해요.",
+                "기본 기능만 잘 작동하면 됩니다.",
+                "복잡한 기능보다는 안정성이 중요합니다."
+            ]),
+        ],
+        "keywords": ["기능", "인터페이스", "사용성"],
+    },
+    "competition": {
+        "trait": "brand_loyalty",
+        "direction": "above",
+        "cutoffs": [7],
+        "tiers": [
+            (ResponseSentiment.NEGATIVE, 0.6, [
+                "현재 사용 중인 도구에 만족하고 있어서 바꾸기 어려워요.",
+                "전환 비용과 학습 곡선을 고려해야 합니다.",
+                "팀원들의 적응 기간이 걱정됩니다."
+            ]),
+            (ResponseSentiment.POSITIVE, 0.6, [
+                "더 나은 솔루션이라면 언제든 전환할 의향이 있습니다.",
+                "차별화된 가치가 있다면 시도해볼 만해요.",
+                "경쟁사 대비 장점이 명확하네요."
+            ]),
+        ],
+        "keywords": ["경쟁", "차별화", "전환"],
+    },
+    "discovery": {
+        "trait": "age",
+        "direction": "below",
+        "cutoffs": [30, 40],
+        "tiers": [
+            (ResponseSentiment.NEUTRAL, 0.8, _channel_answers(["인스타그램", "유튜브", "링크드인", "페이스북"])),
+            (ResponseSentiment.NEUTRAL, 0.8, _channel_answers(["구글 검색", "동료 추천", "업계 커뮤니티", "웨비나"])),
+            (ResponseSentiment.NEUTRAL, 0.8, _channel_answers(["업계 전문지", "컨퍼런스", "파트너사 소개", "이메일 뉴스레터"])),
+        ],
+        "keywords": ["마케팅", "채널", "발견"],
+    },
+    "general": {
+        "trait": None,
+        "direction": "above",
+        "cutoffs": [],
+        "tiers": [
+            (ResponseSentiment.NEUTRAL, 0.5, [
+                "흥미로운 제안입니다. 더 자세히 알아보고 싶네요.",
+                "우리 팀의 니즈와 잘 맞는 것 같습니다.",
+                "몇 가지 추가 질문이 있습니다."
+            ]),
+        ],
+        "keywords": ["일반", "관심"],
+    },
+}
+
+# 질문 분류 규칙 (우선순위 순, 카테고리는 RESPONSE_RULES 키)
+# 조건 하나에 든 단어가 모두 질문에 들어 있으면 해당 카테고리로 분류하며, 맞는 조건이 없으면 general입니다.
+QUESTION_ROUTES: List[Tuple[str, List[List[str]]]] = [
+    # 가격 관련 질문
+    ("price", [["가격"], ["비용"], ["구독"], ["price"], ["pricing"], ["cost"], ["subscription"]]),
+    # 기능 관련 질문
+    ("feature", [["기능"], ["특징"], ["feature"]]),
+    # 경쟁사 관련 질문
+    ("competition", [["경쟁"], ["비교"], ["competitor"], ["compare"], ["comparison"]]),
+    # 마케팅 채널 관련 질문
+    ("discovery", [["어떻게", "알게"], ["how", "hear about"], ["how", "find out"]]),
+]
+
+QUESTION_ROUTER = QuestionRouter(QUESTION_ROUTES, default="general")
+
+def classify_question(question: str) -> str:
+    """질문 유형 분류 (RESPONSE_RULES 키 반환)"""
+    return QUESTION_ROUTER.classify(question)
+
+# 재무 모델 기본 파라미터
+FINANCIAL_DEFAULTS: Dict[str, float] = {
+    "initial_users": 10,
+    "monthly_growth_rate": 0.15,  # 15% 성장률
+    "churn_rate": 0.05,  # 5% 이탈률
+    "conversion_rate": 0.1,  # 10% 전환율
+    "arpu": 9900,  # 평균 고객당 수익
+    "fixed_costs": 10000000,  # 고정비 1천만원
+    "variable_cost_per_user": 1000,  # 사용자당 변동비
+    "marketing_cost": 5000000,  # 마케팅 비용
+}
+
+# 0-1 사이로 제한되는 비율 파라미터
+RATE_PARAMETERS = ("monthly_growth_rate", "churn_rate", "conversion_rate")
+
+# 월별 사용자 추이를 결정하는 파라미터 (나머지는 사용자 수에 곱해지는 매출/비용 파라미터)
+USER_PARAMETERS = ("initial_users", "monthly_growth_rate", "churn_rate")
+
+# 몬테카를로 기본 분포 (분포 이름, 인자...)
+MONTE_CARLO_DISTRIBUTIONS: Dict[str, Tuple] = {
+    "monthly_growth_rate": ("normal", 0.15, 0.05),
+    "churn_rate": ("normal", 0.05, 0.015),
+    "conversion_rate": ("normal", 0.1, 0.03),
+    "arpu": ("normal", 9900, 1500),
+    "fixed_costs": ("normal", 10000000, 1000000),
+    "variable_cost_per_user": ("uniform", 800, 1200),
+    "marketing_cost": ("normal", 5000000, 1000000),
+}
+
+def sample_parameter(name: str, spec: Tuple, size: int, rng: np.random.Generator) -> np.ndarray:
+    """분포 지정에 따라 파라미터 표본 추출"""
+    
+    kind, *args = spec
+    if kind == "fixed":
+        values = np.full(size, float(args[0]))
+    elif kind == "normal":
+        values = rng.normal(args[0], args[1], size)
+    elif kind == "uniform":
+        values = rng.uniform(args[0], args[1], size)
+    elif kind == "triangular":
+        values = rng.triangular(args[0], args[1], args[2], size)
+    elif kind == "lognormal":
+        values = rng.lognormal(args[0], args[1], size)
+    else:
+        raise ValueError(f"지원하지 않는 분포입니다: {kind}")
+    
+    if name in RATE_PARAMETERS:
+        return np.clip(values, 0.0, 1.0)
+    if name == "initial_users":
+        return np.maximum(np.round(values), 0)
+    return np.maximum(values, 0.0)
+
+def project_financials(params: Dict[str, Any], months: int) -> Dict[str, np.ndarray]:
+    """재무 파라미터 배열로 월별 추이를 벡터 계산
+    
+    각 파라미터는 스칼라 또는 같은 모양으로 브로드캐스트되는 배열이며,
+    결과 배열은 (파라미터 모양..., months) 형태입니다. 월 단위 점화식은
+    run_financial_simulation과 같은 int() 절사 규칙을 따릅니다.
+    사용자 추이는 사용자 파라미터(초기 사용자/성장률/이탈률)의 모양에서만 계산하고 나머지 축으로는
+    브로드캐스트하므로, 비용/가격 파라미터만 바꾸는 그리드는 사용자 점화식을 다시 돌리지 않습니다.
+    """
+    
+    p = {name: np.asarray(params.get(name, default), dtype=np.float64) for name, default in FINANCIAL_DEFAULTS.items()}
+    shape = np.broadcast(*p.values()).shape
+    
+    user_params = [p[name] for name in USER_PARAMETERS]
+    user_shape = np.broadcast(*user_params).shape
+    # 사용자 파라미터가 길이 1인 축은 결과에서도 길이 1로 남겨 나머지 축으로 브로드캐스트합니다
+    user_shape = tuple(1 for _ in range(len(shape) - len(user_shape))) + user_shape
+    users_by_month = np.empty(user_shape + (months,))
+    current_users = np.broadcast_to(p["initial_users"], user_shape).astype(np.float64)
+    for month in range(months):
+        # 사용자 성장 (정수 절사)
+        new_users = np.trunc(current_users * p["monthly_growth_rate"])
+        churned_users = np.trunc(current_users * p["churn_rate"])
+        current_users = current_users + new_users - churned_users
+        users_by_month[..., month] = current_users
+    
+    # 수익/비용/이익은 월 축 전체를 한 번에 계산
+    def expand(value):
+        return np.asarray(value)[..., None]
+    
+    paying_users = np.trunc(users_by_month * expand(p["conversion_rate"]))
+    revenue = paying_users * expand(p["arpu"])
+    costs = expand(p["fixed_costs"]) + users_by_month * expand(p["variable_cost_per_user"]) + expand(p["marketing_cost"])
+    profit = revenue - costs
+    cumulative_profit = np.cumsum(profit, axis=-1)
+    
+    positive = cumulative_profit > 0
+    break_even_month = np.where(positive.any(axis=-1), positive.argmax(axis=-1) + 1, 0)
+    
+    total_revenue = revenue.sum(axis=-1)
+    total_costs = costs.sum(axis=-1)
+    
+    # 사용자 추이처럼 일부 축에서만 계산한 배열은 복사 없이 전체 모양의 뷰로 돌려줍니다
+    return {
+        "users": np.broadcast_to(users_by_month, shape + (months,)),
+        "revenue": np.broadcast_to(revenue, shape + (months,)),
+        "costs": np.broadcast_to(costs, shape + (months,)),
+        "profit": profit,
+        "cumulative_profit": cumulative_profit,
+        "break_even_month": break_even_month,
+        "total_revenue": np.broadcast_to(total_revenue, shape),
+        "total_costs": np.broadcast_to(total_costs, shape),
+        "roi": (total_revenue - total_costs) / total_costs * 100,
+    }
+
+def summarize_scenarios(projection: Dict[str, np.ndarray], scenarios: int, months: int) -> Dict[str, Any]:
+    """(시나리오 x 월) 추이를 p5/p50/p95 밴드와 손익분기 월 분포로 요약"""
+    
+    bands = {}
+    for key in ("users", "revenue", "profit", "cumulative_profit"):
+        p5, p50, p95 = np.percentile(projection[key], [5, 50, 95], axis=0)
+        bands[key] = {"p5": p5.tolist(), "p50": p50.tolist(), "p95": p95.tolist()}
+    
+    # 손익분기 월 분포 (0 = 기간 내 미도달)
+    break_even = projection["break_even_month"]
+    month_counts = np.bincount(break_even, minlength=months + 1)
+    probability_by_month = month_counts[1:] / scenarios
+    reached = break_even[break_even > 0]
+    
+    roi = projection["roi"]
+    return {
+        "scenarios": scenarios,
+        "months": [f"Month {month}" for month in range(1, months + 1)],
+        "bands": bands,
+        "break_even": {
+            "probability_by_month": probability_by_month.tolist(),
+            "cumulative_probability": np.cumsum(probability_by_month).tolist(),
+            "never_probability": month_counts[0] / scenarios,
+            "median_month": float(np.median(reached)) if len(reached) else None,
+        },
+        "metrics": {
+            "roi": dict(zip(("p5", "p50", "p95"), np.percentile(roi, [5, 50, 95]).tolist())),
+            "mean_roi": float(roi.mean()),
+            "total_revenue_p50": float(np.median(projection["revenue"].sum(axis=-1))),
+        },
+    }
+
+def persona_to_dict(persona: CustomerPersona) -> Dict[str, Any]:
+    """CustomerPersona를 dict로 변환 (PersonaTable.to_records와 같은 형식, Enum은 값으로)"""
+    return {
+        "id": persona.id,
+        "name": persona.name,
+        "age": persona.age,
+        "gender": persona.gender,
+        "occupation": persona.occupation,
+        "income_range": persona.income_range,
+        "segment": persona.segment.value,
+        "pain_points": list(persona.pain_points),
+        "needs": list(persona.needs),
+        "tech_savviness": persona.tech_savviness,
+        "price_sensitivity": persona.price_sensitivity,
+        "brand_loyalty": persona.brand_loyalty,
+        "social_influence": persona.social_influence
+    }
+
+def hypothesis_to_dict(result: HypothesisResult) -> Dict[str, Any]:
+    """HypothesisResult를 dict로 변환 (asdict의 재귀 깊은 복사 없이)"""
+    record = {
+        "hypothesis": result.hypothesis,
+        "validation_status": result.validation_status,
+        "confidence_score": result.confidence_score,
+        "supporting_evidence": list(result.supporting_evidence),
+        "contrary_evidence": list(result.contrary_evidence),
+        "recommendations": list(result.recommendations),
+        "pivot_suggestions": list(result.pivot_suggestions)
+    }
+    if result.bootstrap is not None:
+        summary = result.bootstrap
+        record["bootstrap"] = {
+            "lower_bound": summary.lower_bound,
+            "upper_bound": summary.upper_bound,
+            "confidence_level": summary.confidence_level,
+            "resamples": summary.resamples,
+            "status_probability": dict(summary.status_probability),
+            "segment_scores": {name: dict(scores) for name, scores in summary.segment_scores.items()},
+        }
+    return record
+
+def validation_status(score: float, threshold: float) -> str:
+    """신뢰 점수의 검증 상태"""
+    if score > threshold:
+        return "validated"
+    if score < 1 - threshold:
+        return "invalidated"
+    return "partial"
+
+def bootstrap_scores(persona_keys: np.ndarray, contributions: np.ndarray, resamples: int,
+                     rng: np.random.Generator) -> np.ndarray:
+    """페르소나 단위 부트스트랩 신뢰 점수 표본 (resamples,)
+    
+    같은 페르소나의 응답은 함께 뽑습니다(응답은 페르소나별로 모여 있어야 함). 페르소나별 (기여분 합, 응답 수)
+    패턴은 몇 가지뿐이므로 패턴 K개에 대한 다항 분포로 재표본 행렬(resamples x K)을 한 번에 뽑고,
+    점수는 재표본의 기여분 합 / 응답 수입니다. 비용은 응답 수가 아니라 resamples x K에 비례합니다.
+    """
+    
+    if len(persona_keys) == 0:
+        return np.full(resamples, 0.5)
+    starts = np.flatnonzero(np.concatenate([[True], persona_keys[1:] != persona_keys[:-1]]))
+    sums = np.add.reduceat(contributions, starts)
+    counts = np.diff(np.append(starts, len(persona_keys)))
+    # (합, 응답 수) 쌍을 복소수 하나로 묶어 고유 패턴을 찾습니다
+    patterns, frequency = np.unique(sums + 1j * counts, return_counts=True)
+    draws = rng.multinomial(len(starts), frequency / len(starts), size=resamples)
+    return (draws @ patterns.real) / (draws @ patterns.imag)
+
+def exact_sum(values: np.ndarray) -> Fraction:
+    """값별 개수로 구한 정확한 합계 (분수, 더하는 순서와 무관)"""
+    distinct, counts = np.unique(values, return_counts=True)
+    return sum((Fraction(value) * count for value, count in zip(distinct.tolist(), counts.tolist())), Fraction(0))
+
+def exact_total(values: np.ndarray) -> float:
+    """합계를 정확히 계산한 뒤 한 번만 반올림 (더하는 순서와 무관)
+    
+    응답 순서대로 더한 부동소수점 합계와 마지막 자리가 다를 수 있어, 임계값 경계의 점수는 검증 상태가 바뀔 수 있습니다.
+    """
+    return float(exact_sum(values))
+
+def ordered_total(values: np.ndarray, start: float = 0.0) -> float:
+    """start에서 이어서 values를 앞에서부터 차례로 더한 합계
+    
+    cumsum은 순차 누적이므로 파이썬에서 하나씩 더한 값과 비트 단위로 같습니다 (np.sum은 쌍별 합산이라 다를 수 있음).
+    """
+    if len(values) == 0:
+        return start
+    return float(np.cumsum(np.concatenate([[start], values]))[-1])
+
+# 기존 고정 패널 크기 (SimulationAPI의 기본 persona_count, 순차 검증의 기본 상한)
+DEFAULT_PANEL_SIZE = 20
+
+def sequential_bounds(n: int, total: float, total_sq: float, look: int, alpha: float) -> Tuple[float, float]:
+    """[0, 1] 값 n개의 평균에 대한 순차 신뢰 구간
+    
+    look번째 판정에 alpha * 6 / (pi^2 * look^2)를 배정하여(알파 소비) 모든 중간 판정에 걸쳐
+    전체 오류율이 alpha 이하가 되도록 하고, Hoeffding과 경험적 Bernstein 반경 중 작은 쪽을 씁니다.
+    """
+    
+    if n < 2:
+        return 0.0, 1.0
+    mean = total / n
+    variance = max(total_sq - n * mean * mean, 0.0) / (n - 1)
+    # 두 반경에 오류율을 절반씩 나눕니다
+    log_term = np.log(8 / (alpha * 6 / (np.pi ** 2 * look ** 2)))
+    hoeffding = np.sqrt(log_term / (2 * n))
+    bernstein = np.sqrt(2 * variance * log_term / n) + 7 * log_term / (3 * (n - 1))
+    radius = min(hoeffding, bernstein)
+    return max(float(mean - radius), 0.0), min(float(mean + radius), 1.0)
+
+def decode_catalog_mask(mask: int, catalog: List[str]) -> List[str]:
+    """비트마스크를 카탈로그 항목 리스트로 변환"""
+    return [item for bit, item in enumerate(catalog) if mask >> bit & 1]
+
+def encode_catalog_mask(items: List[str], catalog: List[str]) -> int:
+    """카탈로그 항목 리스트를 비트마스크로 변환"""
+    mask = 0
+    for item in items:
+        mask |= 1 << catalog.index(item)
+    return mask
+
+def persona_id(index: int) -> str:
+    """페르소나 인덱스를 ID 문자열로 변환"""
+    return f"persona_{index + 1}"
+
+def persona_index(persona_id: str) -> Optional[int]:
+    """페르소나 ID 문자열을 인덱스로 변환 (persona_id()가 만드는 형식이 아니면 None)"""
+    
+    if not isinstance(persona_id, str):
+        return None
+    prefix, _, number = persona_id.rpartition("_")
+    if prefix != "persona" or not (number.isascii() and number.isdigit()) or number[0] == "0":
+        return None
+    return int(number) - 1
+
+SEGMENTS = list(CustomerSegment)
+SENTIMENTS = list(ResponseSentiment)
+
+class StringPool:
+    """문자열(또는 키워드 튜플) 인터닝 풀"""
+    
+    def __init__(self):
+        self.values: List[Any] = []
+        self._ids: Dict[Any, int] = {}
+    
+    def intern(self, value: Any) -> int:
+        """값을 등록하고 정수 ID 반환"""
+        idx = self._ids.get(value)
+        if idx is None:
+            idx = len(self.values)
+            self._ids[value] = idx
+            self.values.append(value)
+        return idx
+    
+    def get(self, value: Any) -> Optional[int]:
+        """등록된 값의 정수 ID (없으면 None, 등록하지 않음)"""
+        return self._ids.get(value)
+    
+    def __getitem__(self, idx: int) -> Any:
+        return self.values[idx]
+    
+    def __len__(self) -> int:
+        return len(self.values)
+
+class PersonaTable:
+    """페르소나 컬럼형 저장소
+    
+    세그먼트/이름/직업 등은 정수 코드로, pain_points/needs는 카탈로그 비트마스크로 보관합니다.
+    인덱싱하거나 순회하면 CustomerPersona 행 뷰를 그때그때 생성합니다.
+    카탈로그 값과 persona_<N> 형식 ID만 표현할 수 있으며, 그 밖의 페르소나는 객체 리스트로 다룹니다.
+    """
+    
+    COLUMNS = (
+        "index", "segment", "gender", "first_name", "last_name", "age",
+        "occupation", "income_range", "pain_points", "needs",
+    ) + TRAIT_NAMES
+    
+    def __init__(self, columns: Dict[str, np.ndarray] = None):
+        if columns is None:
+            columns = {name: np.empty(0, dtype=np.int64 if name == "index" else np.int8) for name in self.COLUMNS}
+            columns["pain_points"] = np.empty(0, dtype=np.uint16)
+            columns["needs"] = np.empty(0, dtype=np.uint16)
+        self.columns = columns
+        self._positions: Dict[int, int] = None
+    
+    @staticmethod
+    def can_encode(personas: List[CustomerPersona]) -> bool:
+        """모든 페르소나를 테이블 코드로 표현할 수 있는지 (ID 형식, 카탈로그 값, int8 범위 확인)"""
+        
+        first_names = {gender: set(pool) for gender, pool in zip(GENDERS, (FIRST_NAMES_MALE, FIRST_NAMES_FEMALE))}
+        last_names, occupations, incomes = set(LAST_NAMES), set(OCCUPATIONS), set(INCOME_RANGES)
+        pain_points, needs = set(PAIN_POINT_CATALOG), set(NEED_CATALOG)
+        for p in personas:
+            if (
+                persona_index(p.id) is None
+                or p.gender not in first_names
+                or p.name[:1] not in last_names or p.name[1:] not in first_names[p.gender]
+                or p.occupation not in occupations or p.income_range not in incomes
+                or not isinstance(p.segment, CustomerSegment)
+                or not pain_points.issuperset(p.pain_points) or not needs.issuperset(p.needs)
+                or not all(isinstance(v, int) and -128 <= v <= 127
+                           for v in (p.age,) + tuple(getattr(p, trait) for trait in TRAIT_NAMES))
+            ):
+                return False
+        return True
+    
+    @classmethod
+    def from_personas(cls, personas: List[CustomerPersona]) -> "PersonaTable":
+        """CustomerPersona 리스트로부터 테이블 생성
+        
+        테이블로 표현할 수 없는 페르소나가 있으면 ValueError를 냅니다 (can_encode로 먼저 확인).
+        pain_points/needs는 카탈로그 순서로 저장됩니다.
+        """
+        
+        if not cls.can_encode(personas):
+            raise ValueError("카탈로그 밖의 값이나 persona_<N> 형식이 아닌 ID는 PersonaTable로 저장할 수 없습니다")
+        first_names = (FIRST_NAMES_MALE, FIRST_NAMES_FEMALE)
+        columns = {name: [] for name in cls.COLUMNS}
+        for p in personas:
+            gender = GENDERS.index(p.gender)
+            columns["index"].append(persona_index(p.id))
+            columns["segment"].append(SEGMENTS.index(p.segment))
+            columns["gender"].append(gender)
+            columns["last_name"].append(LAST_NAMES.index(p.name[0]))
+            columns["first_name"].append(first_names[gender].index(p.name[1:]))
+            columns["age"].append(p.age)
+            columns["occupation"].append(OCCUPATIONS.index(p.occupation))
+            columns["income_range"].append(INCOME_RANGES.index(p.income_range))
+            columns["pain_points"].append(encode_catalog_mask(p.pain_points, PAIN_POINT_CATALOG))
+            columns["needs"].append(encode_catalog_mask(p.needs, NEED_CATALOG))
+            for trait in TRAIT_NAMES:
+                columns[trait].append(getattr(p, trait))
+        
+        empty = cls().columns
+        return cls({name: np.asarray(values, dtype=empty[name].dtype) for name, values in columns.items()})
+    
+    @classmethod
+    def concat(cls, tables: List["PersonaTable"]) -> "PersonaTable":
+        """여러 테이블을 하나로 연결"""
+        if not tables:
+            return cls()
+        return cls({name: np.concatenate([t.columns[name] for t in tables]) for name in cls.COLUMNS})
+    
+    def __len__(self) -> int:
+        return len(self.columns["index"])
+    
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return PersonaTable({name: values[idx] for name, values in self.columns.items()})
+        return self.to_personas(idx, idx + 1 if idx != -1 else None)[0]
+    
+    def __iter__(self):
+        # 행 뷰는 블록 단위로 생성하여 한 번에 모든 객체를 만들지 않습니다
+        for start in range(0, len(self), 4096):
+            yield from self.to_personas(start, start + 4096)
+    
+    def take(self, positions: np.ndarray) -> "PersonaTable":
+        """지정한 행들만 담은 테이블 반환"""
+        return PersonaTable({name: values[positions] for name, values in self.columns.items()})
+    
+    @property
+    def ids(self) -> List[str]:
+        return [persona_id(i) for i in self.columns["index"].tolist()]
+    
+    @property
+    def nbytes(self) -> int:
+        return sum(values.nbytes for values in self.columns.values())
+    
+    def position_of(self, persona_id: str) -> int:
+        """페르소나 ID의 행 위치 반환 (없으면 -1)"""
+        if self._positions is None:
+            self._positions = {idx: pos for pos, idx in enumerate(self.columns["index"].tolist())}
+        return self._positions.get(persona_index(persona_id), -1)
+    
+    def to_records(self, start: int = 0, stop: int = None) -> List[Dict[str, Any]]:
+        """행 범위를 JSON 호환 dict 리스트로 변환 (asdict 없이, Enum은 값으로)"""
+        
+        first_names = (FIRST_NAMES_MALE, FIRST_NAMES_FEMALE)
+        segment_values = [segment.value for segment in SEGMENTS]
+        cols = {key: values[start:stop].tolist() for key, values in self.columns.items()}
+        
+        return [
+            {
+                "id": persona_id(cols["index"][i]),
+                "name": LAST_NAMES[cols["last_name"][i]] + first_names[cols["gender"][i]][cols["first_name"][i]],
+                "age": cols["age"][i],
+                "gender": GENDERS[cols["gender"][i]],
+                "occupation": OCCUPATIONS[cols["occupation"][i]],
+                "income_range": INCOME_RANGES[cols["income_range"][i]],
+                "segment": segment_values[cols["segment"][i]],
+                "pain_points": decode_catalog_mask(cols["pain_points"][i], PAIN_POINT_CATALOG),
+                "needs": decode_catalog_mask(cols["needs"][i], NEED_CATALOG),
+                "tech_savviness": cols["tech_savviness"][i],
+                "price_sensitivity": cols["price_sensitivity"][i],
+                "brand_loyalty": cols["brand_loyalty"][i],
+                "social_influence": cols["social_influence"][i]
+            }
+            for i in range(len(cols["index"]))
+        ]
+    
+    def to_personas(self, start: int = 0, stop: int = None) -> List[CustomerPersona]:
+        """행 범위를 CustomerPersona 리스트로 변환"""
+        
+        first_names = (FIRST_NAMES_MALE, FIRST_NAMES_FEMALE)
+        cols = {key: values[start:stop].tolist() for key, values in self.columns.items()}
+        
+        return [
+            CustomerPersona(
+                id=persona_id(cols["index"][i]),
+                name=LAST_NAMES[cols["last_name"][i]] + first_names[cols["gender"][i]][cols["first_name"][i]],
+                age=cols["age"][i],
+                gender=GENDERS[cols["gender"][i]],
+                occupation=OCCUPATIONS[cols["occupation"][i]],
+                income_range=INCOME_RANGES[cols["income_range"][i]],
+                segment=SEGMENTS[cols["segment"][i]],
+                pain_points=decode_catalog_mask(cols["pain_points"][i], PAIN_POINT_CATALOG),
+                needs=decode_catalog_mask(cols["needs"][i], NEED_CATALOG),
+                tech_savviness=cols["tech_savviness"][i],
+                price_sensitivity=cols["price_sensitivity"][i],
+                brand_loyalty=cols["brand_loyalty"][i],
+                social_influence=cols["social_influence"][i]
+            )
+            for i in range(len(cols["index"]))
+        ]
+
+class InterviewTable(Mapping):
+    """인터뷰 응답 컬럼형 저장소
+    
+    persona_id -> List[InterviewResponse] 매핑처럼 동작하며, 내부적으로는
+    페르소나 키, 인터닝된 질문/답변/키워드 묶음 ID, 감정 코드, 신뢰도를 컬럼으로 보관합니다.
+    페르소나 키는 persona_<N> 형식 ID면 인덱스(N - 1), 그 밖의 ID면 persona_ids 풀에 인터닝한 음수입니다.
+    """
+    
+    def __init__(self, pools: "InterviewTable" = None):
+        # pools를 주면 인터닝 풀을 공유하여 extend()로 복사 없이 합칠 수 있습니다
+        self.questions = pools.questions if pools is not None else StringPool()
+        self.answers = pools.answers if pools is not None else StringPool()
+        self.keyword_sets = pools.keyword_sets if pools is not None else StringPool()
+        self.persona_ids = pools.persona_ids if pools is not None else StringPool()
+        self._chunks: List[Dict[str, np.ndarray]] = []
+        self._columns: Dict[str, np.ndarray] = None
+        self._grouping = None
+        self._lookup = None
+        # 행이 있는 페르소나 인덱스 (__setitem__에서 처음 필요할 때 구성)
+        self._persona_keys: set = None
+    
+    def append_rows(self, persona: np.ndarray, question: Any, answer: Any,
+                    sentiment: Any, confidence: Any, keywords: Any) -> None:
+        """응답 행을 일괄 추가 (persona 외 인자는 배열 또는 스칼라 코드)"""
+        
+        n = len(persona)
+        self._chunks.append({
+            "persona": np.asarray(persona, dtype=np.int64),
+            "question": np.broadcast_to(np.asarray(question, dtype=np.int32), (n,)),
+            "answer": np.broadcast_to(np.asarray(answer, dtype=np.int32), (n,)),
+            "sentiment": np.broadcast_to(np.asarray(sentiment, dtype=np.int8), (n,)),
+            "confidence": np.broadcast_to(np.asarray(confidence, dtype=np.float64), (n,)),
+            "keywords": np.broadcast_to(np.asarray(keywords, dtype=np.int16), (n,)),
+        })
+        self._columns = None
+        self._grouping = None
+        if self._persona_keys is not None:
+            self._persona_keys.update(self._chunks[-1]["persona"].tolist())
+    
+    def extend(self, other: "InterviewTable") -> None:
+        """인터닝 풀을 공유하는 다른 테이블의 행을 추가"""
+        
+        if other.answers is not self.answers:
+            raise ValueError("인터닝 풀을 공유하는 테이블만 합칠 수 있습니다")
+        self._chunks.extend(other._chunks)
+        self._columns = None
+        self._grouping = None
+        self._lookup = None
+        self._persona_keys = None
+    
+    def persona_key(self, persona_id: str, create: bool = True) -> Optional[int]:
+        """페르소나 ID의 정수 키 (create=False이면 처음 보는 ID는 등록하지 않고 None)"""
+        
+        key = persona_index(persona_id)
+        if key is not None:
+            return key
+        idx = self.persona_ids.intern(persona_id) if create else self.persona_ids.get(persona_id)
+        return None if idx is None else -1 - idx
+    
+    def persona_id_of(self, key: int) -> str:
+        """정수 키를 페르소나 ID로 변환"""
+        return persona_id(key) if key >= 0 else self.persona_ids[-1 - key]
+    
+    def add(self, persona_id: str, responses: List[InterviewResponse]) -> None:
+        """한 페르소나의 InterviewResponse 리스트 추가"""
+        
+        self.append_rows(
+            np.full(len(responses), self.persona_key(persona_id), dtype=np.int64),
+            [self.questions.intern(r.question) for r in responses],
+            [self.answers.intern(r.answer) for r in responses],
+            [SENTIMENTS.index(r.sentiment) for r in responses],
+            [r.confidence for r in responses],
+            [self.keyword_sets.intern(tuple(r.keywords)) for r in responses],
+        )
+    
+    def __setitem__(self, persona_id: str, responses: List[InterviewResponse]) -> None:
+        """dict와 같은 방식(interview_results[persona.id] = responses)으로 추가
+        
+        이미 응답이 있는 페르소나면 dict처럼 기존 응답을 교체하며, 페르소나 순서(첫 등장 위치)는 유지합니다.
+        """
+        
+        key = self.persona_key(persona_id)
+        if self._persona_keys is None:
+            self._persona_keys = set(np.unique(self.columns["persona"]).tolist())
+        if key not in self._persona_keys:
+            self.add(persona_id, responses)
+            return
+        
+        replacement = InterviewTable(pools=self)
+        replacement.add(persona_id, responses)
+        columns = self.columns
+        existing = columns["persona"] == key
+        first = int(np.argmax(existing))
+        # 첫 기존 행 자리에 새 응답을 넣고 나머지 기존 행은 지웁니다
+        self._chunks = [{
+            name: np.concatenate([values[:first], replacement.columns[name], values[first:][~existing[first:]]])
+            for name, values in columns.items()
+        }]
+        self._columns = None
+        self._grouping = None
+        self._lookup = None
+    
+    @classmethod
+    def from_responses(cls, interview_results: Dict[str, List[InterviewResponse]]) -> "InterviewTable":
+        """기존 dict 형태의 인터뷰 결과로부터 테이블 생성"""
+        table = cls()
+        for pid, responses in interview_results.items():
+            table.add(pid, responses)
+        return table
+    
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        """청크를 하나로 합친 컬럼 배열"""
+        if self._columns is None:
+            if self._chunks:
+                names = self._chunks[0].keys()
+                self._columns = {name: np.concatenate([c[name] for c in self._chunks]) for name in names}
+                self._chunks = [self._columns]
+            else:
+                self._columns = {
+                    "persona": np.empty(0, dtype=np.int64),
+                    "question": np.empty(0, dtype=np.int32),
+                    "answer": np.empty(0, dtype=np.int32),
+                    "sentiment": np.empty(0, dtype=np.int8),
+                    "confidence": np.empty(0, dtype=np.float64),
+                    "keywords": np.empty(0, dtype=np.int16),
+                }
+        return self._columns
+    
+    @property
+    def num_rows(self) -> int:
+        return sum(len(c["persona"]) for c in self._chunks)
+    
+    @property
+    def nbytes(self) -> int:
+        return sum(values.nbytes for values in self.columns.values())
+    
+    def grouping(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """페르소나 첫 등장 순서로 정렬한 (페르소나 키, 행 순서, 그룹 경계) 반환"""
+        
+        if self._grouping is None:
+            persona = self.columns["persona"]
+            keys, first, inverse = np.unique(persona, return_index=True, return_inverse=True)
+            # 첫 등장 순서 = dict 삽입 순서
+            appearance = np.argsort(first, kind="stable")
+            rank = np.empty(len(keys), dtype=np.int64)
+            rank[appearance] = np.arange(len(keys))
+            order = np.argsort(rank[inverse], kind="stable")
+            counts = np.bincount(rank[inverse], minlength=len(keys))
+            offsets = np.concatenate([[0], np.cumsum(counts)])
+            self._grouping = (keys[appearance], order, offsets)
+            self._lookup = (keys, rank)
+        return self._grouping
+    
+    def rows(self, positions: np.ndarray) -> List[InterviewResponse]:
+        """행 위치들을 InterviewResponse 행 뷰로 변환"""
+        
+        cols = {name: self.columns[name][positions].tolist() for name in
+                ("question", "answer", "sentiment", "confidence", "keywords")}
+        return [
+            InterviewResponse(
+                question=self.questions[cols["question"][i]],
+                answer=self.answers[cols["answer"][i]],
+                sentiment=SENTIMENTS[cols["sentiment"][i]],
+                confidence=cols["confidence"][i],
+                keywords=list(self.keyword_sets[cols["keywords"][i]])
+            )
+            for i in range(len(cols["question"]))
+        ]
+    
+    def to_records(self) -> Dict[str, List[Dict[str, Any]]]:
+        """persona_id -> 응답 dict 리스트로 변환 (asdict 없이, Enum은 값으로)"""
+        
+        keys, order, offsets = self.grouping()
+        columns = self.columns
+        questions = columns["question"][order].tolist()
+        answers = columns["answer"][order].tolist()
+        sentiments = columns["sentiment"][order].tolist()
+        confidences = columns["confidence"][order].tolist()
+        keywords = columns["keywords"][order].tolist()
+        sentiment_values = [sentiment.value for sentiment in SENTIMENTS]
+        
+        def record(i: int) -> Dict[str, Any]:
+            return {
+                "question": self.questions[questions[i]],
+                "answer": self.answers[answers[i]],
+                "sentiment": sentiment_values[sentiments[i]],
+                "confidence": confidences[i],
+                "keywords": list(self.keyword_sets[keywords[i]])
+            }
+        
+        bounds = offsets.tolist()
+        return {
+            self.persona_id_of(key): [record(i) for i in range(bounds[g], bounds[g + 1])]
+            for g, key in enumerate(keys.tolist())
+        }
+    
+    def __getitem__(self, persona_id: str) -> List[InterviewResponse]:
+        _, order, offsets = self.grouping()
+        sorted_keys, rank = self._lookup
+        key = self.persona_key(persona_id, create=False)
+        if key is None:
+            raise KeyError(persona_id)
+        pos = np.searchsorted(sorted_keys, key)
+        if pos >= len(sorted_keys) or sorted_keys[pos] != key:
+            raise KeyError(persona_id)
+        g = rank[pos]
+        return self.rows(order[offsets[g]:offsets[g + 1]])
+    
+    def __iter__(self):
+        keys, _, _ = self.grouping()
+        return (self.persona_id_of(k) for k in keys.tolist())
+    
+    def __len__(self) -> int:
+        return len(self.grouping()[0])
+    
+    def items(self):
+        keys, order, offsets = self.grouping()
+        for g, key in enumerate(keys.tolist()):
+            yield self.persona_id_of(key), self.rows(order[offsets[g]:offsets[g + 1]])
 
 class SimulationEngine:
     """시뮬레이션 엔진 클래스"""
     
-    def __init__(self, bmc_data: Dict, market_data: Dict = None):
+    def __init__(self, bmc_data: Dict, market_data: Dict = None, columnar: bool = False,
+                 seed: int = None, rng: np.random.Generator = None,
+                 instrumentation: Instrumentation = None):
         self.bmc_data = bmc_data
+        # 단계별 계측기 (None이면 계측하지 않음)
+        self.instrumentation = instrumentation
+        # 모든 난수는 엔진 전용 Generator에서 뽑습니다 (같은 seed면 같은 결과)
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
         self.market_data = market_data or self._get_default_market_data()
-        self.personas: List[CustomerPersona] = []
-        self.interview_results: Dict[str, List[InterviewResponse]] = {}
-        
+        # columnar=True이면 페르소나/인터뷰 결과를 컬럼형 테이블에 보관합니다
+        self.columnar = columnar
+        self.personas: List[CustomerPersona] = PersonaTable() if columnar else []
+        self.interview_results: Dict[str, List[InterviewResponse]] = InterviewTable() if columnar else {}
+    
+    def _choice(self, items: List[Any]) -> Any:
+        """항목 하나를 균등 선택"""
+        return items[int(self.rng.integers(len(items)))]
+    
+    def _randint(self, low: int, high: int) -> int:
+        """[low, high] 구간의 정수 선택"""
+        return int(self.rng.integers(low, high + 1))
+    
+    def _sample(self, items: List[Any], k: int) -> List[Any]:
+        """비복원 추출"""
+        return [items[i] for i in self.rng.choice(len(items), size=k, replace=False)]
+    
     def _get_default_market_data(self) -> Dict:
         """기본 시장 데이터 생성"""
         return {
@@ -82,33 +1004,41 @@ class SimulationEngine:
             "lifetime_value": 300000,
         }
     
-    def generate_personas(self, count: int = 10) -> List[CustomerPersona]:
-        """고객 페르소나 생성"""
+    @instrumented("personas", items="count")
+    def generate_personas(self, count: int = 10, batched: bool = False) -> List[CustomerPersona]:
+        """고객 페르소나 생성
+        
+        batched=True이면 모든 속성을 NumPy 배열로 한 번에 뽑은 뒤 CustomerPersona로 변환합니다.
+        이때 pain_points/needs는 추출 순서가 아니라 카탈로그 순서로 나옵니다 (뽑힌 항목의 분포는 같음).
+        컬럼형 엔진에서는 PersonaTable을 반환합니다.
+        """
+        
+        if self.columnar:
+            self.personas = PersonaTable(self.generate_persona_arrays(count))
+            return self.personas
+        
+        if batched:
+            personas = PersonaTable(self.generate_persona_arrays(count)).to_personas()
+            self.personas = personas
+            return personas
         
         # 한국 이름 풀
-        last_names = ["김", "이", "박", "최", "정", "강", "조", "윤", "장", "임"]
-        first_names_male = ["민준", "서준", "도윤", "예준", "시우", "하준", "주원", "지호", "지후", "준서"]
-        first_names_female = ["서연", "서윤", "지우", "서현", "민서", "하은", "하윤", "지유", "윤서", "채원"]
+        last_names = LAST_NAMES
+        first_names_male = FIRST_NAMES_MALE
+        first_names_female = FIRST_NAMES_FEMALE
         
         # 직업 풀
-        occupations = [
-            "스타트업 개발자", "마케팅 매니저", "프리랜서 디자이너", 
-            "중소기업 팀장", "대기업 사원", "학생", "자영업자",
-            "컨설턴트", "연구원", "교사"
-        ]
+        occupations = OCCUPATIONS
         
         # 소득 구간
-        income_ranges = [
-            "2000만원 이하", "2000-3000만원", "3000-4000만원",
-            "4000-5000만원", "5000-7000만원", "7000만원-1억원", "1억원 이상"
-        ]
+        income_ranges = INCOME_RANGES
         
         personas = []
-        segment_distribution = [0.025, 0.135, 0.34, 0.34, 0.16]  # Rogers' Innovation Adoption Curve
+        segment_distribution = SEGMENT_DISTRIBUTION
         
         for i in range(count):
             # 세그먼트 결정
-            segment_roll = random.random()
+            segment_roll = self.rng.random()
             cumulative = 0
             segment_idx = 0
             for idx, prob in enumerate(segment_distribution):
@@ -120,39 +1050,39 @@ class SimulationEngine:
             segment = list(CustomerSegment)[segment_idx]
             
             # 성별과 이름 결정
-            gender = random.choice(["남성", "여성"])
+            gender = self._choice(GENDERS)
             if gender == "남성":
-                first_name = random.choice(first_names_male)
+                first_name = self._choice(first_names_male)
             else:
-                first_name = random.choice(first_names_female)
+                first_name = self._choice(first_names_female)
             
-            name = random.choice(last_names) + first_name
+            name = self._choice(last_names) + first_name
             
             # 나이 (세그먼트에 따라 다른 분포)
             if segment == CustomerSegment.INNOVATOR:
-                age = int(np.random.normal(28, 5))
+                age = int(self.rng.normal(28, 5))
             elif segment == CustomerSegment.EARLY_ADOPTER:
-                age = int(np.random.normal(32, 6))
+                age = int(self.rng.normal(32, 6))
             else:
-                age = int(np.random.normal(38, 8))
+                age = int(self.rng.normal(38, 8))
             age = max(20, min(65, age))  # 20-65세로 제한
             
             # 특성 점수 (세그먼트에 따라 조정)
             if segment in [CustomerSegment.INNOVATOR, CustomerSegment.EARLY_ADOPTER]:
-                tech_savviness = random.randint(7, 10)
-                price_sensitivity = random.randint(3, 7)
-                brand_loyalty = random.randint(2, 6)
-                social_influence = random.randint(6, 10)
+                tech_savviness = self._randint(7, 10)
+                price_sensitivity = self._randint(3, 7)
+                brand_loyalty = self._randint(2, 6)
+                social_influence = self._randint(6, 10)
             elif segment in [CustomerSegment.EARLY_MAJORITY, CustomerSegment.LATE_MAJORITY]:
-                tech_savviness = random.randint(4, 7)
-                price_sensitivity = random.randint(5, 9)
-                brand_loyalty = random.randint(5, 8)
-                social_influence = random.randint(4, 7)
+                tech_savviness = self._randint(4, 7)
+                price_sensitivity = self._randint(5, 9)
+                brand_loyalty = self._randint(5, 8)
+                social_influence = self._randint(4, 7)
             else:  # LAGGARD
-                tech_savviness = random.randint(1, 4)
-                price_sensitivity = random.randint(7, 10)
-                brand_loyalty = random.randint(6, 10)
-                social_influence = random.randint(2, 5)
+                tech_savviness = self._randint(1, 4)
+                price_sensitivity = self._randint(7, 10)
+                brand_loyalty = self._randint(6, 10)
+                social_influence = self._randint(2, 5)
             
             # Pain points와 needs 생성
             pain_points = self._generate_pain_points()
@@ -163,11 +1093,11 @@ class SimulationEngine:
                 name=name,
                 age=age,
                 gender=gender,
-                occupation=random.choice(occupations),
-                income_range=random.choice(income_ranges),
+                occupation=self._choice(occupations),
+                income_range=self._choice(income_ranges),
                 segment=segment,
-                pain_points=random.sample(pain_points, k=random.randint(2, 4)),
-                needs=random.sample(needs, k=random.randint(2, 4)),
+                pain_points=self._sample(pain_points, k=self._randint(2, 4)),
+                needs=self._sample(needs, k=self._randint(2, 4)),
                 tech_savviness=tech_savviness,
                 price_sensitivity=price_sensitivity,
                 brand_loyalty=brand_loyalty,
@@ -179,216 +1109,464 @@ class SimulationEngine:
         self.personas = personas
         return personas
     
+    @instrumented("personas", items="count")
+    def generate_persona_arrays(self, count: int, start: int = 0) -> Dict[str, np.ndarray]:
+        """페르소나 속성을 컬럼 배열로 일괄 생성
+        
+        세그먼트별 파라미터 테이블을 인덱싱하여 모든 속성을 한 번에 뽑습니다.
+        pain_points/needs는 카탈로그 순서 기준 비트마스크로 반환합니다.
+        """
+        
+        # 세그먼트 결정 (누적 확률 탐색과 동일, 범위를 벗어나면 0번 세그먼트)
+        cumulative = np.cumsum(SEGMENT_DISTRIBUTION)
+        segment = np.searchsorted(cumulative, self.rng.random(count), side="right")
+        segment[segment >= len(cumulative)] = 0
+        
+        # 성별과 이름 (0: 남성, 1: 여성)
+        gender = self.rng.integers(0, len(GENDERS), size=count)
+        first_name = self.rng.integers(0, len(FIRST_NAMES_MALE), size=count)
+        last_name = self.rng.integers(0, len(LAST_NAMES), size=count)
+        
+        # 나이 (세그먼트별 정규분포, int() 절사 후 20-65세로 제한)
+        age_params = SEGMENT_AGE_PARAMS[segment]
+        age = np.trunc(self.rng.normal(age_params[:, 0], age_params[:, 1]))
+        age = np.clip(age, 20, 65)
+        
+        # 특성 점수 (세그먼트별 [low, high] 균등 정수)
+        trait_ranges = SEGMENT_TRAIT_RANGES[segment]
+        traits = self.rng.integers(trait_ranges[:, :, 0], trait_ranges[:, :, 1] + 1)
+        
+        columns = {
+            "index": np.arange(start, start + count, dtype=np.int64),
+            "segment": segment.astype(np.int8),
+            "gender": gender.astype(np.int8),
+            "first_name": first_name.astype(np.int8),
+            "last_name": last_name.astype(np.int8),
+            "age": age.astype(np.int8),
+            "occupation": self.rng.integers(0, len(OCCUPATIONS), size=count).astype(np.int8),
+            "income_range": self.rng.integers(0, len(INCOME_RANGES), size=count).astype(np.int8),
+            "pain_points": self._draw_catalog_masks(count, len(PAIN_POINT_CATALOG)),
+            "needs": self._draw_catalog_masks(count, len(NEED_CATALOG)),
+        }
+        for trait_idx, trait in enumerate(TRAIT_NAMES):
+            columns[trait] = traits[:, trait_idx].astype(np.int8)
+        
+        return columns
+    
+    def _draw_catalog_masks(self, count: int, catalog_size: int) -> np.ndarray:
+        """카탈로그에서 2-4개를 비복원 추출한 결과를 비트마스크로 생성"""
+        
+        # 행마다 무작위 키를 정렬한 앞쪽 k개를 고르면 random.sample과 같은 분포가 됩니다
+        order = np.argsort(self.rng.random((count, catalog_size)), axis=1)[:, :4].astype(np.uint16)
+        k = self.rng.integers(2, 5, size=count)
+        bits = np.left_shift(np.uint16(1), order)
+        bits[np.arange(4) >= k[:, None]] = 0
+        return np.bitwise_or.reduce(bits, axis=1)
+    
     def _generate_pain_points(self) -> List[str]:
         """Pain points 생성"""
-        return [
-            "업무 효율성 저하",
-            "협업 도구의 분산",
-            "데이터 관리 어려움",
-            "커뮤니케이션 단절",
-            "반복적인 수작업",
-            "비용 증가",
-            "시간 낭비",
-            "정보 접근성 부족",
-            "품질 관리 어려움",
-            "확장성 부족"
-        ]
+        return list(PAIN_POINT_CATALOG)
     
     def _generate_needs(self) -> List[str]:
         """Needs 생성"""
-        return [
-            "통합 관리 솔루션",
-            "자동화 기능",
-            "실시간 협업",
-            "데이터 분석",
-            "모바일 접근성",
-            "사용자 친화적 인터페이스",
-            "보안 강화",
-            "커스터마이징 옵션",
-            "합리적 가격",
-            "빠른 고객 지원"
-        ]
+        return list(NEED_CATALOG)
     
+    @instrumented("interviews", items=lambda self, persona, questions: len(questions))
     def conduct_interviews(self, persona: CustomerPersona, questions: List[str]) -> List[InterviewResponse]:
         """가상 인터뷰 수행"""
         responses = []
         
         for question in questions:
-            # 질문 유형 분석
-            question_lower = question.lower()
+            # 질문 유형 분석 후 해당 규칙으로 응답 생성
+            category = classify_question(question)
+            responses.append(self._generate_tiered_response(category, persona, question))
+        
+        self.interview_results[persona.id] = responses
+        return responses
+    
+    @instrumented("interviews", items=lambda self, personas, questions, into=None: len(personas) * len(questions))
+    def interview_panel(self, personas: PersonaTable, questions: List[str],
+                        into: InterviewTable = None) -> InterviewTable:
+        """패널 전체를 대상으로 질문 단위 일괄 인터뷰 수행
+        
+        질문은 한 번만 분류하고, 감정/신뢰도/답변은 특성 컬럼에 대한 벡터 마스크로 한 번에 결정합니다.
+        결과는 interview_results(InterviewTable)에 추가되며, into를 주면 해당 테이블에 대신 기록합니다.
+        """
+        
+        if into is None:
+            if not isinstance(self.interview_results, InterviewTable):
+                self.interview_results = InterviewTable.from_responses(self.interview_results)
+            into = self.interview_results
+        table = into
+        
+        if not isinstance(personas, PersonaTable):
+            if not PersonaTable.can_encode(personas):
+                # 카탈로그 밖의 값이 있는 페르소나는 기존 방식대로 한 명씩 인터뷰합니다
+                for persona in personas:
+                    table.add(persona.id, [self._generate_tiered_response(classify_question(q), persona, q)
+                                           for q in questions])
+                return table
+            personas = PersonaTable.from_personas(personas)
+        
+        n = len(personas)
+        for question in questions:
+            rule = RESPONSE_RULES[classify_question(question)]
+            tiers = rule["tiers"]
             
-            # 가격 관련 질문
-            if "가격" in question_lower or "비용" in question_lower or "구독" in question_lower:
-                response = self._generate_price_response(persona, question)
-            # 기능 관련 질문
-            elif "기능" in question_lower or "특징" in question_lower:
-                response = self._generate_feature_response(persona, question)
-            # 경쟁사 관련 질문
-            elif "경쟁" in question_lower or "비교" in question_lower:
-                response = self._generate_competition_response(persona, question)
-            # 마케팅 채널 관련 질문
-            elif "어떻게" in question_lower and "알게" in question_lower:
-                response = self._generate_discovery_response(persona, question)
+            # 특성 값으로 응답 티어 결정
+            if rule["trait"] is None:
+                tier = np.zeros(n, dtype=np.int64)
+            elif rule["direction"] == "above":
+                values = personas.columns[rule["trait"]]
+                tier = (values[:, None] <= np.asarray(rule["cutoffs"])).sum(axis=1)
             else:
-                response = self._generate_general_response(persona, question)
+                values = personas.columns[rule["trait"]]
+                tier = (values[:, None] >= np.asarray(rule["cutoffs"])).sum(axis=1)
             
-            responses.append(response)
+            # 티어별 답변 후보 중 하나를 균등 선택
+            answer_counts = np.array([len(answers) for _, _, answers in tiers])
+            answer_ids = np.full((len(tiers), answer_counts.max()), -1, dtype=np.int32)
+            for t, (_, _, answers) in enumerate(tiers):
+                answer_ids[t, :len(answers)] = [table.answers.intern(a) for a in answers]
+            choice = (self.rng.random(n) * answer_counts[tier]).astype(np.int64)
+            
+            table.append_rows(
+                personas.columns["index"],
+                table.questions.intern(question),
+                answer_ids[tier, choice],
+                np.array([SENTIMENTS.index(sentiment) for sentiment, _, _ in tiers])[tier],
+                np.array([confidence for _, confidence, _ in tiers])[tier],
+                table.keyword_sets.intern(tuple(rule["keywords"])),
+            )
         
-        self.interview_results[persona.id] = responses
-        return responses
+        return table
     
-    def _generate_price_response(self, persona: CustomerPersona, question: str) -> InterviewResponse:
-        """가격 관련 응답 생성"""
+    def _generate_tiered_response(self, category: str, persona: CustomerPersona, question: str) -> InterviewResponse:
+        """RESPONSE_RULES 테이블에 따라 단일 응답 생성"""
         
-        if persona.price_sensitivity > 7:
-            sentiment = ResponseSentiment.NEGATIVE
-            answers = [
-                "가격이 부담스러워요. 더 저렴한 대안을 찾고 있습니다.",
-                "무료 버전이나 체험판을 먼저 써보고 싶네요.",
-                "현재 예산으로는 어려울 것 같습니다."
-            ]
-            confidence = 0.3
-        elif persona.price_sensitivity > 4:
-            sentiment = ResponseSentiment.NEUTRAL
-            answers = [
-                "가치가 명확하다면 고려해볼 수 있습니다.",
-                "경쟁사와 비교해보고 결정하겠습니다.",
-                "팀과 상의가 필요할 것 같아요."
-            ]
-            confidence = 0.6
-        else:
-            sentiment = ResponseSentiment.POSITIVE
-            answers = [
-                "합리적인 가격이라고 생각합니다.",
-                "제공되는 가치를 고려하면 적절한 것 같아요.",
-                "투자할 가치가 있다고 봅니다."
-            ]
-            confidence = 0.8
+        rule = RESPONSE_RULES[category]
+        tier = 0
+        if rule["trait"] is not None:
+            value = getattr(persona, rule["trait"])
+            for cutoff in rule["cutoffs"]:
+                if (value > cutoff) if rule["direction"] == "above" else (value < cutoff):
+                    break
+                tier += 1
+        sentiment, confidence, answers = rule["tiers"][tier]
         
         return InterviewResponse(
             question=question,
-            answer=random.choice(answers),
+            answer=self._choice(answers),
             sentiment=sentiment,
             confidence=confidence,
-            keywords=["가격", "비용", "예산", "가치"]
+            keywords=list(rule["keywords"])
         )
     
+    def _generate_price_response(self, persona: CustomerPersona, question: str) -> InterviewResponse:
+        """가격 관련 응답 생성"""
+        return self._generate_tiered_response("price", persona, question)
+    
     def _generate_feature_response(self, persona: CustomerPersona, question: str) -> InterviewResponse:
         """기능 관련 응답 생성"""
-        
-        if persona.tech_savviness > 7:
-            answers = [
-                "고급 기능과 커스터마이징 옵션이 중요합니다.",
-                "API 연동과 자동화 기능이 필수적이에요.",
-                "데이터 분석과 인사이트 기능을 중시합니다."
-            ]
-            sentiment = ResponseSentiment.POSITIVE
-        else:
-            answers = [
-                "사용하기 쉬운 인터페이스가 가장 중요해요.",
-                "기본 기능만 잘 작동하면 됩니다.",
-                "복잡한 기능보다는 안정성이 중요합니다."
-            ]
-            sentiment = ResponseSentiment.NEUTRAL
-        
-        return InterviewResponse(
-            question=question,
-            answer=random.choice(answers),
-            sentiment=sentiment,
-            confidence=0.7,
-            keywords=["기능", "인터페이스", "사용성"]
-        )
+        return self._generate_tiered_response("feature", persona, question)
     
     def _generate_competition_response(self, persona: CustomerPersona, question: str) -> InterviewResponse:
         """경쟁사 관련 응답 생성"""
-        
-        if persona.brand_loyalty > 7:
-            answers = [
-                "현재 사용 중인 도구에 만족하고 있어서 바꾸기 어려워요.",
-                "전환 비용과 학습 곡선을 고려해야 합니다.",
-                "팀원들의 적응 기간이 걱정됩니다."
-            ]
-            sentiment = ResponseSentiment.NEGATIVE
-        else:
-            answers = [
-                "더 나은 솔루션이라면 언제든 전환할 의향이 있습니다.",
-                "차별화된 가치가 있다면 시도해볼 만해요.",
-                "경쟁사 대비 장점이 명확하네요."
-            ]
-            sentiment = ResponseSentiment.POSITIVE
-        
-        return InterviewResponse(
-            question=question,
-            answer=random.choice(answers),
-            sentiment=sentiment,
-            confidence=0.6,
-            keywords=["경쟁", "차별화", "전환"]
-        )
+        return self._generate_tiered_response("competition", persona, question)
     
     def _generate_discovery_response(self, persona: CustomerPersona, question: str) -> InterviewResponse:
         """발견 채널 관련 응답 생성"""
+        return self._generate_tiered_response("discovery", persona, question)
+    
+    def _generate_general_response(self, persona: CustomerPersona, question: str) -> InterviewResponse:
+        """일반 응답 생성"""
+        return self._generate_tiered_response("general", persona, question)
+    
+    def validate_hypothesis(self, hypothesis: str, threshold: float = 0.6, bootstrap: int = 0,
+                            confidence_level: float = 0.95, exact: bool = False) -> HypothesisResult:
+        """가설 검증"""
+        return self.validate_hypotheses([hypothesis], threshold, bootstrap, confidence_level, exact)[0]
+    
+    @instrumented("validation", items=lambda self, hypotheses, *args, **kwargs: len(hypotheses))
+    def validate_hypotheses(self, hypotheses: List[str], threshold: float = 0.6, bootstrap: int = 0,
+                            confidence_level: float = 0.95, exact: bool = False) -> List[HypothesisResult]:
+        """여러 가설을 한 번에 검증
         
-        if persona.age < 30:
-            channels = ["인스타그램", "유튜브", "링크드인", "페이스북"]
-        elif persona.age < 40:
-            channels = ["구글 검색", "동료 추천", "업계 커뮤니티", "웨비나"]
-        else:
-            channels = ["업계 전문지", "컨퍼런스", "파트너사 소개", "이메일 뉴스레터"]
+        페르소나 ID 인덱스와 키워드 -> 응답 역색인을 한 번만 만들고 모든 가설을 채점합니다.
+        응답 순회 순서와 신뢰도 누적 순서는 단일 가설 검증과 동일합니다.
+        bootstrap(재표본 수)을 주면 결과의 bootstrap에 신뢰 구간과 세그먼트별 점수를 담습니다.
+        exact=True이면 신뢰도 합계를 순서와 무관한 정확한 합계로 구합니다. 기존 점수와 마지막 자리가
+        달라질 수 있고 임계값 경계에서는 검증 상태도 바뀔 수 있으므로 기본값은 순서대로 더한 합계입니다.
+        """
+        return list(self.iter_hypothesis_results(hypotheses, threshold, bootstrap, confidence_level, exact))
+    
+    def iter_hypothesis_results(self, hypotheses: List[str], threshold: float = 0.6, bootstrap: int = 0,
+                                confidence_level: float = 0.95, exact: bool = False) -> Iterator[HypothesisResult]:
+        """가설별 검증 결과를 하나씩 생성 (인덱스는 처음 한 번만 구성)"""
         
-        answer = f"{random.choice(channels)}을(를) 통해 알게 되었습니다."
+        with stage_context(self.instrumentation, "validation"):
+            index = self._build_response_index()
         
-        return InterviewResponse(
-            question=question,
-            answer=answer,
-            sentiment=ResponseSentiment.NEUTRAL,
-            confidence=0.8,
-            keywords=["마케팅", "채널", "발견"]
+        for hypothesis in hypotheses:
+            # 측정 구간은 yield 전에 닫아 소비하는 쪽의 처리 시간이 섞이지 않도록 합니다
+            with stage_context(self.instrumentation, "validation", 1):
+                rows = self._matching_rows(index, hypothesis)
+                
+                response_count = len(rows)
+                contributions = index["contribution"][rows]
+                # 기본은 응답 순서대로 더한 합계 (한 번에 하나씩 더하던 기존 점수와 비트 단위로 같음)
+                total_confidence = exact_total(contributions) if exact else ordered_total(contributions)
+                
+                sentiment = index["sentiment"][rows]
+                supporting = [index["evidence"](r) for r in rows[sentiment == SENTIMENTS.index(ResponseSentiment.POSITIVE)][:5]]
+                contrary_rows = rows[sentiment == SENTIMENTS.index(ResponseSentiment.NEGATIVE)]
+                contrary = [index["evidence"](r) for r in contrary_rows[:5]]
+                
+                result = self._build_hypothesis_result(
+                    hypothesis, threshold, total_confidence, response_count, supporting, contrary
+                )
+                if bootstrap:
+                    result.bootstrap = self._bootstrap_summary(index, rows, result.confidence_score, threshold,
+                                                               bootstrap, confidence_level)
+            yield result
+    
+    def _matching_rows(self, index: Dict[str, Any], hypothesis: str) -> np.ndarray:
+        """가설과 관련된 응답 위치 (응답 키워드 중 하나라도 가설에 포함, 응답 순회 순서)"""
+        
+        matched_sets = np.zeros(index["num_keyword_sets"], dtype=bool)
+        for keyword in index["matcher"].matches(hypothesis):
+            matched_sets[index["sets_by_keyword"][keyword]] = True
+        return np.flatnonzero(matched_sets[index["keyword_set"]])
+    
+    def _bootstrap_summary(self, index: Dict[str, Any], rows: np.ndarray, score: float, threshold: float,
+                           resamples: int, confidence_level: float) -> BootstrapSummary:
+        """관련 응답의 페르소나 단위 부트스트랩 신뢰 구간, 상태 확률, 세그먼트별 점수"""
+        
+        quantiles = [(1 - confidence_level) / 2, (1 + confidence_level) / 2]
+        keys = index["persona_keys"]()[rows]
+        contributions = index["contribution"][rows]
+        
+        samples = bootstrap_scores(keys, contributions, resamples, self.rng)
+        lower, upper = np.quantile(samples, quantiles)
+        validated = int(np.count_nonzero(samples > threshold))
+        invalidated = int(np.count_nonzero(samples < 1 - threshold))
+        
+        segment_scores = {}
+        segments = index["persona_segments"](keys)
+        for seg_idx, seg in enumerate(SEGMENTS):
+            in_segment = segments == seg_idx
+            if not in_segment.any():
+                continue
+            # 세그먼트 점수도 세그먼트의 응답만 검증한 것과 같도록 응답 순서대로 더합니다
+            total = ordered_total(contributions[in_segment])
+            seg_lower, seg_upper = np.quantile(
+                bootstrap_scores(keys[in_segment], contributions[in_segment], resamples, self.rng), quantiles
+            )
+            segment_scores[seg.value] = {
+                "score": total / int(in_segment.sum()),
+                "lower_bound": float(seg_lower),
+                "upper_bound": float(seg_upper),
+                "responses": int(in_segment.sum()),
+            }
+        
+        return BootstrapSummary(
+            lower_bound=float(lower),
+            upper_bound=float(upper),
+            confidence_level=confidence_level,
+            resamples=resamples,
+            status_probability={
+                "validated": validated / resamples,
+                "partial": (resamples - validated - invalidated) / resamples,
+                "invalidated": invalidated / resamples,
+            },
+            segment_scores=segment_scores
         )
     
-    def _generate_general_response(self, persona: CustomerPersona, question: str) -> InterviewResponse:
-        """일반 응답 생성"""
+    def validate_hypothesis_sequential(self, hypothesis: str, questions: List[str] = None, threshold: float = 0.6,
+                                       batch_size: int = 5, max_personas: int = DEFAULT_PANEL_SIZE,
+                                       alpha: float = 0.05) -> SequentialValidationResult:
+        """단일 가설 순차 검증"""
+        return self.validate_hypotheses_sequential([hypothesis], questions, threshold, batch_size, max_personas, alpha)[0]
+    
+    def validate_hypotheses_sequential(self, hypotheses: List[str], questions: List[str] = None,
+                                       threshold: float = 0.6, batch_size: int = 5,
+                                       max_personas: int = DEFAULT_PANEL_SIZE,
+                                       alpha: float = 0.05) -> List[SequentialValidationResult]:
+        """페르소나를 batch_size명씩 인터뷰하며 판정이 확정된 가설부터 검증을 멈추는 순차 검증
+        
+        가설별 신뢰 점수(페르소나별 관련 응답 기여분 평균)의 순차 신뢰 구간이 threshold 위(validated),
+        1 - threshold 아래(invalidated), 또는 그 사이(partial)에 완전히 들어가면 판정을 확정합니다.
+        경계에 걸쳐 있는 가설만 다음 배치를 계속 인터뷰하며, 배치마다 아직 열린 가설과 관련된 질문만 묻습니다.
+        max_personas에 도달하면 그때까지의 점수로 기존과 같이 판정합니다.
+        인터뷰한 페르소나와 응답은 personas/interview_results에 남습니다.
         
-        answers = [
-            "흥미로운 제안입니다. 더 자세히 알아보고 싶네요.",
-            "우리 팀의 니즈와 잘 맞는 것 같습니다.",
-            "몇 가지 추가 질문이 있습니다."
+        기본 상한은 기존 고정 패널 크기(DEFAULT_PANEL_SIZE명)이므로 인터뷰 수가 고정 패널보다 늘지 않고,
+        관련 없는 질문을 묻지 않는 만큼 줄어듭니다. 20명 안팎에서는 신뢰 구간이 넓어 조기 종료가 드물며,
+        패널을 키워 검증할 때 max_personas를 그 크기로 주면 판정이 분명한 가설부터 일찍 멈춥니다.
+        """
+        
+        interview_questions = list(questions or DEFAULT_INTERVIEW_QUESTIONS)
+        
+        # 가설별 관련 질문 (응답 키워드 중 하나라도 가설에 포함되는 질문)
+        question_keywords = [set(RESPONSE_RULES[classify_question(q)]["keywords"]) for q in interview_questions]
+        matcher = KeywordMatcher.compile(set().union(*question_keywords))
+        relevant = []
+        for hypothesis in hypotheses:
+            matched = set(matcher.matches(hypothesis))
+            relevant.append([q for q, keywords in zip(interview_questions, question_keywords) if keywords & matched])
+        
+        positive = SENTIMENTS.index(ResponseSentiment.POSITIVE)
+        negative = SENTIMENTS.index(ResponseSentiment.NEGATIVE)
+        state = [
+            {"n": 0, "responses": 0, "total": 0.0, "total_sq": 0.0, "looks": 0, "bounds": (0.0, 1.0),
+             "supporting": [], "contrary": [], "open": bool(questions_for)}
+            for questions_for in relevant
         ]
         
-        return InterviewResponse(
-            question=question,
-            answer=random.choice(answers),
-            sentiment=ResponseSentiment.NEUTRAL,
-            confidence=0.5,
-            keywords=["일반", "관심"]
-        )
+        chunks = []
+        table = InterviewTable()
+        interviewed = 0
+        while interviewed < max_personas and any(st["open"] for st in state):
+            asked = [q for q in interview_questions if any(st["open"] and q in qs for st, qs in zip(state, relevant))]
+            chunk = PersonaTable(self.generate_persona_arrays(min(batch_size, max_personas - interviewed), start=interviewed))
+            chunks.append(chunk)
+            interviewed += len(chunk)
+            
+            # 질문 순서대로 페르소나 수만큼 행이 추가되므로 (질문, 페르소나) 행렬로 볼 수 있습니다
+            batch = InterviewTable(pools=table)
+            self.interview_panel(chunk, asked, into=batch)
+            table.extend(batch)
+            columns = batch.columns
+            shape = (len(asked), len(chunk))
+            sentiment = columns["sentiment"].reshape(shape)
+            confidence = columns["confidence"].reshape(shape)
+            answer = columns["answer"].reshape(shape)
+            contribution = np.where(sentiment == positive, confidence, np.where(sentiment == negative, 1 - confidence, 0.5))
+            
+            for st, hypothesis, questions_for in zip(state, hypotheses, relevant):
+                if not st["open"]:
+                    continue
+                rows = [asked.index(q) for q in questions_for]
+                per_persona = contribution[rows].mean(axis=0)
+                st["n"] += len(chunk)
+                st["responses"] += len(chunk) * len(rows)
+                # 이전 합계에서 이어서 응답 순서(페르소나별, 질문 순)대로 더하면 고정 패널 점수와 비트 단위로 같습니다
+                st["total"] = ordered_total(contribution[rows].T.ravel(), st["total"])
+                st["total_sq"] += float(np.dot(per_persona, per_persona))
+                st["looks"] += 1
+                
+                # 근거 (응답 순서대로 최대 5개)
+                for bucket, wanted in (("supporting", positive), ("contrary", negative)):
+                    if len(st[bucket]) < 5:
+                        hits = np.flatnonzero(sentiment[rows].T.ravel() == wanted)[:5 - len(st[bucket])]
+                        for hit in hits.tolist():
+                            persona = chunk[hit // len(rows)]
+                            text = batch.answers[int(answer[rows[hit % len(rows)], hit // len(rows)])]
+                            st[bucket].append(f"{persona.name} ({persona.segment.value}): {text}")
+                
+                # per_persona 평균은 응답 수가 같으므로 전체 점수와 같습니다
+                lower, upper = sequential_bounds(st["n"], st["total"] / len(rows), st["total_sq"], st["looks"], alpha)
+                st["bounds"] = (lower, upper)
+                if lower > threshold or upper < 1 - threshold or (lower >= 1 - threshold and upper <= threshold):
+                    st["open"] = False
+        
+        personas = PersonaTable.concat(chunks) if chunks else PersonaTable()
+        if self.columnar:
+            self.personas = personas
+            self.interview_results = table
+        else:
+            self.personas = personas.to_personas()
+            self.interview_results = dict(table.items())
+        
+        results = []
+        for st, hypothesis in zip(state, hypotheses):
+            result = self._build_hypothesis_result(
+                hypothesis, threshold, st["total"], st["responses"], st["supporting"], st["contrary"]
+            )
+            results.append(SequentialValidationResult(
+                result=result,
+                personas_interviewed=st["n"],
+                responses_used=st["responses"],
+                looks=st["looks"],
+                lower_bound=st["bounds"][0],
+                upper_bound=st["bounds"][1],
+                stopped_early=st["looks"] > 0 and st["n"] < max_personas and not st["open"]
+            ))
+        return results
     
-    def validate_hypothesis(self, hypothesis: str, threshold: float = 0.6) -> HypothesisResult:
-        """가설 검증"""
+    def _build_response_index(self) -> Dict[str, Any]:
+        """가설 검증용 응답 인덱스 구성
         
-        supporting = []
-        contrary = []
-        total_confidence = 0
-        response_count = 0
+        interview_results 순회 순서로 정렬된 응답별 감정/신뢰도 기여분과
+        키워드 -> 응답 위치 역색인을 만듭니다. 페르소나를 찾을 수 없는 응답은 제외합니다.
+        """
         
-        # 모든 인터뷰 응답 분석
-        for persona_id, responses in self.interview_results.items():
-            persona = next((p for p in self.personas if p.id == persona_id), None)
-            if not persona:
-                continue
+        table = self.interview_results
+        if not isinstance(table, InterviewTable):
+            table = InterviewTable.from_responses(table)
+        columns = table.columns
+        _, order, _ = table.grouping()
+        
+        # 페르소나 ID 인덱스
+        if isinstance(self.personas, PersonaTable):
+            personas = self.personas
+            known_keys = personas.columns["index"]
+            persona_lookup = lambda key: personas[personas.position_of(persona_id(key))]
             
-            for response in responses:
-                # 가설과 관련된 응답 찾기
-                if any(keyword in hypothesis.lower() for keyword in response.keywords):
-                    response_count += 1
-                    
-                    if response.sentiment == ResponseSentiment.POSITIVE:
-                        supporting.append(f"{persona.name} ({persona.segment.value}): {response.answer}")
-                        total_confidence += response.confidence
-                    elif response.sentiment == ResponseSentiment.NEGATIVE:
-                        contrary.append(f"{persona.name} ({persona.segment.value}): {response.answer}")
-                        total_confidence += (1 - response.confidence)
-                    else:
-                        total_confidence += 0.5
+            def persona_segments(keys: np.ndarray) -> np.ndarray:
+                sorter = np.argsort(known_keys, kind="stable")
+                positions = sorter[np.searchsorted(known_keys, keys, sorter=sorter)]
+                return personas.columns["segment"][positions].astype(np.int64)
+        else:
+            # 리스트 엔진은 기존과 같이 ID로 페르소나를 찾습니다 (ID 형식이나 카탈로그와 무관)
+            by_id = {p.id: p for p in self.personas}
+            segment_of_key: Dict[int, int] = {}
+            for pid, persona in by_id.items():
+                key = table.persona_key(pid, create=False)
+                if key is not None:
+                    segment_of_key[key] = SEGMENTS.index(persona.segment)
+            known_keys = np.fromiter(segment_of_key, dtype=np.int64, count=len(segment_of_key))
+            persona_lookup = lambda key: by_id[table.persona_id_of(key)]
+            
+            def persona_segments(keys: np.ndarray) -> np.ndarray:
+                distinct, inverse = np.unique(keys, return_inverse=True)
+                return np.array([segment_of_key[key] for key in distinct.tolist()], dtype=np.int64)[inverse]
+        order = order[np.isin(columns["persona"][order], known_keys)]
+        
+        sentiment = columns["sentiment"][order]
+        confidence = columns["confidence"][order]
+        contribution = np.where(
+            sentiment == SENTIMENTS.index(ResponseSentiment.POSITIVE), confidence,
+            np.where(sentiment == SENTIMENTS.index(ResponseSentiment.NEGATIVE), 1 - confidence, 0.5)
+        )
+        
+        # 키워드 -> 응답 역색인 (키워드 묶음은 인터닝되어 있으므로 키워드 -> 묶음 ID -> 응답 위치로 찾습니다)
+        sets_by_keyword: Dict[str, List[int]] = {}
+        for set_id, keywords in enumerate(table.keyword_sets.values):
+            for keyword in set(keywords):
+                sets_by_keyword.setdefault(keyword, []).append(set_id)
+        
+        def evidence(row: int) -> str:
+            persona = persona_lookup(int(columns["persona"][order[row]]))
+            answer = table.answers[int(columns["answer"][order[row]])]
+            return f"{persona.name} ({persona.segment.value}): {answer}"
+        
+        return {
+            "sentiment": sentiment,
+            "contribution": contribution,
+            "keyword_set": columns["keywords"][order],
+            "num_keyword_sets": len(table.keyword_sets),
+            "sets_by_keyword": sets_by_keyword,
+            "matcher": KeywordMatcher.compile(sets_by_keyword),
+            "evidence": evidence,
+            "persona_keys": lambda: columns["persona"][order],
+            # 페르소나 키 배열 -> 세그먼트 번호
+            "persona_segments": persona_segments,
+        }
+    
+    def _build_hypothesis_result(self, hypothesis: str, threshold: float, total_confidence: float,
+                                 response_count: int, supporting: List[str], contrary: List[str]) -> HypothesisResult:
+        """집계값으로부터 HypothesisResult 생성"""
         
         # 신뢰도 계산
         if response_count > 0:
@@ -397,20 +1575,15 @@ class SimulationEngine:
             confidence_score = 0.5
         
         # 검증 상태 결정
-        if confidence_score > threshold:
-            validation_status = "validated"
-        elif confidence_score < (1 - threshold):
-            validation_status = "invalidated"
-        else:
-            validation_status = "partial"
+        status = validation_status(confidence_score, threshold)
         
         # 권장사항 생성
-        recommendations = self._generate_recommendations(validation_status, confidence_score)
-        pivot_suggestions = self._generate_pivot_suggestions(validation_status, contrary)
+        recommendations = self._generate_recommendations(status, confidence_score)
+        pivot_suggestions = self._generate_pivot_suggestions(status, contrary)
         
         return HypothesisResult(
             hypothesis=hypothesis,
-            validation_status=validation_status,
+            validation_status=status,
             confidence_score=confidence_score,
             supporting_evidence=supporting[:5],  # 상위 5개만
             contrary_evidence=contrary[:5],  # 상위 5개만
@@ -460,20 +1633,34 @@ class SimulationEngine:
         else:
             return []
     
-    def run_financial_simulation(self, months: int = 12) -> Dict[str, Any]:
-        """재무 시뮬레이션 실행"""
+    @instrumented("financial", items="months")
+    def run_financial_simulation(self, months: int = 12, new_users: List[int] = None,
+                                 assumptions: Dict[str, float] = None) -> Dict[str, Any]:
+        """재무 시뮬레이션 실행
+        
+        new_users(월별 신규 사용자 수, 예: 확산 시뮬레이션 결과)를 주면 고정 성장률 대신 사용합니다.
+        assumptions는 FINANCIAL_DEFAULTS 중 바꿀 파라미터입니다 (예: {"arpu": 12900}).
+        """
+        
+        if new_users is not None and len(new_users) < months:
+            raise ValueError(f"new_users는 {months}개월 이상이어야 합니다")
+        unknown = set(assumptions or {}) - set(FINANCIAL_DEFAULTS)
+        if unknown:
+            raise ValueError(f"알 수 없는 재무 파라미터입니다: {', '.join(sorted(unknown))}")
+        params = dict(FINANCIAL_DEFAULTS)
+        params.update(assumptions or {})
         
         # 초기 파라미터 설정
-        initial_users = 10
-        monthly_growth_rate = 0.15  # 15% 성장률
-        churn_rate = 0.05  # 5% 이탈률
-        conversion_rate = 0.1  # 10% 전환율
-        arpu = 9900  # 평균 고객당 수익
+        initial_users = params["initial_users"]
+        monthly_growth_rate = params["monthly_growth_rate"]
+        churn_rate = params["churn_rate"]
+        conversion_rate = params["conversion_rate"]
+        arpu = params["arpu"]
         
         # 비용 구조
-        fixed_costs = 10000000  # 고정비 1천만원
-        variable_cost_per_user = 1000  # 사용자당 변동비
-        marketing_cost = 5000000  # 마케팅 비용
+        fixed_costs = params["fixed_costs"]
+        variable_cost_per_user = params["variable_cost_per_user"]
+        marketing_cost = params["marketing_cost"]
         
         results = {
             "months": [],
@@ -489,9 +1676,12 @@ class SimulationEngine:
         
         for month in range(1, months + 1):
             # 사용자 성장
-            new_users = int(current_users * monthly_growth_rate)
+            if new_users is None:
+                month_new_users = int(current_users * monthly_growth_rate)
+            else:
+                month_new_users = int(new_users[month - 1])
             churned_users = int(current_users * churn_rate)
-            current_users = current_users + new_users - churned_users
+            current_users = current_users + month_new_users - churned_users
             
             # 수익 계산
             paying_users = int(current_users * conversion_rate)
@@ -519,69 +1709,301 @@ class SimulationEngine:
             "total_revenue": sum(results["revenue"]),
             "total_costs": sum(results["costs"]),
             "roi": (sum(results["revenue"]) - sum(results["costs"])) / sum(results["costs"]) * 100,
-            "cac": marketing_cost / (new_users if new_users > 0 else 1),  # 고객 획득 비용
+            "cac": marketing_cost / (month_new_users if month_new_users > 0 else 1),  # 고객 획득 비용
             "ltv": arpu * 12 / (churn_rate if churn_rate > 0 else 0.01),  # 고객 생애 가치
         }
         
         return results
+    
+    @instrumented("monte_carlo", items="scenarios")
+    def run_monte_carlo_simulation(self, scenarios: int = 10000, months: int = 12,
+                                   distributions: Dict[str, Tuple] = None) -> Dict[str, Any]:
+        """몬테카를로 재무 시뮬레이션
+        
+        재무 파라미터를 분포에서 시나리오 수만큼 뽑아 (시나리오 x 월) 행렬을 한 번에 계산하고,
+        사용자/매출/이익/누적이익의 p5/p50/p95 밴드와 손익분기 월 분포를 반환합니다.
+        distributions는 {파라미터: (분포, 인자...)} 형식이며 지정하지 않은 파라미터는
+        MONTE_CARLO_DISTRIBUTIONS, 그 외에는 FINANCIAL_DEFAULTS 값을 사용합니다.
+        """
+        
+        spec = dict(MONTE_CARLO_DISTRIBUTIONS)
+        spec.update(distributions or {})
+        params = {name: sample_parameter(name, spec.get(name, ("fixed", default)), scenarios, self.rng)
+                  for name, default in FINANCIAL_DEFAULTS.items()}
+        
+        return summarize_scenarios(project_financials(params, months), scenarios, months)
+
+# 기본 인터뷰 질문
+DEFAULT_INTERVIEW_QUESTIONS = [
+    "현재 어떤 문제를 겪고 계신가요?",
+    "우리 제품의 가치 제안에 대해 어떻게 생각하시나요?",
+    "월 9,900원의 구독료를 지불할 의향이 있으신가요?",
+    "어떤 기능이 가장 중요하다고 생각하시나요?",
+    "어떤 채널을 통해 제품을 알고 싶으신가요?"
+]
+
+# BMC에 price(월 구독료)가 있으면 기본 질문 중 가격 질문을 이 형식으로 바꿉니다
+PRICE_QUESTION_TEMPLATE = "월 {price:,}원의 구독료를 지불할 의향이 있으신가요?"
+PRICE_QUESTION_INDEX = 2
+
+def bmc_interview_questions(bmc_data: Dict) -> List[str]:
+    """BMC에 맞춘 기본 인터뷰 질문"""
+    questions = list(DEFAULT_INTERVIEW_QUESTIONS)
+    if bmc_data.get("price") is not None:
+        questions[PRICE_QUESTION_INDEX] = PRICE_QUESTION_TEMPLATE.format(price=int(bmc_data["price"]))
+    return questions
+
+def bmc_financial_assumptions(bmc_data: Dict) -> Dict[str, float]:
+    """BMC에서 재무 모델 가정 추출 (price -> arpu, financial_assumptions는 그대로 덮어씀)"""
+    assumptions = {}
+    if bmc_data.get("price") is not None:
+        assumptions["arpu"] = bmc_data["price"]
+    assumptions.update(bmc_data.get("financial_assumptions") or {})
+    return assumptions
+
+# new_simulation_id 형식 (sim_YYYYmmddHHMMSS_<16진수 12자리>)
+SIMULATION_ID_PATTERN = re.compile(r"sim_\d{14}_[0-9a-f]{12}")
+
+def new_simulation_id() -> str:
+    """시뮬레이션 ID 생성 (시각 + 임의 접미사, 같은 초에 만든 실행끼리도 겹치지 않음)"""
+    return f"sim_{datetime.now().strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:12]}"
+
+def build_summary(persona_count: int, question_count: int, validation_results: List[HypothesisResult],
+                  financial_results: Dict[str, Any]) -> Dict[str, Any]:
+    """시뮬레이션 결과 요약 생성"""
+    return {
+        "total_personas": persona_count,
+        "total_interviews": persona_count * question_count,
+        "validated_hypotheses": sum(1 for r in validation_results if r.validation_status == "validated"),
+        "invalidated_hypotheses": sum(1 for r in validation_results if r.validation_status == "invalidated"),
+        "break_even_month": financial_results["metrics"].get("break_even_month"),
+        "projected_roi": financial_results["metrics"].get("roi")
+    }
 
 # FastAPI 연동을 위한 API 래퍼
 class SimulationAPI:
     """FastAPI와 연동하기 위한 API 래퍼"""
     
     @staticmethod
-    def create_simulation(bmc_data: Dict) -> Dict[str, Any]:
-        """시뮬레이션 생성 및 실행"""
+    def create_simulation(bmc_data: Dict, seed: int = None, persona_count: int = 20,
+                          questions: List[str] = None, cache: Any = None, diagnostics: bool = False,
+                          instrumentation: Instrumentation = None, population: Any = None,
+                          bootstrap: int = 0) -> Dict[str, Any]:
+        """시뮬레이션 생성 및 실행
         
-        engine = SimulationEngine(bmc_data)
+        seed를 지정하면 결과가 재현 가능하며, cache(SimulationCache)가 주어지면
+        같은 BMC/seed/페르소나 수/질문 조합의 결과를 재사용합니다.
+        diagnostics=True이면 이번 실행의 단계별 지표를 결과의 "diagnostics"에 담고,
+        instrumentation(공유 Instrumentation)을 주면 지표를 그쪽에도 누적합니다.
+        population(PopulationPool)을 주면 페르소나를 새로 만들지 않고 인구 풀에서 패널을 추출합니다.
+        bootstrap(재표본 수)을 주면 가설 검증 결과마다 부트스트랩 신뢰 구간과 세그먼트별 점수를 담습니다.
+        """
         
-        # 1. 페르소나 생성
-        personas = engine.generate_personas(count=20)
+        interview_questions = list(questions or bmc_interview_questions(bmc_data))
+        started = time.perf_counter()
         
-        # 2. 인터뷰 수행
-        interview_questions = [
-            "현재 어떤 문제를 겪고 계신가요?",
-            "우리 제품의 가치 제안에 대해 어떻게 생각하시나요?",
-            "월 9,900원의 구독료를 지불할 의향이 있으신가요?",
-            "어떤 기능이 가장 중요하다고 생각하시나요?",
-            "어떤 채널을 통해 제품을 알고 싶으신가요?"
-        ]
+        cache_key = None
+        if cache is not None and seed is not None:
+            cache_key = cache.make_key(bmc_data, seed, persona_count, interview_questions,
+                                       population=population.fingerprint if population is not None else None,
+                                       bootstrap=bootstrap or None)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                # 결과를 재사용해도 실행마다 새 ID와 시각을 붙입니다
+                cached["simulation_id"] = new_simulation_id()
+                cached["timestamp"] = datetime.now().isoformat()
+                if diagnostics:
+                    cached["diagnostics"] = {
+                        "cache_hit": True,
+                        "wall_time": time.perf_counter() - started,
+                        "stages": {}
+                    }
+                return cached
         
-        for persona in personas:
-            engine.conduct_interviews(persona, interview_questions)
+        # 실행별 수집기를 두고 공유 수집기가 있으면 끝난 단계를 그쪽으로 넘깁니다
+        run_instrumentation = None
+        if diagnostics or instrumentation is not None:
+            run_instrumentation = Instrumentation(on_span=instrumentation.record if instrumentation is not None else None)
         
-        # 3. 가설 검증
+        # 스트리밍 실행의 이벤트를 모아 하나의 결과로 조립합니다
+        result = {
+            "simulation_id": None,
+            "timestamp": None,
+            "personas": [],
+            "interview_results": {},
+            "validation_results": [],
+            "financial_projection": None,
+            "market_analysis": None,
+            "summary": None
+        }
+        events = SimulationAPI.stream_simulation(bmc_data, seed, persona_count, interview_questions,
+                                                 instrumentation=run_instrumentation, population=population,
+                                                 bootstrap=bootstrap)
+        for event in events:
+            if event.type == "started":
+                result["simulation_id"] = event.simulation_id
+                result["timestamp"] = event.payload["timestamp"]
+            elif event.type == "personas":
+                result["personas"].extend(event.payload["personas"])
+            elif event.type == "interviews":
+                result["interview_results"].update(event.payload["interview_results"])
+            elif event.type == "hypothesis":
+                result["validation_results"].append(event.payload["result"])
+            elif event.type == "financial":
+                result["financial_projection"] = event.payload["financial_projection"]
+            elif event.type == "completed":
+                result["market_analysis"] = event.payload["market_analysis"]
+                result["summary"] = event.payload["summary"]
+        
+        if cache_key is not None:
+            cache.put(cache_key, result)
+        if diagnostics:
+            result["diagnostics"] = {
+                "cache_hit": False,
+                "wall_time": time.perf_counter() - started,
+                **run_instrumentation.diagnostics()
+            }
+        return result
+    
+    @staticmethod
+    def run_stages(bmc_data: Dict, seed: int = None, persona_count: int = 20,
+                   questions: List[str] = None, chunk_size: int = 10000,
+                   instrumentation: Instrumentation = None, population: Any = None,
+                   bootstrap: int = 0) -> Iterator[Tuple[str, Any]]:
+        """시뮬레이션 단계를 순서대로 실행하며 (단계 이름, 단계 결과)를 생성
+        
+        - ("personas", (청크 번호, 시작 위치, PersonaTable, 전체 청크 수))
+        - ("interviews", (청크 번호, InterviewTable, 전체 청크 수))
+        - ("hypothesis", (가설 번호, HypothesisResult))
+        - ("financial", 재무 예측 dict)
+        - ("completed", SimulationEngine)
+        
+        직렬화는 하지 않으므로 스트리밍/파일 출력 등 소비하는 쪽에서 형식을 정합니다.
+        population(PopulationPool)을 주면 패널 위치를 한 번에 뽑고 청크마다 해당 행만 읽습니다.
+        bootstrap(재표본 수)을 주면 가설 검증 결과에 부트스트랩 요약을 담습니다.
+        """
+        
+        interview_questions = list(questions or bmc_interview_questions(bmc_data))
         hypotheses = bmc_data.get("hypotheses", [])
-        validation_results = []
+        engine = SimulationEngine(bmc_data, columnar=True, seed=seed, instrumentation=instrumentation)
         
-        for hypothesis in hypotheses:
-            result = engine.validate_hypothesis(hypothesis)
-            validation_results.append(asdict(result))
+        # 1-2. 페르소나 생성 및 인터뷰 (청크 단위)
+        chunks = []
+        num_chunks = max(1, -(-persona_count // chunk_size))
+        if population is not None:
+            panel_indices = population.sample_indices(persona_count, engine.rng)
+        for chunk_idx, start in enumerate(range(0, persona_count, chunk_size)):
+            if population is None:
+                chunk = PersonaTable(engine.generate_persona_arrays(min(chunk_size, persona_count - start), start=start))
+            else:
+                with stage_context(instrumentation, "personas", min(chunk_size, persona_count - start)):
+                    chunk = population.take(panel_indices[start:start + chunk_size])
+            chunks.append(chunk)
+            yield "personas", (chunk_idx, start, chunk, num_chunks)
+            
+            chunk_results = InterviewTable(pools=engine.interview_results)
+            engine.interview_panel(chunk, interview_questions, into=chunk_results)
+            engine.interview_results.extend(chunk_results)
+            yield "interviews", (chunk_idx, chunk_results, num_chunks)
+        engine.personas = PersonaTable.concat(chunks)
+        
+        # 3. 가설 검증
+        for idx, hypothesis_result in enumerate(engine.iter_hypothesis_results(hypotheses, bootstrap=bootstrap)):
+            yield "hypothesis", (idx, hypothesis_result)
         
         # 4. 재무 시뮬레이션
-        financial_results = engine.run_financial_simulation(months=12)
+        yield "financial", engine.run_financial_simulation(months=12, assumptions=bmc_financial_assumptions(bmc_data))
         
-        # 5. 결과 종합
-        return {
-            "simulation_id": f"sim_{datetime.now().strftime('%Y%m%d%H%M%S')}",
-            "timestamp": datetime.now().isoformat(),
-            "personas": [asdict(p) for p in personas],
-            "interview_results": {
-                persona_id: [asdict(r) for r in responses]
-                for persona_id, responses in engine.interview_results.items()
-            },
-            "validation_results": validation_results,
-            "financial_projection": financial_results,
-            "market_analysis": engine.market_data,
-            "summary": {
-                "total_personas": len(personas),
-                "total_interviews": len(personas) * len(interview_questions),
-                "validated_hypotheses": sum(1 for r in validation_results if r["validation_status"] == "validated"),
-                "invalidated_hypotheses": sum(1 for r in validation_results if r["validation_status"] == "invalidated"),
-                "break_even_month": financial_results["metrics"].get("break_even_month"),
-                "projected_roi": financial_results["metrics"].get("roi")
-            }
-        }
+        yield "completed", engine
+    
+    @staticmethod
+    def stream_simulation(bmc_data: Dict, seed: int = None, persona_count: int = 20,
+                          questions: List[str] = None, chunk_size: int = 10000,
+                          instrumentation: Instrumentation = None, population: Any = None,
+                          bootstrap: int = 0) -> Iterator[SimulationEvent]:
+        """단계별 시뮬레이션 실행 (진행 이벤트 스트리밍)
+        
+        페르소나 생성과 인터뷰는 chunk_size 단위로 진행하며 청크마다 이벤트를 보내고,
+        이어서 가설별 검증 결과, 재무 예측, 요약을 차례로 보냅니다.
+        같은 seed/chunk_size면 create_simulation과 같은 결과를 냅니다.
+        instrumentation을 주면 단계별 지표를 기록하고 completed 이벤트에 diagnostics를 담습니다.
+        """
+        
+        interview_questions = list(questions or bmc_interview_questions(bmc_data))
+        hypotheses = bmc_data.get("hypotheses", [])
+        simulation_id = new_simulation_id()
+        
+        def event(event_type: str, progress: float, **payload) -> SimulationEvent:
+            return SimulationEvent(type=event_type, simulation_id=simulation_id, progress=progress, payload=payload)
+        
+        yield event(
+            "started", 0.0,
+            timestamp=datetime.now().isoformat(),
+            total_personas=persona_count,
+            total_questions=len(interview_questions),
+            total_hypotheses=len(hypotheses)
+        )
+        
+        validation_results = []
+        financial_results = None
+        stages = SimulationAPI.run_stages(bmc_data, seed, persona_count, interview_questions, chunk_size,
+                                          instrumentation, population, bootstrap)
+        for stage, data in stages:
+            if stage == "personas":
+                chunk_idx, start, chunk, num_chunks = data
+                with stage_context(instrumentation, "serialization", len(chunk)):
+                    records = chunk.to_records()
+                yield event(
+                    "personas", 0.8 * (chunk_idx + 0.5) / num_chunks,
+                    chunk=chunk_idx, start=start, personas=records
+                )
+            elif stage == "interviews":
+                chunk_idx, chunk_results, num_chunks = data
+                with stage_context(instrumentation, "serialization", chunk_results.num_rows):
+                    records = chunk_results.to_records()
+                yield event(
+                    "interviews", 0.8 * (chunk_idx + 1) / num_chunks,
+                    chunk=chunk_idx, interview_results=records
+                )
+            elif stage == "hypothesis":
+                idx, hypothesis_result = data
+                validation_results.append(hypothesis_result)
+                with stage_context(instrumentation, "serialization", 1):
+                    record = hypothesis_to_dict(hypothesis_result)
+                yield event(
+                    "hypothesis", 0.8 + 0.15 * (idx + 1) / len(hypotheses),
+                    index=idx, result=record
+                )
+            elif stage == "financial":
+                financial_results = data
+                yield event("financial", 0.99, financial_projection=financial_results)
+            else:
+                engine = data
+                # 5. 결과 종합
+                extra = {"diagnostics": instrumentation.diagnostics()} if instrumentation is not None else {}
+                yield event(
+                    "completed", 1.0,
+                    market_analysis=engine.market_data,
+                    summary=build_summary(len(engine.personas), len(interview_questions),
+                                          validation_results, financial_results),
+                    **extra
+                )
+    
+    @staticmethod
+    async def astream_simulation(bmc_data: Dict, seed: int = None, persona_count: int = 20,
+                                 questions: List[str] = None, chunk_size: int = 10000,
+                                 instrumentation: Instrumentation = None, population: Any = None,
+                                 bootstrap: int = 0) -> AsyncIterator[SimulationEvent]:
+        """stream_simulation의 비동기 버전 (각 단계는 스레드에서 실행하여 이벤트 루프를 막지 않습니다)"""
+        
+        events = SimulationAPI.stream_simulation(bmc_data, seed, persona_count, questions, chunk_size,
+                                                 instrumentation, population, bootstrap)
+        done = object()
+        while True:
+            event = await asyncio.to_thread(next, events, done)
+            if event is done:
+                break
+            yield event
 
 if __name__ == "__main__":
     # 테스트 실행
@@ -0,0 +1,215 @@
+"""
+메모리 제한 스트리밍 내보내기
+큰 패널을 chunk_size 단위로 생성/인터뷰하면서 바로 디스크에 쓰고, 가설 검증은 같은 청크 스트림을
+샤드 부분 집계(sharding)로 누적합니다. 청크를 쓰고 나면 버리므로 최대 메모리는 패널 크기와 무관하게
+청크 크기에 비례합니다.
+
+- JSONL (.jsonl, .jsonl.gz): 줄마다 이벤트 하나 (started / persona / hypothesis / financial / completed)
+- 컬럼형 (디렉터리): 청크별 part-NNNNN.npz와 마지막에 쓰는 meta.json
+
+같은 seed/chunk_size면 create_simulation과 같은 페르소나/응답/검증 결과/요약을 냅니다 (부트스트랩 제외).
+
+사용 예:
+    summary = export_simulation("run.jsonl.gz", bmc, seed=42, persona_count=1000000)
+    for personas, interviews in iter_columnar_chunks("run_parts/"):
+        ...
+"""
+
+import gzip
+import json
+import os
+from datetime import datetime
+from typing import List, Dict, Any, IO, Iterator, Tuple
+
+import numpy as np
+
+from instrumentation import Instrumentation, stage_context
+from serialization import COLUMNAR_FORMAT_VERSION, WRITE_BLOCK_SIZE, _dumps, _interview_groups_json, _persona_rows_json, _pool_array
+from sharding import ShardCoordinator, shard_partial
+from simulation_engine import (
+    SimulationEngine, PersonaTable, InterviewTable, build_summary, bmc_financial_assumptions,
+    bmc_interview_questions, hypothesis_to_dict, new_simulation_id
+)
+
+class JsonlSink:
+    """이벤트를 한 줄씩 JSONL로 기록 (경로가 .gz로 끝나면 gzip 압축)"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._fp: IO[str] = gzip.open(path, "wt", encoding="utf-8") if path.endswith(".gz") else open(path, "w", encoding="utf-8")
+        self._mask_cache: Dict[Tuple[str, int], str] = {}
+    
+    def start(self, meta: Dict[str, Any]) -> None:
+        self._fp.write(_dumps({"type": "started", **meta}) + "\n")
+    
+    def write_chunk(self, chunk_idx: int, personas: PersonaTable, interviews: InterviewTable) -> None:
+        """페르소나마다 한 줄: {"type": "persona", "persona": {...}, "responses": [...]}"""
+        
+        responses = {key: text for block in _interview_groups_json(interviews) for key, text in block}
+        keys = personas.columns["index"].tolist()
+        for start in range(0, len(personas), WRITE_BLOCK_SIZE):
+            persona_rows = _persona_rows_json(personas, start, start + WRITE_BLOCK_SIZE, self._mask_cache)
+            self._fp.write("".join(
+                f'{{"type":"persona","persona":{row},"responses":{responses.pop(key, "[]")}}}\n'
+                for key, row in zip(keys[start:start + WRITE_BLOCK_SIZE], persona_rows)
+            ))
+    
+    def finish(self, validation_results: List[Dict[str, Any]], financial_projection: Dict[str, Any],
+               market_analysis: Dict[str, Any], summary: Dict[str, Any]) -> None:
+        for record in validation_results:
+            self._fp.write(_dumps({"type": "hypothesis", "result": record}) + "\n")
+        self._fp.write(_dumps({"type": "financial", "financial_projection": financial_projection}) + "\n")
+        self._fp.write(_dumps({"type": "completed", "market_analysis": market_analysis, "summary": summary}) + "\n")
+    
+    def close(self) -> None:
+        self._fp.close()
+
+class ColumnarSink:
+    """청크별 컬럼형 바이너리(part-NNNNN.npz)와 meta.json을 디렉터리에 기록
+    
+    인터닝 풀(질문/답변/키워드 묶음)은 모든 청크 테이블이 공유하므로 마지막 청크의 풀을 meta.json에 한 번만 씁니다.
+    """
+    
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._meta: Dict[str, Any] = {}
+        self._parts: List[str] = []
+        self._pools = InterviewTable()
+    
+    def start(self, meta: Dict[str, Any]) -> None:
+        self._meta = dict(meta)
+    
+    def write_chunk(self, chunk_idx: int, personas: PersonaTable, interviews: InterviewTable) -> None:
+        arrays = {f"personas/{name}": values for name, values in personas.columns.items()}
+        arrays.update({f"interviews/{name}": values for name, values in interviews.columns.items()})
+        name = f"part-{chunk_idx:05d}.npz"
+        with open(os.path.join(self.directory, name), "wb") as f:
+            np.savez_compressed(f, **arrays)
+        self._parts.append(name)
+        self._pools = interviews
+    
+    def finish(self, validation_results: List[Dict[str, Any]], financial_projection: Dict[str, Any],
+               market_analysis: Dict[str, Any], summary: Dict[str, Any]) -> None:
+        meta = {
+            "format_version": COLUMNAR_FORMAT_VERSION,
+            **self._meta,
+            "parts": self._parts,
+            "pools": {name: json.loads(str(_pool_array(getattr(self._pools, name))))
+                      for name in ("questions", "answers", "keyword_sets")},
+            "validation_results": validation_results,
+            "financial_projection": financial_projection,
+            "market_analysis": market_analysis,
+            "summary": summary,
+        }
+        # 메타데이터가 있어야 완성된 내보내기로 보므로 마지막에 원자적으로 씁니다
+        path = os.path.join(self.directory, "meta.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(_dumps(meta))
+        os.replace(path + ".tmp", path)
+    
+    def close(self) -> None:
+        pass
+
+def read_columnar_meta(directory: str) -> Dict[str, Any]:
+    """컬럼형 내보내기의 메타데이터 (검증 결과, 재무 예측, 요약, 청크 목록)"""
+    
+    with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("format_version") != COLUMNAR_FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 형식입니다: {meta.get('format_version')}")
+    return meta
+
+def iter_columnar_chunks(directory: str) -> Iterator[Tuple[PersonaTable, InterviewTable]]:
+    """컬럼형 내보내기를 청크 단위로 읽기 (한 번에 청크 하나만 메모리에 올림)"""
+    
+    meta = read_columnar_meta(directory)
+    pools = InterviewTable()
+    for pool_name, values in meta["pools"].items():
+        pool = getattr(pools, pool_name)
+        for value in values:
+            pool.intern(tuple(value) if isinstance(value, list) else value)
+    
+    for name in meta["parts"]:
+        with np.load(os.path.join(directory, name), allow_pickle=False) as data:
+            personas = PersonaTable({
+                key.split("/", 1)[1]: data[key] for key in data.files if key.startswith("personas/")
+            })
+            columns = {key.split("/", 1)[1]: data[key] for key in data.files if key.startswith("interviews/")}
+        interviews = InterviewTable(pools=pools)
+        interviews.append_rows(
+            columns["persona"], columns["question"], columns["answer"],
+            columns["sentiment"], columns["confidence"], columns["keywords"]
+        )
+        yield personas, interviews
+
+def stream_simulation_to_sink(sink: Any, bmc_data: Dict, seed: int = None, persona_count: int = 20,
+                              questions: List[str] = None, chunk_size: int = 10000,
+                              instrumentation: Instrumentation = None) -> Dict[str, Any]:
+    """청크마다 페르소나/응답을 sink에 쓰고 가설 검증은 부분 집계로 누적 (요약 반환)
+    
+    sink는 start/write_chunk/finish/close를 가진 객체(JsonlSink, ColumnarSink)입니다.
+    난수 사용 순서가 SimulationAPI.run_stages와 같으므로 같은 seed/chunk_size면 같은 결과를 냅니다.
+    """
+    
+    interview_questions = list(questions or bmc_interview_questions(bmc_data))
+    hypotheses = bmc_data.get("hypotheses", [])
+    engine = SimulationEngine(bmc_data, columnar=True, seed=seed, instrumentation=instrumentation)
+    # 청크 테이블은 이 풀을 공유하므로 인터닝 ID가 청크 간에 일관됩니다 (풀 크기는 패널 크기와 무관)
+    pools = engine.interview_results
+    coordinator = ShardCoordinator(hypotheses)
+    # 청크는 패널 순서대로 처리하므로 신뢰도 합계를 메모리 내 실행처럼 응답 순서대로 이어서 더합니다
+    running = {hypothesis: 0.0 for hypothesis in hypotheses}
+    
+    try:
+        sink.start({
+            "simulation_id": new_simulation_id(),
+            "timestamp": datetime.now().isoformat(),
+            "total_personas": persona_count,
+            "total_questions": len(interview_questions),
+            "total_hypotheses": len(hypotheses),
+        })
+        
+        for chunk_idx, start in enumerate(range(0, persona_count, chunk_size)):
+            chunk = PersonaTable(engine.generate_persona_arrays(min(chunk_size, persona_count - start), start=start))
+            chunk_results = InterviewTable(pools=pools)
+            engine.interview_panel(chunk, interview_questions, into=chunk_results)
+            
+            with stage_context(instrumentation, "serialization", len(chunk)):
+                sink.write_chunk(chunk_idx, chunk, chunk_results)
+            
+            # 청크를 한 샤드로 보고 부분 집계만 남깁니다
+            with stage_context(instrumentation, "validation", len(chunk)):
+                engine.personas = chunk
+                engine.interview_results = chunk_results
+                coordinator.add(shard_partial(engine, hypotheses, f"chunk-{chunk_idx}", running))
+            engine.personas = PersonaTable()
+            engine.interview_results = pools
+        
+        with stage_context(instrumentation, "validation", len(hypotheses)):
+            validation_results = coordinator.results(running)
+        financial_results = engine.run_financial_simulation(months=12, assumptions=bmc_financial_assumptions(bmc_data))
+        summary = build_summary(persona_count, len(interview_questions), validation_results, financial_results)
+        
+        sink.finish([hypothesis_to_dict(r) for r in validation_results], financial_results, engine.market_data, summary)
+    finally:
+        sink.close()
+    return summary
+
+def export_simulation(path: str, bmc_data: Dict, seed: int = None, persona_count: int = 20,
+                      questions: List[str] = None, fmt: str = None, chunk_size: int = 10000,
+                      instrumentation: Instrumentation = None) -> Dict[str, Any]:
+    """시뮬레이션을 스트리밍으로 실행하며 파일로 내보내기 (요약 반환)
+    
+    fmt: "jsonl" 또는 "columnar" (없으면 경로로 판단: .jsonl/.jsonl.gz는 JSONL, 그 외는 컬럼형 디렉터리)
+    """
+    
+    if fmt is None:
+        fmt = "jsonl" if path.endswith((".jsonl", ".jsonl.gz")) else "columnar"
+    if fmt == "jsonl":
+        sink = JsonlSink(path)
+    elif fmt == "columnar":
+        sink = ColumnarSink(path)
+    else:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+    return stream_simulation_to_sink(sink, bmc_data, seed, persona_count, questions, chunk_size, instrumentation)
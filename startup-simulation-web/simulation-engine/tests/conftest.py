@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 엔진 모듈은 simulation-engine 디렉터리 바로 아래에 있습니다
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,44 @@
+"""프로세스 풀 배치 실행기"""
+
+import json
+
+from batch_runner import run_batch, spawn_task_seeds
+from simulation_engine import SimulationAPI
+
+BMCS = [{"hypotheses": ["월 구독료 9,900원은 적정 가격이다"], "price": 9900 + 1000 * i} for i in range(4)]
+
+def stable(result):
+    return json.loads(json.dumps({k: v for k, v in result.items() if k not in ("simulation_id", "timestamp")}))
+
+def test_task_seeds_depend_only_on_the_task_index():
+    assert spawn_task_seeds(3, seed=42) == spawn_task_seeds(6, seed=42)[:3]
+    assert len(set(spawn_task_seeds(6, seed=42))) == 6
+
+def test_batch_results_match_create_simulation():
+    run = run_batch(BMCS + [{"hypotheses": None}], workers=2, seed=7)
+    tasks = sorted(run, key=lambda task: task.index)
+    
+    assert [task.index for task in tasks] == list(range(5))
+    for task, bmc in zip(tasks, BMCS):
+        assert task.ok
+        assert stable(task.result) == stable(SimulationAPI.create_simulation(bmc, seed=task.seed))
+    # 실패한 작업은 오류만 남기고 나머지 결과에는 영향을 주지 않습니다
+    assert not tasks[-1].ok and "Traceback" in tasks[-1].error
+    
+    stats = run.stats()
+    assert (stats.total, stats.succeeded, stats.failed, stats.workers) == (5, 4, 1, 2)
+    assert stats.latency_p50 <= stats.latency_p95 <= stats.latency_max
+
+def test_reiterating_a_finished_run_returns_the_same_results():
+    run = run_batch(BMCS[:2], workers=1, seed=3)
+    first = list(run)
+    assert list(run) == first
+    assert run.stats().total == 2
+
+def test_reiterating_after_a_partial_iteration_runs_again():
+    run = run_batch(BMCS[:3], workers=1, seed=3)
+    for _ in run:
+        break
+    results = list(run)
+    assert sorted(task.index for task in results) == [0, 1, 2]
+    assert run.stats().total == 3
@@ -0,0 +1,52 @@
+"""벤치마크 모음: 모든 단계 실행, 기준선 비교, 저장소 기준선 형식"""
+
+import json
+import os
+import sys
+
+import pytest
+
+BENCHMARK_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks")
+sys.path.insert(0, BENCHMARK_DIR)
+
+import bench_engine  # noqa: E402
+
+def test_every_stage_runs_at_a_small_size():
+    report = bench_engine.run_benchmarks([20], repeat=1, track_memory=True, log=lambda line: None)
+    assert set(report["results"]) == set(bench_engine.STAGES)
+    for name, by_size in report["results"].items():
+        assert by_size, name
+        for entry in by_size.values():
+            assert entry["seconds"] >= 0 and entry["peak_bytes"] > 0
+
+def test_reference_baseline_covers_every_stage():
+    with open(os.path.join(BENCHMARK_DIR, "baselines", "reference.json"), encoding="utf-8") as f:
+        baseline = json.load(f)
+    assert set(baseline["results"]) == set(bench_engine.STAGES)
+    assert {"python", "numpy", "machine", "note"} <= set(baseline["meta"])
+    for name, (_, _, fixed_sizes) in bench_engine.STAGES.items():
+        for size in fixed_sizes or [20, 1000, 10000]:
+            assert str(size) in baseline["results"][name], (name, size)
+
+def test_compare_reports_time_and_memory_regressions():
+    baseline = {"results": {"stage": {"100": {"seconds": 0.1, "peak_bytes": 1000},
+                                      "20": {"seconds": 0.0001, "peak_bytes": 1000}}}}
+    current = {"results": {"stage": {"100": {"seconds": 0.2, "peak_bytes": 2000},
+                                     "20": {"seconds": 0.0005, "peak_bytes": 1000}},
+                           "new_stage": {"100": {"seconds": 1.0}}}}
+    regressions = bench_engine.compare(current, baseline)
+    # 짧은 단계의 작은 시간 증가와 기준선에 없는 단계는 회귀로 보지 않습니다
+    assert len(regressions) == 2
+    assert all(line.startswith("stage n=100") for line in regressions)
+    assert bench_engine.compare(baseline, baseline) == []
+
+def test_cli_saves_and_compares_a_baseline(tmp_path, capsys):
+    path = str(tmp_path / "local.json")
+    args = ["--sizes", "20", "--stages", "interview_panel,validate_hypotheses", "--repeat", "1"]
+    assert bench_engine.main(args + ["--save", path]) == 0
+    with open(path, encoding="utf-8") as f:
+        assert set(json.load(f)["results"]) == {"interview_panel", "validate_hypotheses"}
+    # 허용 비율을 크게 두면 같은 기계의 재측정은 통과합니다
+    assert bench_engine.main(args + ["--compare", path, "--tolerance", "100", "--memory-tolerance", "100"]) == 0
+    with pytest.raises(SystemExit):
+        bench_engine.main(["--stages", "unknown"])
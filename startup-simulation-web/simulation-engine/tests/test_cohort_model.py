@@ -0,0 +1,78 @@
+"""코호트 재무 모델 테스트"""
+
+import numpy as np
+import pytest
+
+from cohort_model import project_cohorts, retention_curve, run_cohort_simulation
+from simulation_engine import FINANCIAL_DEFAULTS, SimulationEngine
+
+def naive_payback(signups, curve, unit_margin, marketing_cost):
+    """코호트마다 경과 월을 하나씩 더해 가며 획득 비용 회수 월을 찾는 기준 구현"""
+    
+    months = len(signups)
+    result = []
+    for c in range(months):
+        cac = marketing_cost / signups[c] if signups[c] > 0 else np.inf
+        cumulative, month = 0.0, 0
+        for a in range(months - c):
+            cumulative += curve[a] * unit_margin
+            if cumulative >= cac:
+                month = a + 1
+                break
+        result.append(month)
+    return result
+
+@pytest.mark.parametrize("retention", [("geometric",), ("sbg", 1.2, 4.0), ("power", 0.4), ("curve", [1.0, 0.6, 0.5])])
+def test_cohort_payback_matches_loop(retention):
+    params = dict(FINANCIAL_DEFAULTS, initial_users=50, arpu=29900, conversion_rate=0.2, marketing_cost=3000000)
+    months = 24
+    projection = project_cohorts(params, months, retention)
+    unit_margin = params["conversion_rate"] * params["arpu"] - params["variable_cost_per_user"]
+    expected = naive_payback(projection["signups"], projection["retention"], unit_margin, params["marketing_cost"])
+    assert projection["cohort_payback_month"].tolist() == expected
+    assert any(expected)
+
+def test_cohort_payback_per_scenario_matches_loop():
+    rng = np.random.default_rng(0)
+    scenarios, months = 40, 18
+    params = dict(FINANCIAL_DEFAULTS, initial_users=30,
+                  arpu=rng.uniform(9900, 39900, scenarios),
+                  churn_rate=rng.uniform(0.02, 0.2, scenarios),
+                  marketing_cost=rng.uniform(1e6, 5e6, scenarios))
+    projection = project_cohorts(params, months)
+    for i in range(scenarios):
+        unit_margin = FINANCIAL_DEFAULTS["conversion_rate"] * params["arpu"][i] - FINANCIAL_DEFAULTS["variable_cost_per_user"]
+        expected = naive_payback(projection["signups"][i], projection["retention"][i], unit_margin,
+                                 params["marketing_cost"][i])
+        assert projection["cohort_payback_month"][i].tolist() == expected
+
+def test_cohort_matrix_sums_to_users():
+    months = 12
+    projection = project_cohorts(dict(FINANCIAL_DEFAULTS, initial_users=5), months, ("sbg", 1.0, 3.0),
+                                 cohort_matrix=True)
+    matrix = projection["cohort_matrix"]
+    assert matrix.shape == (months, months)
+    assert np.allclose(matrix.sum(axis=0), projection["users"])
+    assert np.allclose(np.diag(matrix), projection["signups"])
+    assert np.all(np.tril(matrix, -1) == 0)
+    curve = retention_curve(("sbg", 1.0, 3.0), months)
+    assert np.allclose(matrix[3, 3:], projection["signups"][3] * curve[:months - 3])
+    assert "cohort_matrix" not in project_cohorts(FINANCIAL_DEFAULTS, months)
+
+def test_run_cohort_simulation_cohort_matrix():
+    engine = SimulationEngine({}, columnar=True, seed=4)
+    engine.personas = engine.generate_personas(30)
+    
+    result = run_cohort_simulation(engine, months=6, cohort_matrix=True)
+    matrix = np.array(result["cohorts"]["matrix"])
+    assert np.allclose(matrix.sum(axis=0), result["users"])
+    assert "matrix" not in run_cohort_simulation(engine, months=6)["cohorts"]
+    
+    summary = run_cohort_simulation(engine, months=6, scenarios=50, cohort_matrix=True)
+    assert np.array(summary["cohort_matrix"]).shape == (6, 6)
+    assert len(summary["cohort_payback"]["reached_probability"]) == 6
+
+def test_small_cohorts_do_not_round_to_zero():
+    projection = project_cohorts(dict(FINANCIAL_DEFAULTS, initial_users=3), 12)
+    assert np.all(projection["signups"] > 0)
+    assert projection["users"][-1] > 3
@@ -0,0 +1,89 @@
+"""컬럼형 PersonaTable/InterviewTable과 기존 리스트/dict 저장의 동등성"""
+
+from dataclasses import replace
+
+import pytest
+
+from simulation_engine import (
+    SimulationEngine, PersonaTable, InterviewTable, InterviewResponse, ResponseSentiment, DEFAULT_INTERVIEW_QUESTIONS
+)
+
+HYPOTHESES = [
+    "월 구독료 9,900원은 적정 가격이다",
+    "핵심 기능의 사용성이 경쟁 제품보다 중요하다",
+    "소셜 미디어 마케팅이 효과적이다",
+]
+
+def response(answer, sentiment=ResponseSentiment.POSITIVE, confidence=0.8):
+    return InterviewResponse("가격이 적정한가요?", answer, sentiment, confidence, ["가격"])
+
+def test_persona_table_round_trip():
+    personas = SimulationEngine({}, seed=3).generate_personas(40, batched=True)
+    table = PersonaTable.from_personas(personas)
+    assert list(table) == personas
+    assert table.ids == [p.id for p in personas]
+    assert table.position_of("persona_7") == 6
+    assert table.position_of("alice") == -1
+
+def test_persona_table_rejects_values_outside_catalogs():
+    persona = SimulationEngine({}, seed=3).generate_personas(1, batched=True)[0]
+    for custom in (replace(persona, id="alice"), replace(persona, id="persona_abc"), replace(persona, id="persona_01"),
+                   replace(persona, name="A"), replace(persona, occupation="우주비행사"),
+                   replace(persona, income_range="비공개"), replace(persona, pain_points=["기타"])):
+        assert not PersonaTable.can_encode([persona, custom])
+        with pytest.raises(ValueError):
+            PersonaTable.from_personas([custom])
+
+def test_interview_table_accepts_any_persona_id():
+    table = InterviewTable()
+    results = {
+        "alice": [response("좋아요")],
+        "persona_3": [response("비싸요", ResponseSentiment.NEGATIVE)],
+        "persona_abc": [response("글쎄요", ResponseSentiment.NEUTRAL, 0.5)],
+        7: [response("괜찮아요")],
+    }
+    for pid, responses in results.items():
+        table[pid] = responses
+    
+    assert list(table) == list(results)
+    assert dict(table.items()) == results
+    assert table["persona_abc"] == results["persona_abc"]
+    assert list(table.to_records()) == list(results)
+    with pytest.raises(KeyError):
+        table["bob"]
+    with pytest.raises(KeyError):
+        table["persona_9"]
+    
+    # dict처럼 기존 응답을 교체하고 순서는 유지합니다
+    table["alice"] = [response("다시 생각하니 좋아요"), response("추천합니다")]
+    assert list(table) == list(results)
+    assert [r.answer for r in table["alice"]] == ["다시 생각하니 좋아요", "추천합니다"]
+    assert table.num_rows == 5
+
+def test_list_and_columnar_engines_store_the_same_interviews():
+    personas = SimulationEngine({}, seed=3).generate_personas(60, batched=True)
+    results = []
+    for columnar in (False, True):
+        engine = SimulationEngine({}, columnar=columnar, seed=11)
+        engine.personas = PersonaTable.from_personas(personas) if columnar else list(personas)
+        for persona in personas:
+            engine.conduct_interviews(persona, DEFAULT_INTERVIEW_QUESTIONS)
+        # 같은 페르소나를 다시 인터뷰하면 두 엔진 모두 응답을 교체합니다
+        engine.conduct_interviews(personas[5], DEFAULT_INTERVIEW_QUESTIONS)
+        records = {pid: [(r.question, r.answer, r.sentiment, r.confidence, r.keywords) for r in responses]
+                   for pid, responses in engine.interview_results.items()}
+        results.append((records, engine.validate_hypotheses(HYPOTHESES)))
+    
+    (list_records, list_results), (columnar_records, columnar_results) = results
+    assert list(list_records) == list(columnar_records)
+    assert list_records == columnar_records
+    assert list_results == columnar_results
+
+def test_interview_panel_falls_back_for_custom_personas():
+    persona = SimulationEngine({}, seed=3).generate_personas(1, batched=True)[0]
+    custom = [replace(persona, id="alice", name="Alice"), replace(persona, id="bob", occupation="우주비행사")]
+    engine = SimulationEngine({}, seed=5)
+    engine.personas = custom
+    table = engine.interview_panel(custom, DEFAULT_INTERVIEW_QUESTIONS)
+    assert list(table) == ["alice", "bob"]
+    assert [r.question for r in table["bob"]] == DEFAULT_INTERVIEW_QUESTIONS
@@ -0,0 +1,82 @@
+"""소셜 그래프 채택 확산"""
+
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+import diffusion
+from diffusion import build_social_graph, simulate_diffusion, run_diffusion, adopters_to_new_users
+from simulation_engine import SimulationEngine, SEGMENTS
+
+@pytest.fixture(scope="module")
+def panel():
+    return SimulationEngine({}, columnar=True, seed=7).generate_personas(3000)
+
+def test_social_graph_structure(panel):
+    graph = build_social_graph(panel, np.random.default_rng(1), mean_degree=20, homophily=0.7)
+    assert graph.num_nodes == len(panel)
+    assert np.all(np.diff(graph.indptr) >= 0) and graph.indptr[-1] == graph.num_edges
+    assert graph.indices.min() >= 0 and graph.indices.max() < len(panel)
+    
+    source = np.repeat(np.arange(graph.num_nodes), graph.out_degrees())
+    assert not np.any(graph.indices == source)
+    assert abs(graph.num_edges / graph.num_nodes - 20) < 1
+    # homophily 비율 + 나머지 중 우연히 같은 세그먼트인 비율
+    segment = panel.columns["segment"]
+    same = np.mean(segment[source] == segment[graph.indices])
+    assert 0.7 < same < 0.85
+    # 영향력이 큰 페르소나일수록 지인이 많습니다
+    influence = panel.columns["social_influence"]
+    degrees = graph.out_degrees()
+    assert degrees[influence >= 8].mean() > degrees[influence <= 4].mean()
+
+def test_propagate_matches_dense_product(panel, monkeypatch):
+    graph = build_social_graph(panel[:400], np.random.default_rng(2))
+    dense = np.zeros((graph.num_nodes, graph.num_nodes))
+    source = np.repeat(np.arange(graph.num_nodes), graph.out_degrees())
+    np.add.at(dense, (source, graph.indices), 1)
+    x = (np.random.default_rng(3).random(graph.num_nodes) < 0.2).astype(np.float64)
+    
+    expected = dense.T @ x
+    np.testing.assert_allclose(graph.propagate(x), expected)
+    # 간선 묶음 크기를 줄여도 결과는 같습니다
+    monkeypatch.setattr(diffusion, "PROPAGATE_BLOCK_EDGES", 7)
+    np.testing.assert_allclose(graph.propagate(x), expected)
+
+@pytest.mark.parametrize("model", ["bass", "threshold"])
+def test_diffusion_totals_are_consistent(panel, model):
+    result = simulate_diffusion(panel, 24, np.random.default_rng(4), model=model)
+    cumulative = np.array(result["cumulative_adopters"])
+    assert np.all(np.diff(cumulative) >= 0) and cumulative[-1] <= len(panel)
+    assert cumulative.tolist() == np.cumsum(result["new_adopters"]).tolist()
+    by_segment = np.array([result["by_segment"][s.value] for s in SEGMENTS])
+    assert by_segment.sum(axis=0).tolist() == cumulative.tolist()
+    assert result == simulate_diffusion(panel, 24, np.random.default_rng(4), model=model)
+
+def test_more_imitation_spreads_faster(panel):
+    graph = build_social_graph(panel, np.random.default_rng(5))
+    slow = simulate_diffusion(panel, 12, np.random.default_rng(6), graph=graph, imitation=0.05)
+    fast = simulate_diffusion(panel, 12, np.random.default_rng(6), graph=graph, imitation=0.8)
+    assert fast["cumulative_adopters"][-1] > slow["cumulative_adopters"][-1]
+    with pytest.raises(ValueError):
+        simulate_diffusion(panel, 12, np.random.default_rng(6), model="sir")
+
+def test_list_personas_with_custom_values_diffuse_like_the_table(panel):
+    personas = list(panel[:500])
+    custom = [replace(p, id=f"customer-{i}", name="고객", occupation="우주비행사") for i, p in enumerate(personas)]
+    expected = simulate_diffusion(panel[:500], 12, np.random.default_rng(8))
+    assert simulate_diffusion(custom, 12, np.random.default_rng(8)) == expected
+    
+    engine = SimulationEngine({}, seed=9)
+    engine.personas = custom
+    assert run_diffusion(engine, months=6)["graph"]["nodes"] == 500
+
+def test_adopters_feed_the_financial_model(panel):
+    result = simulate_diffusion(panel, 12, np.random.default_rng(10))
+    new_users = adopters_to_new_users(result, market_users=300000)
+    assert new_users == [int(n * 300000 / len(panel)) for n in result["new_adopters"]]
+    projection = SimulationEngine({}).run_financial_simulation(months=12, new_users=new_users)
+    assert projection["users"][0] == 10 + new_users[0] - int(10 * 0.05)
+    with pytest.raises(ValueError):
+        SimulationEngine({}).run_financial_simulation(months=12, new_users=new_users[:6])
@@ -0,0 +1,74 @@
+"""재무 시뮬레이션: 벡터 계산(project_financials)과 몬테카를로 요약"""
+
+import numpy as np
+import pytest
+
+from simulation_engine import (
+    SimulationEngine, FINANCIAL_DEFAULTS, MONTE_CARLO_DISTRIBUTIONS, project_financials, sample_parameter
+)
+
+ASSUMPTIONS = [
+    {},
+    {"arpu": 19900, "conversion_rate": 0.2},
+    {"initial_users": 500, "monthly_growth_rate": 0.3, "churn_rate": 0.02},
+    {"fixed_costs": 1000000, "marketing_cost": 0, "variable_cost_per_user": 200},
+]
+
+def assert_projection_matches(projection, expected, months):
+    for key in ("users", "revenue", "costs", "profit", "cumulative_profit"):
+        assert projection[key].tolist() == expected[key], key
+    metrics = expected["metrics"]
+    assert int(projection["break_even_month"]) == (metrics["break_even_month"] or 0)
+    assert float(projection["total_revenue"]) == metrics["total_revenue"]
+    assert float(projection["total_costs"]) == metrics["total_costs"]
+    assert float(projection["roi"]) == pytest.approx(metrics["roi"])
+    assert len(projection["users"]) == months
+
+@pytest.mark.parametrize("assumptions", ASSUMPTIONS)
+def test_project_financials_matches_monthly_loop(assumptions):
+    expected = SimulationEngine({}).run_financial_simulation(months=24, assumptions=assumptions)
+    assert_projection_matches(project_financials(assumptions, 24), expected, 24)
+
+def test_project_financials_broadcasts_parameter_arrays():
+    params = {name: np.array([a.get(name, default) for a in ASSUMPTIONS]) for name, default in FINANCIAL_DEFAULTS.items()}
+    projection = project_financials(params, 18)
+    for row, assumptions in enumerate(ASSUMPTIONS):
+        expected = SimulationEngine({}).run_financial_simulation(months=18, assumptions=assumptions)
+        assert_projection_matches({key: values[row] for key, values in projection.items()}, expected, 18)
+
+def test_monte_carlo_with_fixed_parameters_collapses_to_the_deterministic_path():
+    assumptions = {"initial_users": 2000, "arpu": 29900, "fixed_costs": 1000000, "marketing_cost": 1000000}
+    fixed = {name: ("fixed", assumptions.get(name, value)) for name, value in FINANCIAL_DEFAULTS.items()}
+    summary = SimulationEngine({}, seed=1).run_monte_carlo_simulation(scenarios=50, months=12, distributions=fixed)
+    expected = SimulationEngine({}).run_financial_simulation(months=12, assumptions=assumptions)
+    
+    for key in ("users", "revenue", "profit", "cumulative_profit"):
+        band = summary["bands"][key]
+        assert band["p5"] == band["p50"] == band["p95"] == expected[key]
+    break_even = expected["metrics"]["break_even_month"]
+    assert break_even is not None
+    assert summary["break_even"]["probability_by_month"][break_even - 1] == 1.0
+    assert summary["break_even"]["median_month"] == break_even
+    assert summary["metrics"]["roi"]["p50"] == pytest.approx(expected["metrics"]["roi"])
+
+def test_monte_carlo_summary_is_seeded_and_consistent():
+    runs = [SimulationEngine({}, seed=4).run_monte_carlo_simulation(scenarios=2000, months=24) for _ in range(2)]
+    assert runs[0] == runs[1]
+    
+    summary = runs[0]
+    for band in summary["bands"].values():
+        assert np.all(np.array(band["p5"]) <= np.array(band["p50"]))
+        assert np.all(np.array(band["p50"]) <= np.array(band["p95"]))
+    break_even = summary["break_even"]
+    assert break_even["cumulative_probability"][-1] + break_even["never_probability"] == pytest.approx(1.0)
+    assert summary["metrics"]["roi"]["p5"] <= summary["metrics"]["roi"]["p95"]
+
+def test_sample_parameter_clips_and_rejects_unknown_distributions():
+    rng = np.random.default_rng(0)
+    churn = sample_parameter("churn_rate", ("normal", 0.05, 1.0), 1000, rng)
+    assert churn.min() == 0.0 and churn.max() == 1.0
+    users = sample_parameter("initial_users", ("uniform", 0.0, 10.0), 1000, rng)
+    assert np.array_equal(users, np.round(users))
+    assert sample_parameter("arpu", MONTE_CARLO_DISTRIBUTIONS["arpu"], 1000, rng).min() >= 0
+    with pytest.raises(ValueError):
+        sample_parameter("arpu", ("cauchy", 0, 1), 10, rng)
@@ -0,0 +1,100 @@
+"""증분 재시뮬레이션 테스트"""
+
+import copy
+
+from incremental import IncrementalSimulation
+from simulation_engine import (
+    DEFAULT_INTERVIEW_QUESTIONS, FINANCIAL_DEFAULTS, PRICE_QUESTION_INDEX, PRICE_QUESTION_TEMPLATE,
+    bmc_financial_assumptions, bmc_interview_questions
+)
+
+PRICE_HYPOTHESIS = "월 구독료는 적정 가격이다"
+FEATURE_HYPOTHESIS = "핵심 기능이 가장 중요하다"
+
+def base_bmc():
+    return {"hypotheses": [PRICE_HYPOTHESIS, FEATURE_HYPOTHESIS]}
+
+def comparable(result):
+    """실행마다 달라지는 ID/시각을 뺀 결과"""
+    return {key: value for key, value in result.items() if key not in ("simulation_id", "timestamp")}
+
+def test_bmc_price_sets_question_and_arpu():
+    assert bmc_interview_questions({}) == DEFAULT_INTERVIEW_QUESTIONS
+    assert bmc_financial_assumptions({}) == {}
+    
+    questions = bmc_interview_questions({"price": 14900})
+    assert questions[PRICE_QUESTION_INDEX] == PRICE_QUESTION_TEMPLATE.format(price=14900)
+    assert "14,900원" in questions[PRICE_QUESTION_INDEX]
+    assert [q for i, q in enumerate(questions) if i != PRICE_QUESTION_INDEX] == \
+        [q for i, q in enumerate(DEFAULT_INTERVIEW_QUESTIONS) if i != PRICE_QUESTION_INDEX]
+    
+    assert bmc_financial_assumptions({"price": 14900}) == {"arpu": 14900}
+    # financial_assumptions가 price보다 우선합니다
+    assert bmc_financial_assumptions({"price": 14900, "financial_assumptions": {"arpu": 100, "churn_rate": 0.1}}) == \
+        {"arpu": 100, "churn_rate": 0.1}
+
+def test_first_run_computes_everything_and_repeat_nothing():
+    session = IncrementalSimulation(seed=7, persona_count=10)
+    first = session.run(base_bmc())
+    assert session.last_recomputed == {
+        "personas": True, "interviews": DEFAULT_INTERVIEW_QUESTIONS,
+        "hypotheses": [PRICE_HYPOTHESIS, FEATURE_HYPOTHESIS], "financial": True,
+    }
+    second = session.run(base_bmc())
+    assert session.last_recomputed == {"personas": False, "interviews": [], "hypotheses": [], "financial": False}
+    assert comparable(second) == comparable(first)
+
+def test_adding_hypothesis_validates_only_new_one():
+    session = IncrementalSimulation(seed=7, persona_count=10)
+    bmc = base_bmc()
+    first = session.run(bmc)
+    bmc["hypotheses"].append("경쟁사 대비 차별화가 필요하다")
+    second = session.run(bmc)
+    assert session.last_recomputed["interviews"] == []
+    assert session.last_recomputed["hypotheses"] == ["경쟁사 대비 차별화가 필요하다"]
+    assert not session.last_recomputed["financial"]
+    assert second["validation_results"][:2] == first["validation_results"]
+
+def test_price_change_recomputes_price_question_and_financials():
+    session = IncrementalSimulation(seed=7, persona_count=10)
+    first = session.run(base_bmc())
+    bmc = dict(base_bmc(), price=14900)
+    second = session.run(bmc)
+    
+    price_question = PRICE_QUESTION_TEMPLATE.format(price=14900)
+    assert session.last_recomputed["interviews"] == [price_question]
+    # 가격 질문과 관련된 가설만 다시 검증합니다
+    assert session.last_recomputed["hypotheses"] == [PRICE_HYPOTHESIS]
+    assert session.last_recomputed["financial"]
+    assert second["validation_results"][1] == first["validation_results"][1]
+    
+    # 가격은 ARPU로 들어갑니다
+    users = second["financial_projection"]["users"]
+    paying = [int(u * FINANCIAL_DEFAULTS["conversion_rate"]) for u in users]
+    assert second["financial_projection"]["revenue"] == [p * 14900 for p in paying]
+    
+    for pid, responses in second["interview_results"].items():
+        before = first["interview_results"][pid]
+        for i, (old, new) in enumerate(zip(before, responses)):
+            if i == PRICE_QUESTION_INDEX:
+                assert new["question"] == price_question
+            else:
+                assert new == old
+    
+    # 값을 되돌리면 보관해 둔 결과를 그대로 씁니다 (가설 검증만 다시 합니다)
+    third = session.run(base_bmc())
+    assert session.last_recomputed["interviews"] == []
+    assert not session.last_recomputed["financial"]
+    assert comparable(third) == comparable(first)
+
+def test_result_does_not_depend_on_edit_order():
+    edited = IncrementalSimulation(seed=11, persona_count=8)
+    bmc = base_bmc()
+    edited.run(bmc)
+    bmc = dict(copy.deepcopy(bmc), price=19900)
+    edited.run(bmc)
+    bmc["hypotheses"].append("마케팅 채널 발견이 어렵다")
+    incremental = edited.run(bmc)
+    
+    fresh = IncrementalSimulation(seed=11, persona_count=8).run(bmc)
+    assert comparable(incremental) == comparable(fresh)
@@ -0,0 +1,90 @@
+"""단계별 계측: 진단 블록, 누적, Prometheus 출력, 트레이싱 콜백"""
+
+import pytest
+
+from instrumentation import Instrumentation, NULL_STAGE, stage_context, otel_span_callback
+from simulation_engine import SimulationAPI, SimulationEngine
+
+BMC = {"hypotheses": ["월 구독료 9,900원은 적정 가격이다", "핵심 기능의 사용성이 경쟁 제품보다 중요하다"]}
+
+def test_create_simulation_reports_stage_diagnostics():
+    result = SimulationAPI.create_simulation(BMC, seed=1, persona_count=50, diagnostics=True)
+    stages = result["diagnostics"]["stages"]
+    assert {"personas", "interviews", "validation", "financial", "serialization"} <= set(stages)
+    assert stages["personas"]["items"] == 50
+    assert stages["interviews"]["items"] == 50 * 5
+    assert stages["validation"]["items"] == 2
+    for metrics in stages.values():
+        assert metrics["calls"] >= 1 and metrics["wall_time"] >= 0
+        assert isinstance(metrics["net_block_delta"], int)
+    # 계측해도 결과는 같습니다
+    plain = SimulationAPI.create_simulation(BMC, seed=1, persona_count=50)
+    assert result["validation_results"] == plain["validation_results"]
+
+def test_shared_instrumentation_accumulates_runs():
+    shared = Instrumentation()
+    for seed in (1, 2):
+        SimulationAPI.create_simulation(BMC, seed=seed, persona_count=30, instrumentation=shared)
+    metrics = shared.metrics()
+    assert metrics["personas"].calls == 2
+    assert metrics["personas"].items == 60
+    shared.reset()
+    assert shared.metrics() == {}
+
+def test_nested_stage_is_counted_once_and_errors_are_recorded():
+    spans = []
+    instrumentation = Instrumentation(on_span=spans.append)
+    engine = SimulationEngine({}, columnar=True, seed=1, instrumentation=instrumentation)
+    with instrumentation.stage("personas", 10):
+        engine.generate_personas(10)
+    assert instrumentation.metrics()["personas"].calls == 1
+    
+    with pytest.raises(ZeroDivisionError):
+        with instrumentation.stage("financial"):
+            1 / 0
+    assert spans[-1].name == "financial" and spans[-1].attributes["error"] == "ZeroDivisionError"
+    assert stage_context(None, "personas") is NULL_STAGE
+
+def test_prometheus_and_openmetrics_output():
+    instrumentation = Instrumentation()
+    with instrumentation.stage('stage "a"', 3):
+        pass
+    text = instrumentation.to_prometheus()
+    assert "# TYPE simulation_stage_calls_total counter" in text
+    assert 'simulation_stage_calls_total{stage="stage \\"a\\""} 1' in text
+    assert 'simulation_stage_items_total{stage="stage \\"a\\""} 3' in text
+    assert "# TYPE simulation_stage_net_block_delta gauge" in text
+    
+    openmetrics = instrumentation.to_prometheus(openmetrics=True)
+    assert "# TYPE simulation_stage_calls counter" in openmetrics
+    assert openmetrics.endswith("# EOF\n")
+
+def test_otel_callback_sends_one_span_per_stage():
+    class Span:
+        def __init__(self, name, start_time):
+            self.name, self.start_time, self.attributes, self.end_time = name, start_time, {}, None
+        
+        def set_attribute(self, key, value):
+            self.attributes[key] = value
+        
+        def end(self, end_time):
+            self.end_time = end_time
+    
+    class Tracer:
+        def __init__(self):
+            self.spans = []
+        
+        def start_span(self, name, start_time):
+            self.spans.append(Span(name, start_time))
+            return self.spans[-1]
+    
+    tracer = Tracer()
+    instrumentation = Instrumentation(on_span=otel_span_callback(tracer))
+    with instrumentation.stage("validation", 4, hypotheses=2):
+        pass
+    (span,) = tracer.spans
+    assert span.name == "simulation.validation"
+    assert span.attributes["simulation.items"] == 4
+    assert span.attributes["simulation.hypotheses"] == 2
+    assert "simulation.net_block_delta" in span.attributes
+    assert span.end_time >= span.start_time
@@ -0,0 +1,45 @@
+"""질문 단위 일괄 인터뷰(interview_panel)와 페르소나별 인터뷰의 비교"""
+
+from collections import Counter
+
+from simulation_engine import (
+    SimulationEngine, RESPONSE_RULES, DEFAULT_INTERVIEW_QUESTIONS, classify_question
+)
+
+QUESTIONS = DEFAULT_INTERVIEW_QUESTIONS + ["경쟁 제품과 비교하면 어떤가요?"]
+
+def test_panel_answers_follow_the_per_persona_rules():
+    engine = SimulationEngine({}, columnar=True, seed=21)
+    personas = engine.generate_personas(400)
+    panel = engine.interview_panel(personas, QUESTIONS)
+    
+    reference = SimulationEngine({}, seed=22)
+    for persona in personas:
+        expected = reference.conduct_interviews(persona, QUESTIONS)
+        actual = panel[persona.id]
+        assert [r.question for r in actual] == QUESTIONS
+        for got, want in zip(actual, expected):
+            # 감정/신뢰도/키워드는 특성으로 정해지고, 답변만 같은 티어 후보 중에서 무작위로 고릅니다
+            assert (got.sentiment, got.confidence, got.keywords) == (want.sentiment, want.confidence, want.keywords)
+            tier_answers = [answers for sentiment, confidence, answers in RESPONSE_RULES[classify_question(got.question)]["tiers"]
+                            if (sentiment, confidence) == (got.sentiment, got.confidence)]
+            assert any(got.answer in answers for answers in tier_answers)
+
+def test_panel_answer_choice_is_uniform_within_a_tier():
+    engine = SimulationEngine({}, columnar=True, seed=3)
+    personas = engine.generate_personas(6000)
+    panel = engine.interview_panel(personas, ["앞으로 어떤 점을 기대하시나요?"])
+    counts = Counter(r.answer for responses in panel.values() for r in responses)
+    answers = RESPONSE_RULES["general"]["tiers"][0][2]
+    assert set(counts) == set(answers)
+    assert all(abs(counts[a] / 6000 - 1 / len(answers)) < 0.03 for a in answers)
+
+def test_panel_is_reproducible_and_appends_to_interview_results():
+    tables = []
+    for _ in range(2):
+        engine = SimulationEngine({}, columnar=True, seed=8)
+        engine.interview_panel(engine.generate_personas(50), QUESTIONS[:2])
+        engine.interview_panel(engine.personas, QUESTIONS[2:])
+        tables.append(engine.interview_results)
+    assert tables[0].to_records() == tables[1].to_records()
+    assert all(len(responses) == len(QUESTIONS) for responses in tables[0].values())
@@ -0,0 +1,70 @@
+"""키워드 다중 패턴 매칭 테스트 (단순 부분 문자열 검사와 비교)"""
+
+import numpy as np
+
+from keyword_matcher import KeywordAutomaton, KeywordMatcher, QuestionRouter
+from simulation_engine import QUESTION_ROUTES, classify_question
+
+def naive_find(patterns, text):
+    return frozenset(pid for pid, pattern in enumerate(patterns) if pattern in text)
+
+def naive_classify(routes, question, default="general"):
+    question = question.lower()
+    for category, clauses in routes:
+        if any(all(term in question for term in clause) for clause in clauses):
+            return category
+    return default
+
+def random_texts(rng, alphabet, count, max_len=30):
+    return ["".join(rng.choice(list(alphabet), size=rng.integers(0, max_len))) for _ in range(count)]
+
+def test_automaton_matches_substring_check():
+    rng = np.random.default_rng(0)
+    # 서로 겹치거나 다른 패턴의 접미사인 패턴 포함
+    patterns = ["a", "ab", "bab", "abc", "c", "bca", "aaa", "cab", "", "abcabc"]
+    automaton = KeywordAutomaton(patterns)
+    for text in random_texts(rng, "abcd", 2000):
+        assert automaton.find(text) == naive_find(automaton.patterns, text)
+
+def test_automaton_matches_korean_keywords():
+    patterns = ["가격", "가격이", "비용", "용", "구독료", "독"]
+    automaton = KeywordAutomaton(patterns)
+    rng = np.random.default_rng(1)
+    for text in random_texts(rng, "가격이비용구독료 ", 1000):
+        assert automaton.find(text) == naive_find(patterns, text)
+    assert automaton.find_terms("월 구독료와 가격이") == ["가격", "가격이", "구독료", "독"]
+
+def test_duplicate_patterns_are_registered_once():
+    automaton = KeywordAutomaton(["ab", "b", "ab"])
+    assert automaton.patterns == ["ab", "b"]
+    assert automaton.find("xab") == frozenset({0, 1})
+
+def test_router_matches_naive_rules():
+    rng = np.random.default_rng(2)
+    words = ["가격", "비용", "기능", "경쟁", "어떻게", "알게", "how", "hear about", "find out",
+             "Price", "COMPARE", "feature", "날씨", "좋아요", "subscription"]
+    for _ in range(1000):
+        question = " ".join(rng.choice(words, size=rng.integers(0, 5)))
+        assert classify_question(question) == naive_classify(QUESTION_ROUTES, question)
+
+def test_router_respects_route_priority():
+    router = QuestionRouter([("first", [["b"]]), ("second", [["a", "b"]]), ("third", [["a"]])], default="none")
+    assert router.classify("ab") == "first"
+    assert router.classify("a") == "third"
+    assert router.classify("c") == "none"
+    assert classify_question("가격과 기능을 비교해 주세요") == "price"
+    assert classify_question("How did you hear about us?") == "discovery"
+
+def test_keyword_matcher_matches_substring_check():
+    keywords = ["가격", "비용", "예산", "가치", "기능", "경쟁", "Price"]
+    matcher = KeywordMatcher(keywords)
+    rng = np.random.default_rng(3)
+    for text in random_texts(rng, "가격비용예산치기능경쟁price ", 1000):
+        expected = tuple(k for k in keywords if k in text.lower())
+        assert matcher.matches(text) == expected
+    # "Price"는 소문자로 바뀐 텍스트에 들어 있을 수 없습니다
+    assert matcher.matches("PRICE") == ()
+
+def test_compile_reuses_matcher_for_same_keywords():
+    assert KeywordMatcher.compile(["b", "a"]) is KeywordMatcher.compile({"a", "b", "a"})
+    assert KeywordMatcher.compile(["b", "a"]).keywords == ["a", "b"]
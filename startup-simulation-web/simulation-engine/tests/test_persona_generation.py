@@ -0,0 +1,78 @@
+"""일괄(배열) 페르소나 생성과 기존 페르소나별 루프의 분포 비교"""
+
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from simulation_engine import (
+    SimulationEngine, PersonaTable, CustomerSegment, PAIN_POINT_CATALOG, NEED_CATALOG, TRAIT_NAMES
+)
+
+COUNT = 10000
+
+@pytest.fixture(scope="module")
+def generated():
+    loop = SimulationEngine({}, seed=1).generate_personas(COUNT)
+    batched = PersonaTable(SimulationEngine({}, seed=2).generate_persona_arrays(COUNT)).to_personas()
+    return loop, batched
+
+def proportions(values, categories):
+    counts = Counter(values)
+    return np.array([counts[c] / len(values) for c in categories])
+
+def test_segment_gender_and_catalog_frequencies_match(generated):
+    loop, batched = generated
+    # 비율의 표준오차는 0.005 이하이므로 0.02 차이는 우연으로 보기 어렵습니다
+    for attribute, categories in (
+        ("segment", list(CustomerSegment)),
+        ("gender", ["남성", "여성"]),
+        ("occupation", sorted({p.occupation for p in loop})),
+        ("income_range", sorted({p.income_range for p in loop})),
+    ):
+        expected = proportions([getattr(p, attribute) for p in loop], categories)
+        actual = proportions([getattr(p, attribute) for p in batched], categories)
+        np.testing.assert_allclose(actual, expected, atol=0.02, err_msg=attribute)
+    
+    for attribute, catalog in (("pain_points", PAIN_POINT_CATALOG), ("needs", NEED_CATALOG)):
+        for k in (2, 3, 4):
+            expected = np.mean([len(getattr(p, attribute)) == k for p in loop])
+            actual = np.mean([len(getattr(p, attribute)) == k for p in batched])
+            assert abs(actual - expected) < 0.02, (attribute, k)
+        expected = proportions([item for p in loop for item in getattr(p, attribute)], catalog)
+        actual = proportions([item for p in batched for item in getattr(p, attribute)], catalog)
+        np.testing.assert_allclose(actual, expected, atol=0.01, err_msg=attribute)
+
+@pytest.mark.parametrize("segment", [CustomerSegment.EARLY_ADOPTER, CustomerSegment.EARLY_MAJORITY,
+                                     CustomerSegment.LATE_MAJORITY, CustomerSegment.LAGGARD])
+def test_age_and_traits_by_segment_match(generated, segment):
+    loop, batched = generated
+    loop = [p for p in loop if p.segment == segment]
+    batched = [p for p in batched if p.segment == segment]
+    
+    ages = np.array([p.age for p in loop]), np.array([p.age for p in batched])
+    assert ages[1].min() >= 20 and ages[1].max() <= 65
+    assert abs(ages[1].mean() - ages[0].mean()) < 1.0
+    assert abs(ages[1].std() - ages[0].std()) < 1.0
+    
+    for trait in TRAIT_NAMES:
+        expected = [getattr(p, trait) for p in loop]
+        actual = [getattr(p, trait) for p in batched]
+        # 특성 점수는 세그먼트별 같은 구간에서 균등하게 뽑힙니다
+        assert set(actual) == set(expected), trait
+        values = sorted(set(expected))
+        np.testing.assert_allclose(proportions(actual, values), proportions(expected, values), atol=0.05,
+                                   err_msg=trait)
+
+def test_batched_catalog_items_come_back_in_catalog_order(generated):
+    loop, batched = generated
+    for persona in batched:
+        assert persona.pain_points == sorted(persona.pain_points, key=PAIN_POINT_CATALOG.index)
+        assert persona.needs == sorted(persona.needs, key=NEED_CATALOG.index)
+    # 기존 루프는 추출 순서 그대로이므로 카탈로그 순서가 아닌 경우가 있습니다
+    assert any(p.pain_points != sorted(p.pain_points, key=PAIN_POINT_CATALOG.index) for p in loop)
+    
+    # 같은 seed면 일괄 생성 결과는 list/컬럼형 엔진에서 같습니다
+    listed = SimulationEngine({}, seed=5).generate_personas(50, batched=True)
+    table = SimulationEngine({}, columnar=True, seed=5).generate_personas(50)
+    assert listed == list(table)
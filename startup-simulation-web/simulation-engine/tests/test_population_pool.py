@@ -0,0 +1,67 @@
+"""memmap 인구 풀 테스트"""
+
+import os
+import threading
+
+import numpy as np
+
+from population_pool import CURRENT_POINTER, build_population, get_population
+
+def test_sample_is_unique_and_sorted(tmp_path):
+    pool = build_population(str(tmp_path), 500, seed=3, block_size=128)
+    indices = pool.sample_indices(200, np.random.default_rng(0))
+    assert len(np.unique(indices)) == 200
+    assert np.all(np.diff(indices) > 0)
+    panel = pool.take(indices)
+    assert np.array_equal(panel.columns["index"], pool.columns["index"][indices])
+
+def test_same_seed_builds_same_population(tmp_path):
+    a = build_population(str(tmp_path / "a"), 300, seed=5, block_size=64)
+    b = build_population(str(tmp_path / "b"), 300, seed=5, block_size=64)
+    for name in a.columns:
+        assert np.array_equal(a.columns[name], b.columns[name])
+
+def test_get_population_switches_after_rebuild(tmp_path):
+    directory = str(tmp_path)
+    build_population(directory, 100, seed=1)
+    old = get_population(directory)
+    assert get_population(directory) is old
+    
+    build_population(directory, 100, seed=2)
+    new = get_population(directory)
+    assert new.fingerprint != old.fingerprint
+    assert new.path != old.path
+    # 이미 연 이전 버전은 계속 읽을 수 있습니다
+    assert len(old.table()) == 100
+    assert np.array_equal(old.columns["index"], np.arange(100))
+
+def test_rebuild_keeps_current_and_previous_only(tmp_path):
+    directory = str(tmp_path)
+    for seed in range(3):
+        build_population(directory, 50, seed=seed)
+    names = os.listdir(directory)
+    assert len([name for name in names if name.startswith("v-")]) == 2
+    assert not [name for name in names if name.endswith(".tmp")]
+
+def test_concurrent_builds_leave_valid_current(tmp_path):
+    directory = str(tmp_path)
+    errors = []
+    
+    def build(seed):
+        try:
+            build_population(directory, 200, seed=seed, block_size=50)
+        except Exception as exc:  # pragma: no cover - 실패 시 메시지 확인용
+            errors.append(exc)
+    
+    threads = [threading.Thread(target=build, args=(seed,)) for seed in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert not errors
+    with open(os.path.join(directory, CURRENT_POINTER), encoding="utf-8") as f:
+        version = f.read().strip()
+    assert os.path.isdir(os.path.join(directory, version))
+    assert len(get_population(directory)) == 200
+    assert not [name for name in os.listdir(directory) if name.endswith(".tmp")]
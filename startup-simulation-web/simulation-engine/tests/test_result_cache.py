@@ -0,0 +1,61 @@
+"""엔진 seed 재현성과 결과 캐시"""
+
+from result_cache import SimulationCache
+from simulation_engine import SIMULATION_ID_PATTERN, SimulationAPI, SimulationEngine
+
+BMC = {"hypotheses": ["월 구독료 9,900원은 적정 가격이다", "핵심 기능의 사용성이 경쟁 제품보다 중요하다"], "price": 9900}
+
+def stable(result):
+    return {k: v for k, v in result.items() if k not in ("simulation_id", "timestamp", "diagnostics")}
+
+def test_same_seed_gives_the_same_result():
+    first = SimulationAPI.create_simulation(BMC, seed=11, persona_count=40)
+    second = SimulationAPI.create_simulation(BMC, seed=11, persona_count=40)
+    other = SimulationAPI.create_simulation(BMC, seed=12, persona_count=40)
+    assert stable(first) == stable(second)
+    assert stable(first) != stable(other)
+    
+    # 엔진 난수는 엔진마다 독립적이므로 다른 엔진을 함께 써도 결과가 바뀌지 않습니다
+    engine, noise, alone = SimulationEngine({}, seed=5), SimulationEngine({}, seed=6), SimulationEngine({}, seed=5)
+    for _ in range(3):
+        mixed = engine.generate_personas(5)
+        noise.generate_personas(7)
+        assert mixed == alone.generate_personas(5)
+
+def test_cache_key_is_canonical():
+    key = SimulationCache.make_key({"a": 1, "b": [1, 2]}, 1, 20, ["q"])
+    assert key == SimulationCache.make_key({"b": [1, 2], "a": 1}, 1, 20, ["q"])
+    assert key != SimulationCache.make_key({"a": 1, "b": [1, 2]}, 2, 20, ["q"])
+    assert key != SimulationCache.make_key({"a": 1, "b": [1, 2]}, 1, 20, ["q"], bootstrap=100)
+
+def test_cache_hit_returns_an_independent_copy(tmp_path):
+    cache = SimulationCache(directory=str(tmp_path))
+    first = SimulationAPI.create_simulation(BMC, seed=3, persona_count=30, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 1)
+    
+    first["summary"]["total_personas"] = -1
+    second = SimulationAPI.create_simulation(BMC, seed=3, persona_count=30, cache=cache, diagnostics=True)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert second["diagnostics"]["cache_hit"]
+    assert second["summary"]["total_personas"] == 30
+    
+    # 디스크 계층은 다른 캐시 인스턴스(다른 프로세스)에서도 읽힙니다
+    fresh = SimulationCache(directory=str(tmp_path))
+    third = SimulationAPI.create_simulation(BMC, seed=3, persona_count=30, cache=fresh)
+    assert fresh.hits == 1
+    assert stable(third) == stable(second)
+
+def test_unseeded_runs_are_not_cached():
+    cache = SimulationCache()
+    SimulationAPI.create_simulation(BMC, persona_count=10, cache=cache)
+    assert len(cache) == 0 and cache.misses == 0
+
+def test_cache_hit_gets_a_fresh_id_and_timestamp():
+    cache = SimulationCache()
+    first = SimulationAPI.create_simulation(BMC, seed=4, persona_count=10, cache=cache)
+    second = SimulationAPI.create_simulation(BMC, seed=4, persona_count=10, cache=cache)
+    assert cache.hits == 1
+    assert second["simulation_id"] != first["simulation_id"]
+    assert second["timestamp"] >= first["timestamp"]
+    assert SIMULATION_ID_PATTERN.fullmatch(second["simulation_id"])
+    assert stable(second) == stable(first)
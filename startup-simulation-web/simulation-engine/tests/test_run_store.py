@@ -0,0 +1,81 @@
+"""실행 저장소 저장/조회 왕복"""
+
+import json
+import os
+
+import pytest
+
+from result_cache import SimulationCache
+from run_store import RunStore
+from simulation_engine import SimulationAPI
+
+BMC = {"hypotheses": ["월 구독료 9,900원은 적정 가격이다", "핵심 기능의 사용성이 경쟁 제품보다 중요하다"], "price": 9900}
+
+@pytest.fixture
+def store(tmp_path):
+    with RunStore(str(tmp_path / "store")) as run_store:
+        yield run_store
+
+def test_add_and_load_round_trip(store):
+    result = SimulationAPI.create_simulation(BMC, seed=3, persona_count=80)
+    simulation_id = store.add(result, BMC, seed=3)
+    expected = json.loads(json.dumps(result))
+    
+    row = store.get(simulation_id)
+    assert row["seed"] == 3
+    assert row["persona_count"] == 80
+    
+    loaded = store.load(simulation_id)
+    assert loaded["summary"] == expected["summary"]
+    assert loaded["validation_results"] == expected["validation_results"]
+    assert loaded["financial_projection"] == expected["financial_projection"]
+    assert loaded["personas"].to_records() == expected["personas"]
+    assert loaded["interview_results"].to_records() == expected["interview_results"]
+    
+    history = store.hypothesis_history(BMC["hypotheses"][0])
+    assert [h["confidence_score"] for h in history] == [expected["validation_results"][0]["confidence_score"]]
+    
+    with pytest.raises(ValueError):
+        store.add(result, BMC, seed=3)
+    assert len(store) == 1
+
+def test_run_matches_add(store):
+    run_id = store.run(BMC, seed=5, persona_count=60)
+    add_id = store.add(SimulationAPI.create_simulation(BMC, seed=5, persona_count=60), BMC, seed=5)
+    
+    run_row, add_row = store.get(run_id), store.get(add_id)
+    for key in ("question_count", "persona_count", "validated_hypotheses", "projected_roi", "total_revenue"):
+        assert run_row[key] == add_row[key]
+    assert run_row["question_count"] == 5
+    assert store.load(run_id)["interview_results"].to_records() == store.load(add_id)["interview_results"].to_records()
+    assert {row["simulation_id"] for row in store.find(bmc_data=BMC)} == {run_id, add_id}
+
+def test_failed_run_leaves_no_arrays(store, monkeypatch):
+    def failing_insert(**kwargs):
+        # 배열 파일을 쓴 뒤 SQL 삽입이 실패한 경우
+        open(store.array_path(kwargs["simulation_id"]), "wb").close()
+        raise RuntimeError("insert failed")
+    
+    monkeypatch.setattr(store, "_insert", failing_insert)
+    with pytest.raises(RuntimeError):
+        store.run(BMC, seed=1, persona_count=10)
+    assert len(store) == 0
+    assert os.listdir(os.path.join(store.directory, "arrays")) == []
+
+@pytest.mark.parametrize("simulation_id", ["../escape", "sim_20260101000000", "sim_20260101000000_ABCDEF012345", 42])
+def test_add_rejects_malformed_simulation_id(store, simulation_id):
+    result = SimulationAPI.create_simulation(BMC, seed=2, persona_count=10)
+    result["simulation_id"] = simulation_id
+    with pytest.raises(ValueError):
+        store.add(result, BMC, seed=2)
+    assert len(store) == 0
+    assert os.listdir(os.path.join(store.directory, "arrays")) == []
+
+def test_cached_results_are_stored_as_separate_runs(store):
+    cache = SimulationCache()
+    first = SimulationAPI.create_simulation(BMC, seed=6, persona_count=10, cache=cache)
+    second = SimulationAPI.create_simulation(BMC, seed=6, persona_count=10, cache=cache)
+    assert cache.hits == 1
+    ids = [store.add(first, BMC, seed=6), store.add(second, BMC, seed=6)]
+    assert ids == [first["simulation_id"], second["simulation_id"]]
+    assert len(store) == 2
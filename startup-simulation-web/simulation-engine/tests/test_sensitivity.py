@@ -0,0 +1,68 @@
+"""재무 파라미터 스윕 테스트 (run_financial_simulation을 조합마다 실행한 결과와 비교)"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from sensitivity import sensitivity, sweep_grid, tornado
+from simulation_engine import SimulationEngine
+
+AXES = {
+    "initial_users": [100, 1000, 5000],
+    "churn_rate": [0.02, 0.1, 0.3],
+    "arpu": [9900, 29900],
+}
+ASSUMPTIONS = {"fixed_costs": 2000000, "marketing_cost": 1000000}
+
+def scalar_metrics(assumptions, months):
+    """run_financial_simulation 한 번의 지표"""
+    
+    metrics = SimulationEngine({}).run_financial_simulation(months=months, assumptions=assumptions)["metrics"]
+    return {
+        "break_even_month": metrics["break_even_month"] or 0,
+        "roi": metrics["roi"],
+        "total_revenue": metrics["total_revenue"],
+        "total_costs": metrics["total_costs"],
+        "final_users": metrics["total_users"],
+    }
+
+def test_sweep_grid_matches_scalar_loop():
+    months = 24
+    result = sweep_grid(AXES, months=months, assumptions=ASSUMPTIONS)
+    assert result.parameters == list(AXES)
+    assert result.metrics["roi"].shape == (3, 3, 2)
+    
+    reached = 0
+    for cell in itertools.product(*(range(len(values)) for values in AXES.values())):
+        assumptions = dict(ASSUMPTIONS, **{name: AXES[name][i] for name, i in zip(AXES, cell)})
+        expected = scalar_metrics(assumptions, months)
+        assert result.metrics["break_even_month"][cell] == expected["break_even_month"]
+        assert result.metrics["final_users"][cell] == expected["final_users"]
+        for name in ("roi", "total_revenue", "total_costs"):
+            assert result.metrics[name][cell] == pytest.approx(expected[name], rel=1e-12)
+        reached += expected["break_even_month"] > 0
+    # 손익분기에 도달하는 조합과 도달하지 않는 조합이 모두 있어야 비교가 의미 있습니다
+    assert 0 < reached < 18
+
+def test_sensitivity_curves_match_single_axis_grid():
+    ranges = {"arpu": np.linspace(5000, 30000, 6), "churn_rate": [0.01, 0.05, 0.2]}
+    result = sensitivity(ranges, months=12, assumptions=ASSUMPTIONS)
+    expected = scalar_metrics(ASSUMPTIONS, 12)
+    assert result.baseline == {name: pytest.approx(value, rel=1e-12) for name, value in expected.items()}
+    for name, values in ranges.items():
+        grid = sweep_grid({name: values}, months=12, assumptions=ASSUMPTIONS)
+        for metric, array in grid.metrics.items():
+            assert np.array_equal(result.curves[name].metrics[metric], array)
+
+def test_tornado_is_sorted_by_swing():
+    rows = tornado(["arpu", "churn_rate", "fixed_costs"], relative=0.3, months=12, assumptions=ASSUMPTIONS)
+    assert sorted(row["parameter"] for row in rows) == ["arpu", "churn_rate", "fixed_costs"]
+    swings = [row["swing"] for row in rows]
+    assert swings == sorted(swings, reverse=True)
+
+def test_unknown_parameter_or_metric_is_rejected():
+    with pytest.raises(ValueError):
+        sweep_grid({"unknown": [1, 2]})
+    with pytest.raises(ValueError):
+        sweep_grid({"arpu": [1, 2]}, metrics=("unknown",))
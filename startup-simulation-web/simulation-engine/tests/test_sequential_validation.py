@@ -0,0 +1,50 @@
+"""순차(조기 종료) 가설 검증"""
+
+import pytest
+
+from simulation_engine import SimulationEngine, DEFAULT_INTERVIEW_QUESTIONS, DEFAULT_PANEL_SIZE
+
+HYPOTHESES = [
+    "월 구독료 9,900원은 적정 가격이다",
+    "핵심 기능의 사용성이 경쟁 제품보다 중요하다",
+    "우리 앱은 모두가 좋아할 것이다",
+]
+
+@pytest.mark.parametrize("seed", range(5))
+def test_defaults_never_interview_more_than_the_fixed_panel(seed):
+    engine = SimulationEngine({}, columnar=True, seed=seed)
+    results = engine.validate_hypotheses_sequential(HYPOTHESES)
+    
+    assert all(r.personas_interviewed <= DEFAULT_PANEL_SIZE for r in results)
+    assert len(engine.personas) <= DEFAULT_PANEL_SIZE
+    # 관련 질문만 묻기 때문에 고정 패널(페르소나 x 기본 질문 전체)보다 응답 수가 적습니다
+    assert engine.interview_results.num_rows < DEFAULT_PANEL_SIZE * len(DEFAULT_INTERVIEW_QUESTIONS)
+    for result in results:
+        assert result.lower_bound <= result.result.confidence_score <= result.upper_bound
+
+def test_matches_fixed_panel_when_it_never_stops_early():
+    engine = SimulationEngine({}, columnar=True, seed=4)
+    # alpha가 아주 작으면 일찍 멈추지 않으므로 max_personas까지 인터뷰한 고정 패널 점수와 같아야 합니다
+    sequential = engine.validate_hypotheses_sequential(HYPOTHESES[:2], batch_size=10, max_personas=60, alpha=1e-12)
+    fixed = engine.validate_hypotheses(HYPOTHESES[:2])
+    assert [s.result for s in sequential] == fixed
+    assert all(s.personas_interviewed == 60 and not s.stopped_early for s in sequential)
+
+def test_larger_cap_stops_clear_hypotheses_early():
+    engine = SimulationEngine({}, columnar=True, seed=1)
+    price, feature, unrelated = engine.validate_hypotheses_sequential(HYPOTHESES, batch_size=20, max_personas=3000)
+    
+    # 기능 가설은 판정이 분명해 일찍 멈추고, 경계에 가까운 가격 가설은 상한까지 인터뷰합니다
+    assert feature.stopped_early and feature.personas_interviewed < 1000
+    assert 1 - 0.6 <= feature.lower_bound and feature.upper_bound <= 0.6
+    assert price.personas_interviewed == 3000 and not price.stopped_early
+    assert len(engine.personas) == 3000
+    
+    # 관련 질문이 없는 가설은 인터뷰하지 않고 기본 점수로 판정합니다
+    assert (unrelated.looks, unrelated.personas_interviewed, unrelated.result.confidence_score) == (0, 0, 0.5)
+
+def test_list_engine_keeps_persona_objects():
+    engine = SimulationEngine({}, seed=2)
+    (result,) = engine.validate_hypotheses_sequential(HYPOTHESES[:1])
+    assert isinstance(engine.personas, list) and len(engine.personas) == result.personas_interviewed
+    assert set(engine.interview_results) == {p.id for p in engine.personas}
@@ -0,0 +1,92 @@
+"""결과 파일 기록/읽기 왕복"""
+
+import io
+import json
+from dataclasses import replace
+
+import pytest
+
+from serialization import (
+    run_simulation_to_file, read_simulation_columnar, write_simulation_json, write_simulation_columnar,
+    write_tables_columnar
+)
+from simulation_engine import (
+    SimulationAPI, SimulationEngine, PersonaTable, InterviewTable, InterviewResponse, ResponseSentiment,
+    DEFAULT_INTERVIEW_QUESTIONS, hypothesis_to_dict, persona_to_dict
+)
+
+BMC = {"hypotheses": ["월 구독료 9,900원은 적정 가격이다", "핵심 기능의 사용성이 경쟁 제품보다 중요하다"], "price": 9900}
+
+# 실행마다 달라지는 항목
+VOLATILE_KEYS = ("simulation_id", "timestamp")
+
+def stable(result):
+    return {key: value for key, value in result.items() if key not in VOLATILE_KEYS}
+
+def test_json_file_matches_create_simulation(tmp_path):
+    path = tmp_path / "run.json"
+    summary = run_simulation_to_file(str(path), BMC, seed=7, persona_count=120)
+    expected = json.loads(json.dumps(SimulationAPI.create_simulation(BMC, seed=7, persona_count=120)))
+    
+    written = json.loads(path.read_text(encoding="utf-8"))
+    assert stable(written) == stable(expected)
+    assert summary == expected["summary"]
+
+def test_columnar_file_round_trip(tmp_path):
+    path = tmp_path / "run.npz"
+    summary = run_simulation_to_file(str(path), BMC, seed=7, persona_count=120, fmt="columnar")
+    expected = json.loads(json.dumps(SimulationAPI.create_simulation(BMC, seed=7, persona_count=120)))
+    
+    loaded = read_simulation_columnar(str(path))
+    assert loaded["summary"] == summary == expected["summary"]
+    assert loaded["validation_results"] == expected["validation_results"]
+    assert loaded["personas"].to_records() == expected["personas"]
+    assert loaded["interview_results"].to_records() == expected["interview_results"]
+
+def test_unknown_format_is_rejected_before_running(tmp_path):
+    with pytest.raises(ValueError):
+        run_simulation_to_file(str(tmp_path / "run.xml"), BMC, seed=7, persona_count=10 ** 9, fmt="xml")
+
+def custom_engine():
+    engine = SimulationEngine({}, seed=2)
+    generated = engine.generate_personas(6)
+    engine.personas = [replace(p, id=pid, name=f"고객{i}") for i, (p, pid) in
+                       enumerate(zip(generated, ["alice", "persona_abc", 7, "persona_4", "bob", "persona_07"]))]
+    for persona in engine.personas:
+        engine.conduct_interviews(persona, DEFAULT_INTERVIEW_QUESTIONS)
+    return engine
+
+def test_list_engine_json_keeps_personas_as_they_are():
+    engine = custom_engine()
+    results = engine.validate_hypotheses(BMC["hypotheses"])
+    fp = io.StringIO()
+    write_simulation_json(fp, engine, results, {}, {"simulation_id": "sim", "timestamp": "now", "summary": {}})
+    written = json.loads(fp.getvalue())
+    
+    # 추출 순서의 pain_points, 임의 ID/이름이 그대로 기록됩니다
+    assert written["personas"] == [persona_to_dict(p) for p in engine.personas]
+    expected = {str(pid): [{"question": r.question, "answer": r.answer, "sentiment": r.sentiment.value,
+                            "confidence": r.confidence, "keywords": r.keywords} for r in responses]
+                for pid, responses in engine.interview_results.items()}
+    assert written["interview_results"] == expected
+    assert list(written["interview_results"]) == list(expected)
+    assert written["validation_results"] == [hypothesis_to_dict(r) for r in results]
+
+def test_columnar_file_keeps_custom_interview_ids(tmp_path):
+    personas = SimulationEngine({}, seed=2).generate_personas(2, batched=True)
+    interviews = InterviewTable()
+    response = InterviewResponse("가격이 적정한가요?", "좋아요", ResponseSentiment.POSITIVE, 0.8, ["가격"])
+    for pid in ("persona_1", "alice", "persona_2", "persona_abc"):
+        interviews[pid] = [response]
+    path = str(tmp_path / "run.npz")
+    write_tables_columnar(path, PersonaTable.from_personas(personas), interviews, {"summary": None})
+    
+    loaded = read_simulation_columnar(path)
+    assert list(loaded["personas"]) == personas
+    assert loaded["personas"].to_records() == [persona_to_dict(p) for p in personas]
+    assert loaded["interview_results"].to_records() == interviews.to_records()
+    assert list(loaded["interview_results"]) == ["persona_1", "alice", "persona_2", "persona_abc"]
+    
+    # 카탈로그 밖의 값은 컬럼형 파일로 저장할 수 없습니다
+    with pytest.raises(ValueError):
+        write_simulation_columnar(str(tmp_path / "custom.npz"), custom_engine(), [], {}, {})
@@ -0,0 +1,83 @@
+"""비동기 시뮬레이션 서비스 테스트 (fastapi 없이 서비스를 직접 호출)"""
+
+import asyncio
+
+import pytest
+
+from result_cache import SimulationCache
+from service import ServiceOverloaded, SimulationService, load_test
+from simulation_engine import SimulationAPI
+
+BMC = {"hypotheses": ["월 구독료 9,900원은 적정 가격이다"]}
+
+def test_identical_requests_share_one_computation():
+    async def main():
+        async with SimulationService(max_workers=2) as service:
+            results = await asyncio.gather(*(service.create_simulation(BMC, seed=3, persona_count=10) for _ in range(5)))
+            return results, service.stats()
+    
+    results, stats = asyncio.run(main())
+    assert (stats.submitted, stats.computed, stats.coalesced, stats.in_flight) == (5, 1, 4, 0)
+    # 공유한 요청은 같은 결과 객체를 받습니다
+    assert all(result is results[0] for result in results)
+    expected = SimulationAPI.create_simulation(BMC, seed=3, persona_count=10)
+    assert results[0]["validation_results"] == expected["validation_results"]
+    assert results[0]["personas"] == expected["personas"]
+
+def test_unseeded_requests_are_not_coalesced():
+    async def main():
+        async with SimulationService(max_workers=2) as service:
+            await asyncio.gather(*(service.create_simulation(BMC, persona_count=5) for _ in range(3)))
+            return service.stats()
+    
+    stats = asyncio.run(main())
+    assert (stats.computed, stats.coalesced) == (3, 0)
+
+def test_full_queue_rejects_new_computations_but_accepts_joiners():
+    async def main():
+        async with SimulationService(max_workers=1, max_queue_depth=2) as service:
+            calls = [service.create_simulation(BMC, seed=seed, persona_count=5) for seed in (1, 2, 3, 1)]
+            results = await asyncio.gather(*calls, return_exceptions=True)
+            return results, service.stats()
+    
+    results, stats = asyncio.run(main())
+    assert isinstance(results[2], ServiceOverloaded)
+    assert (results[2].depth, results[2].limit) == (2, 2)
+    assert results[3] is results[0]
+    assert (stats.submitted, stats.computed, stats.coalesced, stats.rejected) == (3, 2, 1, 1)
+
+def test_failed_computation_is_counted_and_released():
+    async def main():
+        async with SimulationService(max_workers=1, max_queue_depth=1) as service:
+            with pytest.raises(Exception):
+                await service.create_simulation(BMC, seed=1, persona_count=5, questions=[None])
+            # 실패한 계산이 대기열 자리를 계속 차지하지 않습니다
+            await service.create_simulation(BMC, seed=1, persona_count=5)
+            return service.stats()
+    
+    stats = asyncio.run(main())
+    assert (stats.failed, stats.computed, stats.in_flight) == (1, 2, 0)
+
+def test_process_pool_returns_same_result():
+    async def main():
+        async with SimulationService(max_workers=1, processes=True) as service:
+            return await asyncio.gather(*(service.create_simulation(BMC, seed=4, persona_count=5) for _ in range(2)))
+    
+    first, second = asyncio.run(main())
+    assert first is second
+    assert first["validation_results"] == SimulationAPI.create_simulation(BMC, seed=4, persona_count=5)["validation_results"]
+
+def test_process_pool_cannot_share_cache():
+    with pytest.raises(ValueError):
+        SimulationService(processes=True, cache=SimulationCache())
+
+def test_load_test_counts_overload_errors():
+    async def main():
+        async with SimulationService(max_workers=1, max_queue_depth=1) as service:
+            return await load_test(lambda i: service.create_simulation(BMC, seed=i, persona_count=5),
+                                   requests=6, concurrency=3)
+    
+    report = asyncio.run(main())
+    assert report.succeeded + sum(report.errors.values()) == 6
+    assert report.succeeded >= 1
+    assert set(report.errors) <= {"ServiceOverloaded"}
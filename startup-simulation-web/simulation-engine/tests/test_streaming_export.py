@@ -0,0 +1,62 @@
+"""스트리밍 내보내기와 메모리 내 실행의 결과 비교"""
+
+import gzip
+import json
+
+import pytest
+
+from simulation_engine import SimulationAPI
+from streaming_export import export_simulation, iter_columnar_chunks, read_columnar_meta
+
+BMC = {"hypotheses": ["월 구독료 9,900원은 적정 가격이다", "핵심 기능의 사용성이 경쟁 제품보다 중요하다"], "price": 9900}
+
+def in_memory_run(seed, persona_count, chunk_size):
+    """같은 seed/chunk_size의 메모리 내 실행 (페르소나, 응답, 검증 결과, 요약)"""
+    
+    personas, interviews, validation = [], {}, []
+    for event in SimulationAPI.stream_simulation(BMC, seed=seed, persona_count=persona_count, chunk_size=chunk_size):
+        if event.type == "personas":
+            personas.extend(event.payload["personas"])
+        elif event.type == "interviews":
+            interviews.update(event.payload["interview_results"])
+        elif event.type == "hypothesis":
+            validation.append(event.payload["result"])
+        elif event.type == "completed":
+            summary = event.payload["summary"]
+    return json.loads(json.dumps({"personas": personas, "interview_results": interviews,
+                                  "validation_results": validation, "summary": summary}))
+
+@pytest.mark.parametrize("name", ["run.jsonl", "run.jsonl.gz"])
+def test_jsonl_export_matches_in_memory(tmp_path, name):
+    path = str(tmp_path / name)
+    summary = export_simulation(path, BMC, seed=9, persona_count=250, chunk_size=60)
+    expected = in_memory_run(9, 250, 60)
+    
+    opener = gzip.open if name.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        events = [json.loads(line) for line in f]
+    
+    assert events[0]["type"] == "started"
+    persona_events = [e for e in events if e["type"] == "persona"]
+    assert [e["persona"] for e in persona_events] == expected["personas"]
+    assert {e["persona"]["id"]: e["responses"] for e in persona_events} == expected["interview_results"]
+    assert [e["result"] for e in events if e["type"] == "hypothesis"] == expected["validation_results"]
+    assert events[-1]["type"] == "completed"
+    assert events[-1]["summary"] == summary == expected["summary"]
+
+def test_columnar_export_round_trip(tmp_path):
+    directory = str(tmp_path / "run_parts")
+    summary = export_simulation(directory, BMC, seed=9, persona_count=250, chunk_size=60)
+    expected = in_memory_run(9, 250, 60)
+    
+    meta = read_columnar_meta(directory)
+    assert len(meta["parts"]) == 5
+    assert meta["summary"] == summary == expected["summary"]
+    assert meta["validation_results"] == expected["validation_results"]
+    
+    personas, interviews = [], {}
+    for persona_table, interview_table in iter_columnar_chunks(directory):
+        personas.extend(persona_table.to_records())
+        interviews.update(interview_table.to_records())
+    assert personas == expected["personas"]
+    assert interviews == expected["interview_results"]
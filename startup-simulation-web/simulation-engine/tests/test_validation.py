@@ -0,0 +1,208 @@
+"""가설 검증: 기존(응답을 하나씩 더하던) 점수와의 일치, 샤드 합치기"""
+
+import random
+from dataclasses import replace
+
+import pytest
+
+from sharding import ShardCoordinator, ShardPartial, merge_partials, shard_partial
+from simulation_engine import (
+    SimulationAPI, SimulationEngine, PersonaTable, InterviewResponse, ResponseSentiment, DEFAULT_INTERVIEW_QUESTIONS
+)
+
+HYPOTHESES = [
+    "월 구독료 9,900원은 적정 가격이다",
+    "핵심 기능의 사용성이 경쟁 제품보다 중요하다",
+    "소셜 미디어 마케팅이 효과적이다",
+]
+
+def reference_validation(engine: SimulationEngine, hypothesis: str, threshold: float = 0.6):
+    """최적화 이전 validate_hypothesis와 같은 방식으로 응답을 하나씩 더한 (점수, 상태, 지지 근거, 반대 근거)"""
+    
+    personas = {p.id: p for p in engine.personas}
+    total_confidence = 0
+    response_count = 0
+    supporting, contrary = [], []
+    for persona_id, responses in engine.interview_results.items():
+        persona = personas.get(persona_id)
+        if not persona:
+            continue
+        for response in responses:
+            if any(keyword in hypothesis.lower() for keyword in response.keywords):
+                response_count += 1
+                evidence = f"{persona.name} ({persona.segment.value}): {response.answer}"
+                if response.sentiment == ResponseSentiment.POSITIVE:
+                    supporting.append(evidence)
+                    total_confidence += response.confidence
+                elif response.sentiment == ResponseSentiment.NEGATIVE:
+                    contrary.append(evidence)
+                    total_confidence += (1 - response.confidence)
+                else:
+                    total_confidence += 0.5
+    
+    score = total_confidence / response_count if response_count > 0 else 0.5
+    if score > threshold:
+        status = "validated"
+    elif score < 1 - threshold:
+        status = "invalidated"
+    else:
+        status = "partial"
+    return score, status, supporting[:5], contrary[:5]
+
+def completed_engine(seed: int, persona_count: int, chunk_size: int = 10000) -> SimulationEngine:
+    for stage, data in SimulationAPI.run_stages({"hypotheses": HYPOTHESES}, seed=seed, persona_count=persona_count,
+                                                chunk_size=chunk_size):
+        if stage == "completed":
+            return data
+
+def assert_matches_reference(engine: SimulationEngine, hypotheses=HYPOTHESES):
+    for hypothesis, result in zip(hypotheses, engine.validate_hypotheses(hypotheses)):
+        score, status, supporting, contrary = reference_validation(engine, hypothesis)
+        # 점수는 응답 순서대로 더한 부동소수점 합계와 비트 단위로 같아야 합니다
+        assert result.confidence_score == score
+        assert result.validation_status == status
+        assert result.supporting_evidence == supporting
+        assert result.contrary_evidence == contrary
+        assert engine.validate_hypothesis(hypothesis) == result
+
+@pytest.mark.parametrize("seed", list(range(0, 200, 7)) + [119, 148, 186])
+def test_scores_match_reference(seed):
+    assert_matches_reference(completed_engine(seed, persona_count=31 + seed % 40, chunk_size=16))
+
+def test_list_engine_matches_reference():
+    engine = SimulationEngine({}, seed=12)
+    for persona in engine.generate_personas(45):
+        engine.conduct_interviews(persona, DEFAULT_INTERVIEW_QUESTIONS)
+    # 인터뷰 결과가 있어도 페르소나 목록에 없으면 제외합니다
+    engine.personas = engine.personas[5:]
+    assert_matches_reference(engine)
+
+def custom_persona_engine(seed: int) -> SimulationEngine:
+    """persona_<N> 형식이 아닌 ID와 카탈로그 밖의 이름/직업을 쓰는 리스트 엔진"""
+    
+    engine = SimulationEngine({}, seed=seed)
+    ids = ["alice", "persona_abc", 7, "persona_07"] + [f"customer-{i}" for i in range(26)]
+    engine.personas = [
+        replace(p, id=pid, name=f"고객{i}", occupation="우주비행사" if i % 2 else p.occupation)
+        for i, (p, pid) in enumerate(zip(engine.generate_personas(len(ids)), ids))
+    ]
+    for persona in engine.personas:
+        engine.conduct_interviews(persona, DEFAULT_INTERVIEW_QUESTIONS)
+    # 페르소나 목록에 없는 ID의 응답은 제외됩니다
+    engine.interview_results["persona_2"] = [
+        InterviewResponse("가격이 적정한가요?", "좋아요", ResponseSentiment.POSITIVE, 0.9, ["가격"])
+    ]
+    return engine
+
+def test_list_engine_accepts_custom_persona_ids_and_names():
+    engine = custom_persona_engine(9)
+    assert_matches_reference(engine)
+    evidence = [e for r in engine.validate_hypotheses(HYPOTHESES) for e in r.supporting_evidence + r.contrary_evidence]
+    assert evidence and all(e.startswith("고객") for e in evidence)
+
+def test_threshold_boundary_keeps_ordered_sum():
+    # 0.7(긍정)과 0.5(중립)를 31명분 순서대로 더하면 0.6000000000000001이 되어 validated입니다
+    engine = SimulationEngine({}, seed=0)
+    personas = engine.generate_personas(31)
+    engine.interview_results = {
+        p.id: [
+            InterviewResponse("가격이 적정한가요?", "좋아요", ResponseSentiment.POSITIVE, 0.7, ["가격"]),
+            InterviewResponse("가격이 적정한가요?", "글쎄요", ResponseSentiment.NEUTRAL, 0.5, ["가격"]),
+        ]
+        for p in personas
+    }
+    result = engine.validate_hypothesis("가격이 적정하다")
+    assert result.confidence_score == 0.6000000000000001
+    assert result.validation_status == "validated"
+    # 정확한 합계는 명시적으로 요청할 때만 쓰며 점수가 달라질 수 있습니다
+    exact = engine.validate_hypothesis("가격이 적정하다", exact=True)
+    assert exact.confidence_score == 0.6
+    assert exact.validation_status == "partial"
+
+def shard_partials(engine: SimulationEngine, shard_size: int):
+    partials = []
+    for start in range(0, len(engine.personas), shard_size):
+        shard = SimulationEngine({}, columnar=True)
+        shard.personas = PersonaTable({name: values[start:start + shard_size]
+                                       for name, values in engine.personas.columns.items()})
+        shard.interview_results = engine.interview_results
+        partials.append(ShardPartial.from_json(shard_partial(shard, HYPOTHESES, f"shard-{start}").to_json()))
+    return partials
+
+@pytest.mark.parametrize("seed", [1, 119, 148])
+def test_sharded_merge_matches_single_node(seed):
+    engine = completed_engine(seed, persona_count=90)
+    partials = shard_partials(engine, 20)
+    
+    # 도착 순서와 관계없이 한 노드에서 정확한 합계로 검증한 결과와 같아야 합니다
+    random.Random(seed).shuffle(partials)
+    coordinator = ShardCoordinator(HYPOTHESES)
+    for partial in partials:
+        coordinator.add(partial)
+    expected = engine.validate_hypotheses(HYPOTHESES, exact=True)
+    assert coordinator.results() == expected
+    
+    # 묶는 방법을 바꿔도 같은 결과
+    regrouped = ShardCoordinator(HYPOTHESES)
+    regrouped.add(merge_partials(partials[:2]).merge(merge_partials(partials[2:])))
+    assert regrouped.results() == expected
+    
+    # 기본(순서대로 더한) 점수와는 반올림 차이만 납니다
+    for result, ordered in zip(expected, engine.validate_hypotheses(HYPOTHESES)):
+        assert result.confidence_score == pytest.approx(ordered.confidence_score, rel=1e-12)
+    
+    with pytest.raises(ValueError):
+        coordinator.add(partials[0])
+
+def test_shard_partial_size_does_not_grow_with_panel():
+    small = shard_partials(completed_engine(5, persona_count=20), 20)[0]
+    large = shard_partials(completed_engine(5, persona_count=400), 400)[0]
+    assert len(large.to_json()) < 1.5 * len(small.to_json())
+
+def test_overlapping_shard_ranges_are_rejected():
+    engine = completed_engine(2, persona_count=40)
+    first, second = shard_partials(engine, 20)
+    assert first.ranges == [(0, 20)] and second.ranges == [(20, 40)]
+    overlapping = ShardPartial(shard_ids=["other"], personas=20, hypotheses={}, ranges=[(10, 30)])
+    with pytest.raises(ValueError):
+        first.merge(overlapping)
+    assert first.merge(second).ranges == [(0, 20), (20, 40)]
+
+def reference_segment_scores(engine: SimulationEngine, hypothesis: str):
+    """세그먼트별로 관련 응답을 하나씩 더한 {세그먼트: (점수, 응답 수)}"""
+    
+    personas = {p.id: p for p in engine.personas}
+    totals = {}
+    for persona_id, responses in engine.interview_results.items():
+        persona = personas.get(persona_id)
+        if not persona:
+            continue
+        for response in responses:
+            if any(keyword in hypothesis.lower() for keyword in response.keywords):
+                if response.sentiment == ResponseSentiment.POSITIVE:
+                    value = response.confidence
+                elif response.sentiment == ResponseSentiment.NEGATIVE:
+                    value = 1 - response.confidence
+                else:
+                    value = 0.5
+                total, count = totals.get(persona.segment.value, (0, 0))
+                totals[persona.segment.value] = (total + value, count + 1)
+    return {name: (total / count, count) for name, (total, count) in totals.items()}
+
+def test_bootstrap_on_list_engine_with_custom_personas():
+    engine = custom_persona_engine(9)
+    for hypothesis, result in zip(HYPOTHESES, engine.validate_hypotheses(HYPOTHESES, bootstrap=200)):
+        summary = result.bootstrap
+        assert summary.lower_bound <= result.confidence_score <= summary.upper_bound
+        scores = {name: (s["score"], s["responses"]) for name, s in summary.segment_scores.items()}
+        assert scores == reference_segment_scores(engine, hypothesis)
+
+def test_bootstrap_segments_agree_between_list_and_columnar():
+    engine = completed_engine(12, persona_count=40)
+    list_engine = SimulationEngine({}, seed=0)
+    list_engine.personas = engine.personas.to_personas()
+    list_engine.interview_results = engine.interview_results
+    for columnar, listed in zip(engine.validate_hypotheses(HYPOTHESES, bootstrap=50),
+                                list_engine.validate_hypotheses(HYPOTHESES, bootstrap=50)):
+        assert {name: (s["score"], s["responses"]) for name, s in columnar.bootstrap.segment_scores.items()} == \
+            {name: (s["score"], s["responses"]) for name, s in listed.bootstrap.segment_scores.items()}